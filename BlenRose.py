@@ -8,11 +8,25 @@ bl_info = {
     "category": "Material",
 }
 
+import argparse
 import bpy
 import os
+import filecmp
+import hashlib
 import json
+import math
+import numpy as np
+import re
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from pathlib import Path
 import xml.etree.ElementTree as ET
+from bpy.app.handlers import persistent
 from bpy.types import (
     Operator,
     Panel,
@@ -24,6 +38,23 @@ from bpy.types import (
 # Track temporary suppression of reactive node updates while we batch-assign
 # detected texture/UV properties from an existing shader tree.
 _SUPPRESSED_UPDATE_MATERIALS = set()
+
+# Last texture auto-detection result per material pointer, stored together
+# with a structural fingerprint of the node tree it was computed from.
+_DETECTION_CACHE = {}
+_DETECTION_CACHE_STATE = {"material_count": 0}
+
+# Materials waiting for background sync (see _queue_material_sync). The drain
+# timer spends at most _SYNC_TICK_BUDGET seconds per tick so the UI stays
+# interactive when many materials are dirtied at once (paste, append, undo).
+_SYNC_QUEUE = {}
+_SYNC_TICK_BUDGET = 0.004
+_SYNC_TICK_INTERVAL = 0.01
+
+# Node tree fingerprint per material pointer right after a background sync
+# wrote to it. A detect request that finds the tree unchanged since then was
+# caused by our own write and is dropped.
+_SYNC_WRITTEN_FINGERPRINTS = {}
 from bpy.props import (
     BoolProperty,
     EnumProperty,
@@ -38,29 +69,77 @@ from bpy.props import (
 # Shared enums / helpers
 # -------------------------------------------------------------------------
 
+_UV_FALLBACK_ITEMS = [
+    ("UV0", "UV0", "UV0"),
+    ("UV1", "UV1", "UV1"),
+]
+
+# Cached uv_channel_items result. Blender only keeps borrowed references to
+# the strings of a dynamic enum, so the same list object is handed out until
+# mesh data changes (see _invalidate_uv_items_cache), an object is given
+# another mesh ("object_meshes" records object ptr -> mesh ptr as scanned) or
+# the number of meshes/objects in the file changes.
+_UV_ITEMS_CACHE = {"items": None, "previous": None, "signature": None, "object_meshes": {}}
+
+
+def _collect_uv_channel_items():
+    """Scan every mesh object for UV map names and build sorted enum items."""
+    uv_names = set()
+    object_meshes = _UV_ITEMS_CACHE["object_meshes"] = {}
+    for obj in bpy.data.objects:
+        if obj.type == "MESH" and obj.data:
+            object_meshes[obj.as_pointer()] = obj.data.as_pointer()
+        if obj.type == "MESH" and getattr(obj.data, "uv_layers", None):
+            for layer in obj.data.uv_layers:
+                if layer.name:
+                    uv_names.add(layer.name)
+
+    if not uv_names:
+        return _UV_FALLBACK_ITEMS
+
+    return [(name, name, "") for name in sorted(uv_names)]
+
+
+def _invalidate_uv_items_cache():
+    # Keep the outgoing list alive for one more round; the UI may still be
+    # drawing from strings Blender borrowed from it.
+    if _UV_ITEMS_CACHE["items"] is not None:
+        _UV_ITEMS_CACHE["previous"] = _UV_ITEMS_CACHE["items"]
+    _UV_ITEMS_CACHE["items"] = None
+
+
+def _update_uv_items_from_depsgraph(depsgraph):
+    """Invalidate the UV items when an updated object now uses a different mesh."""
+    if _UV_ITEMS_CACHE["items"] is None or not depsgraph.id_type_updated("OBJECT"):
+        return
+    object_meshes = _UV_ITEMS_CACHE["object_meshes"]
+    for update in depsgraph.updates:
+        obj = getattr(update.id, "original", update.id)
+        if isinstance(obj, bpy.types.Object) and obj.type == "MESH":
+            mesh_ptr = obj.data.as_pointer() if obj.data else None
+            if object_meshes.get(obj.as_pointer()) != mesh_ptr:
+                _invalidate_uv_items_cache()
+                return
+
+
 def uv_channel_items(self, context):
     """
     Build UV set enum dynamically from all unique UV map names in the scene.
     Enum identifier and label are both the actual UV map name so we can plug
     them directly into UV Map nodes.
+    The scene scan is cached and only redone after mesh data changed.
     """
-    uv_names = set()
     try:
-        for obj in bpy.data.objects:
-            if obj.type == "MESH" and getattr(obj.data, "uv_layers", None):
-                for layer in obj.data.uv_layers:
-                    if layer.name:
-                        uv_names.add(layer.name)
+        signature = (len(bpy.data.meshes), len(bpy.data.objects))
+        items = _UV_ITEMS_CACHE["items"]
+        if items is None or _UV_ITEMS_CACHE["signature"] != signature:
+            _invalidate_uv_items_cache()
+            items = _collect_uv_channel_items()
+            _UV_ITEMS_CACHE["items"] = items
+            _UV_ITEMS_CACHE["signature"] = signature
     except Exception:
-        uv_names = set()
-
-    if not uv_names:
-        return [
-            ("UV0", "UV0", "UV0"),
-            ("UV1", "UV1", "UV1"),
-        ]
-
-    return [(name, name, "") for name in sorted(uv_names)]
+        items = _UV_FALLBACK_ITEMS
+    return items
 
 
 # Collision surface enums from Collision_Export_Dumbad_Tuukkas.py
@@ -422,6 +501,51 @@ MATERIAL_SUBCLASSES = {
 MATERIAL_SUBCLASS_FALLBACK = [("DEFAULT", "default", "")]
 
 
+# -------------------------------------------------------------------------
+# Write-if-changed helpers
+# -------------------------------------------------------------------------
+
+# Every RNA assignment tags its ID for a depsgraph update (and, for shader
+# nodes, an EEVEE recompile) even when the value is unchanged, which made the
+# settings <-> node tree sync ping-pong. All sync writes go through
+# _set_if_changed; these counters tell how many writes it saved and are
+# reported with every bulk export's timings.
+_WRITE_STATS = {"performed": 0, "skipped": 0}
+
+
+def _values_equal(current, value):
+    """Equality for RNA values: floats and float vectors compare with a small tolerance."""
+    if isinstance(value, (tuple, list)):
+        try:
+            return len(current) == len(value) and all(
+                _values_equal(a, b) for a, b in zip(current, value)
+            )
+        except TypeError:
+            return False
+    if isinstance(value, float) and isinstance(current, (int, float)):
+        return abs(current - value) <= 1e-6
+    return current == value
+
+
+def _set_if_changed(owner, attr, value):
+    """Assign ``owner.attr = value`` only if it differs. Returns True if a write happened."""
+    if _values_equal(getattr(owner, attr, None), value):
+        _WRITE_STATS["skipped"] += 1
+        return False
+    setattr(owner, attr, value)
+    _WRITE_STATS["performed"] += 1
+    return True
+
+
+def blenrose_write_stats(reset=False):
+    """Return {"performed": n, "skipped": n} for sync writes, optionally resetting the counters."""
+    stats = dict(_WRITE_STATS)
+    if reset:
+        _WRITE_STATS["performed"] = 0
+        _WRITE_STATS["skipped"] = 0
+    return stats
+
+
 def _get_owner_material(settings):
     """Helper to get the owning material from a BlenroseMaterialSettings instance."""
     mat = getattr(settings, "id_data", None)
@@ -430,6 +554,136 @@ def _get_owner_material(settings):
     return None
 
 
+# Reverse index from material pointer to the mesh objects using it, maintained
+# incrementally from depsgraph updates:
+#   "users":   material ptr -> {object ptr: object name}
+#   "objects": object ptr   -> (object name, mesh ptr, material ptrs)
+#   "meshes":  mesh ptr     -> {object ptr: object name}
+# The whole index is rebuilt lazily when flagged invalid or when the number of
+# objects in the file changes (covers additions and deletions).
+_MATERIAL_USERS_INDEX = {"valid": False, "object_count": 0, "users": {}, "objects": {}, "meshes": {}}
+
+# Memoized _guess_active_uv_for_material result per material pointer.
+_PREFERRED_UV_MEMO = {}
+
+
+def _index_object_materials(obj):
+    """(Re)index one object; returns the material pointers whose users changed."""
+    users = _MATERIAL_USERS_INDEX["users"]
+    meshes = _MATERIAL_USERS_INDEX["meshes"]
+    obj_ptr = obj.as_pointer()
+    previous = _MATERIAL_USERS_INDEX["objects"].pop(obj_ptr, None)
+    if previous:
+        _name, mesh_ptr, mat_ptrs = previous
+        meshes.get(mesh_ptr, {}).pop(obj_ptr, None)
+        for mat_ptr in mat_ptrs:
+            users.get(mat_ptr, {}).pop(obj_ptr, None)
+
+    current = None
+    if obj.type == "MESH" and obj.data:
+        mesh_ptr = obj.data.as_pointer()
+        mat_ptrs = frozenset(
+            slot.material.as_pointer() for slot in obj.material_slots if slot.material
+        )
+        current = (obj.name, mesh_ptr, mat_ptrs)
+        _MATERIAL_USERS_INDEX["objects"][obj_ptr] = current
+        meshes.setdefault(mesh_ptr, {})[obj_ptr] = obj.name
+        for mat_ptr in mat_ptrs:
+            users.setdefault(mat_ptr, {})[obj_ptr] = obj.name
+
+    if previous == current:
+        return frozenset()
+    return (previous[2] if previous else frozenset()) | (current[2] if current else frozenset())
+
+
+def _rebuild_material_users_index():
+    _MATERIAL_USERS_INDEX["users"] = {}
+    _MATERIAL_USERS_INDEX["objects"] = {}
+    _MATERIAL_USERS_INDEX["meshes"] = {}
+    for obj in bpy.data.objects:
+        if obj.type == "MESH":
+            _index_object_materials(obj)
+    _MATERIAL_USERS_INDEX["object_count"] = len(bpy.data.objects)
+    _MATERIAL_USERS_INDEX["valid"] = True
+    _forget_preferred_uv(list(_PREFERRED_UV_MEMO))
+
+
+def _invalidate_material_users_index():
+    _MATERIAL_USERS_INDEX["valid"] = False
+    _forget_preferred_uv(list(_PREFERRED_UV_MEMO))
+
+
+def _forget_preferred_uv(mat_ptrs):
+    """Drop memoized UV fallbacks (and detections that embedded them) for these materials."""
+    for mat_ptr in mat_ptrs:
+        if _PREFERRED_UV_MEMO.pop(mat_ptr, None) is not None:
+            _DETECTION_CACHE.pop(mat_ptr, None)
+
+
+def _ensure_material_users_index():
+    if not _MATERIAL_USERS_INDEX["valid"] or _MATERIAL_USERS_INDEX["object_count"] != len(bpy.data.objects):
+        _rebuild_material_users_index()
+
+
+def _material_user_objects(mat):
+    """Mesh objects that use ``mat`` in any material slot, via the reverse index."""
+    _ensure_material_users_index()
+
+    objects = []
+    for obj_ptr, obj_name in _MATERIAL_USERS_INDEX["users"].get(mat.as_pointer(), {}).items():
+        obj = bpy.data.objects.get(obj_name)
+        if obj is None or obj.as_pointer() != obj_ptr:
+            # Renamed or replaced behind our back; start over from scratch.
+            _rebuild_material_users_index()
+            return [
+                bpy.data.objects[name]
+                for name in _MATERIAL_USERS_INDEX["users"].get(mat.as_pointer(), {}).values()
+            ]
+        objects.append(obj)
+    return objects
+
+
+def _update_material_users_from_depsgraph(depsgraph):
+    """Keep the material -> objects index and UV memo in step with object/mesh updates."""
+    if not _MATERIAL_USERS_INDEX["valid"]:
+        return
+    if not (depsgraph.id_type_updated("OBJECT") or depsgraph.id_type_updated("MESH")):
+        return
+
+    for update in depsgraph.updates:
+        id_data = getattr(update.id, "original", update.id)
+        if isinstance(id_data, bpy.types.Object):
+            if id_data.type == "MESH":
+                _forget_preferred_uv(_index_object_materials(id_data))
+        elif isinstance(id_data, bpy.types.Mesh):
+            # UV layers and data-linked material slots live on the mesh.
+            mesh_users = _MATERIAL_USERS_INDEX["meshes"].get(id_data.as_pointer(), {})
+            for obj_ptr, obj_name in list(mesh_users.items()):
+                obj = bpy.data.objects.get(obj_name)
+                if obj is None or obj.as_pointer() != obj_ptr:
+                    _invalidate_material_users_index()
+                    return
+                previous = _MATERIAL_USERS_INDEX["objects"].get(obj_ptr)
+                _forget_preferred_uv(previous[2] if previous else ())
+                _forget_preferred_uv(_index_object_materials(obj))
+
+
+def _preferred_uv_for_mesh(mesh):
+    """UV map a mesh renders with: active-render layer, else active, else first."""
+    uv_layers = getattr(mesh, "uv_layers", None)
+    if not uv_layers:
+        return None
+
+    preferred = None
+    for layer in uv_layers:
+        if getattr(layer, "active_render", False) and layer.name:
+            preferred = layer.name
+            break
+    if not preferred and getattr(uv_layers, "active", None) and uv_layers.active.name:
+        preferred = uv_layers.active.name
+    if not preferred and len(uv_layers) > 0 and uv_layers[0].name:
+        preferred = uv_layers[0].name
+    return preferred
 
 
 def _guess_active_uv_for_material(mat):
@@ -437,48 +691,56 @@ def _guess_active_uv_for_material(mat):
     if not mat:
         return None
 
-    uv_name_counts = {}
-    for obj in bpy.data.objects:
-        if obj.type != "MESH" or not getattr(obj, "material_slots", None):
-            continue
-        if not any(slot.material == mat for slot in obj.material_slots):
-            continue
-
-        mesh = obj.data
-        uv_layers = getattr(mesh, "uv_layers", None)
-        if not uv_layers:
-            continue
-
-        preferred = None
-        for layer in uv_layers:
-            if getattr(layer, "active_render", False) and layer.name:
-                preferred = layer.name
-                break
-        if not preferred and getattr(uv_layers, "active", None) and uv_layers.active.name:
-            preferred = uv_layers.active.name
-        if not preferred and len(uv_layers) > 0 and uv_layers[0].name:
-            preferred = uv_layers[0].name
+    _ensure_material_users_index()
+    mat_ptr = mat.as_pointer()
+    if mat_ptr in _PREFERRED_UV_MEMO:
+        return _PREFERRED_UV_MEMO[mat_ptr] or None
 
+    uv_name_counts = {}
+    for obj in _material_user_objects(mat):
+        preferred = _preferred_uv_for_mesh(obj.data)
         if preferred:
             uv_name_counts[preferred] = uv_name_counts.get(preferred, 0) + 1
 
-    if not uv_name_counts:
-        return None
+    result = None
+    if uv_name_counts:
+        result = max(uv_name_counts.items(), key=lambda kv: kv[1])[0]
+    # "" marks a memoized miss so _forget_preferred_uv can tell it apart from "not cached".
+    _PREFERRED_UV_MEMO[mat_ptr] = result or ""
+    return result
+
+
+def _build_link_index(nt):
+    """
+    Index a node tree's links once per detection pass.
 
-    return max(uv_name_counts.items(), key=lambda kv: kv[1])[0]
+    Returns (links_from_node, links_to_socket): dicts keyed by node pointer and
+    input socket pointer, so callers don't rescan nt.links for every query.
+    Each list keeps nt.links order, which is the tie-break UV tracing relies
+    on when several links reach one socket (first link wins, as with a scan).
+    """
+    links_from_node = {}
+    links_to_socket = {}
+    for link in nt.links:
+        from_node = link.from_node
+        if from_node:
+            links_from_node.setdefault(from_node.as_pointer(), []).append(link)
+        to_socket = link.to_socket
+        if to_socket:
+            links_to_socket.setdefault(to_socket.as_pointer(), []).append(link)
+    return links_from_node, links_to_socket
 
 
-def _trace_uv_map_name_from_socket(nt, socket, mat, visited_nodes=None, depth=0):
+def _trace_uv_map_name_from_socket(nt, socket, mat, visited_nodes=None, depth=0, link_index=None):
     """Walk upstream from a vector socket and resolve an explicit or implied UV map name."""
     if depth > 8 or socket is None:
         return None
     if visited_nodes is None:
         visited_nodes = set()
+    if link_index is None:
+        link_index = _build_link_index(nt)
 
-    for link in nt.links:
-        if link.to_socket != socket:
-            continue
-
+    for link in link_index[1].get(socket.as_pointer(), ()):
         from_node = link.from_node
         if not from_node:
             continue
@@ -502,20 +764,20 @@ def _trace_uv_map_name_from_socket(nt, socket, mat, visited_nodes=None, depth=0)
                 return attr_name
 
         for input_socket in getattr(from_node, "inputs", []):
-            resolved = _trace_uv_map_name_from_socket(nt, input_socket, mat, visited_nodes, depth + 1)
+            resolved = _trace_uv_map_name_from_socket(nt, input_socket, mat, visited_nodes, depth + 1, link_index)
             if resolved:
                 return resolved
 
     return None
 
 
-def _resolve_uv_map_for_image_node(nt, img_node, mat):
+def _resolve_uv_map_for_image_node(nt, img_node, mat, link_index=None):
     """Resolve UV map name for an Image Texture node, even without explicit UVMap node."""
     if not img_node or img_node.type != "TEX_IMAGE":
         return None
 
     vector_input = img_node.inputs.get("Vector") if hasattr(img_node, "inputs") else None
-    resolved = _trace_uv_map_name_from_socket(nt, vector_input, mat)
+    resolved = _trace_uv_map_name_from_socket(nt, vector_input, mat, link_index=link_index)
     if resolved:
         return resolved
 
@@ -523,118 +785,251 @@ def _resolve_uv_map_for_image_node(nt, img_node, mat):
     return _guess_active_uv_for_material(mat)
 
 
+def _fallback_uv_fingerprint(mat):
+    """
+    The inputs of ``_guess_active_uv_for_material``: UV layer names and the
+    active / active-render layer of every mesh using ``mat``.
+    """
+    meshes = []
+    for obj in _material_user_objects(mat):
+        uv_layers = getattr(obj.data, "uv_layers", None)
+        if not uv_layers:
+            meshes.append((obj.as_pointer(), ()))
+            continue
+        active = getattr(uv_layers, "active", None)
+        meshes.append((
+            obj.as_pointer(),
+            tuple((layer.name, bool(getattr(layer, "active_render", False))) for layer in uv_layers),
+            active.name if active else "",
+        ))
+    return tuple(sorted(meshes))
+
+
+def _node_tree_fingerprint(mat):
+    """
+    Cheap structural fingerprint of a material's node tree.
+
+    Covers everything texture detection looks at: node names, types, labels,
+    images and UV/attribute names, plus every link endpoint and the UV maps
+    of the material's users (the fallback for implicit UVs).
+    """
+    nt = mat.node_tree
+    nodes = []
+    for node in nt.nodes:
+        image = getattr(node, "image", None)
+        nodes.append((
+            node.name,
+            node.bl_idname,
+            node.label,
+            image.as_pointer() if image else 0,
+            getattr(node, "uv_map", ""),
+            getattr(node, "attribute_name", ""),
+        ))
+    links = [
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in nt.links
+    ]
+    return (mat.name, nt.as_pointer(), tuple(nodes), tuple(links), _fallback_uv_fingerprint(mat))
+
+
+def _evict_detection_cache(mat=None):
+    """Drop the cached detection for one material, or for all materials if None."""
+    if mat is None:
+        _DETECTION_CACHE.clear()
+        _DETECTION_CACHE_STATE["material_count"] = 0
+    else:
+        _DETECTION_CACHE.pop(mat.as_pointer(), None)
+
+
+def _prune_detection_cache():
+    """
+    Evict cached detections and UV fallbacks of materials that no longer
+    exist. The pointer scan only runs when the material count changed.
+    """
+    material_count = len(bpy.data.materials)
+    previous_count = _DETECTION_CACHE_STATE["material_count"]
+    _DETECTION_CACHE_STATE["material_count"] = material_count
+    if material_count == previous_count and len(_DETECTION_CACHE) <= material_count:
+        return
+
+    live = {mat.as_pointer() for mat in bpy.data.materials}
+    for cache in (_DETECTION_CACHE, _PREFERRED_UV_MEMO):
+        for mat_ptr in list(cache):
+            if mat_ptr not in live:
+                del cache[mat_ptr]
+
+
 def _detect_textures_from_node_tree(mat):
     """
     Scan the shader node tree for Image Texture nodes and map them to BlenRose channels.
     Returns a dictionary mapping channel names to (image, uv_node) tuples.
+    Results are cached per material and reused while the tree fingerprint is unchanged.
     """
     if not mat or not mat.use_nodes or not mat.node_tree:
         return {}
-    
+
+    mat_ptr = mat.as_pointer()
+    fingerprint = _node_tree_fingerprint(mat)
+    cached = _DETECTION_CACHE.get(mat_ptr)
+    if cached is None or cached[0] != fingerprint:
+        # The memoized UV fallback may predate a UV layer rename
+        _PREFERRED_UV_MEMO.pop(mat_ptr, None)
+        cached = (fingerprint, _scan_node_tree_for_textures(mat))
+        _DETECTION_CACHE[mat_ptr] = cached
+
+    # Hand out copies so callers can't mutate the cached result.
+    return {channel: dict(info) for channel, info in cached[1].items()}
+
+
+# Channel detection rules in priority order (ties go to the earlier channel):
+# (channel_name, name keywords, connection targets, strong-link feature).
+# Each keyword found in the node name/label scores 10, each connection target
+# (socket name or node type) the image feeds scores 20, and every link
+# counted by the strong-link feature scores 30.
+_CHANNEL_DETECTION_RULES = (
+    ("diffuse", ("diffuse", "base", "color", "albedo"), ("Base Color", "Color"), "bsdf_color_links"),
+    ("specular", ("specular", "spec"), ("Specular", "Specular IOR Level", "Specular Tint"), "specular_links"),
+    ("normal", ("normal", "norm", "nrm"), ("Normal",), "normal_links"),
+    ("lightmap", ("lightmap", "light", "lm", "emission"), ("Emission", "Color"), "emission_links"),
+    ("detail", ("detail", "det"), (), None),
+    ("macro_overlay", ("macro", "overlay"), (), None),
+    ("environment", ("environment", "env", "reflection"), (), None),
+    ("decal", ("decal",), (), None),
+    ("transparent", ("transparent", "alpha"), ("Alpha",), None),
+    ("noise", ("noise",), (), None),
+)
+
+
+def _compile_detection_keywords(rules):
+    """
+    Build one regex for every detection keyword plus the lookup tables to score it.
+
+    The lookahead alternation (longest keywords first) reports the longest
+    keyword starting at each position of the name. Every keyword that is a
+    substring of a reported match is present in the name too, which keeps the
+    old "10 points per keyword contained in the name" semantics.
+    """
+    keywords = sorted({kw for _, kws, _, _ in rules for kw in kws}, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in keywords) + "))")
+    contained = {match: tuple(kw for kw in keywords if kw in match) for match in keywords}
+    rule_indices = {
+        kw: tuple(i for i, (_, kws, _, _) in enumerate(rules) if kw in kws)
+        for kw in keywords
+    }
+    return pattern, contained, rule_indices
+
+
+_DETECTION_KEYWORD_RE, _DETECTION_CONTAINED_KEYWORDS, _DETECTION_KEYWORD_RULES = (
+    _compile_detection_keywords(_CHANNEL_DETECTION_RULES)
+)
+
+
+def _image_node_features(outgoing_links, normal_input_nodes):
+    """
+    Extract the connection facts used for channel scoring in one pass over an
+    image node's outgoing links.
+
+    normal_input_nodes caches, per node pointer, whether that node has a
+    "Normal" input, and is shared across all image nodes of a detection pass.
+    """
+    targets = set()
+    features = {
+        "targets": targets,
+        "emission_links": 0,
+        "normal_links": 0,
+        "bsdf_color_links": 0,
+        "specular_links": 0,
+    }
+    for link in outgoing_links:
+        to_socket = link.to_socket
+        to_node = link.to_node
+        socket_name = to_socket.name if to_socket else ""
+        if to_socket:
+            targets.add(socket_name)
+            # Also check parent node type
+            if to_socket.node:
+                targets.add(to_socket.node.type)
+
+        if to_node:
+            node_type = to_node.type
+            if node_type == "EMISSION":
+                features["emission_links"] += 1
+
+            node_ptr = to_node.as_pointer()
+            has_normal_input = normal_input_nodes.get(node_ptr)
+            if has_normal_input is None:
+                has_normal_input = hasattr(to_node, "inputs") and any(s.name == "Normal" for s in to_node.inputs)
+                normal_input_nodes[node_ptr] = has_normal_input
+            if node_type == "NORMAL_MAP" or has_normal_input:
+                features["normal_links"] += 1
+
+            # "Color" also covers "Base Color".
+            if "Color" in socket_name and node_type in ("BSDF_PRINCIPLED", "BSDF_DIFFUSE"):
+                features["bsdf_color_links"] += 1
+
+        if "Specular" in socket_name:
+            features["specular_links"] += 1
+
+    return features
+
+
+def _score_image_node(name_lower, features):
+    """Score an image node against every channel rule; returns (best_channel, best_score)."""
+    scores = [0] * len(_CHANNEL_DETECTION_RULES)
+
+    # Check node name/label for keywords
+    present = set()
+    for match in _DETECTION_KEYWORD_RE.findall(name_lower):
+        present.update(_DETECTION_CONTAINED_KEYWORDS[match])
+    for keyword in present:
+        for rule_index in _DETECTION_KEYWORD_RULES[keyword]:
+            scores[rule_index] += 10
+
+    # Check connections
+    targets = features["targets"]
+    best_match = None
+    best_score = 0
+    for rule_index, (channel_name, _keywords, rule_targets, strong_feature) in enumerate(_CHANNEL_DETECTION_RULES):
+        score = scores[rule_index]
+        for target in rule_targets:
+            if target in targets:
+                score += 20  # Connection is stronger indicator
+        if strong_feature:
+            score += 30 * features[strong_feature]  # Very strong indicator
+        if score > best_score:
+            best_score = score
+            best_match = channel_name
+    return best_match, best_score
+
+
+def _scan_node_tree_for_textures(mat):
+    """Uncached worker for _detect_textures_from_node_tree."""
     nt = mat.node_tree
     detected_textures = {}
-    
-    # Find all Image Texture nodes
-    image_nodes = [node for node in nt.nodes if node.type == "TEX_IMAGE" and node.image]
-    
-    # Channel mapping based on node connections and names
-    # Map: (channel_name, detection_keywords, connection_targets)
-    channel_detection = [
-        ("diffuse", ["diffuse", "base", "color", "albedo"], ["Base Color", "Color"]),
-        ("specular", ["specular", "spec"], ["Specular", "Specular IOR Level", "Specular Tint"]),
-        ("normal", ["normal", "norm", "nrm"], ["Normal"]),
-        ("lightmap", ["lightmap", "light", "lm", "emission"], ["Emission", "Color"]),  # Check emission connection
-        ("detail", ["detail", "det"], []),
-        ("macro_overlay", ["macro", "overlay"], []),
-        ("environment", ["environment", "env", "reflection"], []),
-        ("decal", ["decal"], []),
-        ("transparent", ["transparent", "alpha"], ["Alpha"]),
-        ("noise", ["noise"], []),
-    ]
-    
-    for img_node in image_nodes:
-        if not img_node.image:
+    link_index = _build_link_index(nt)
+    links_from_node = link_index[0]
+    normal_input_nodes = {}
+
+    for node in nt.nodes:
+        if node.type != "TEX_IMAGE" or not node.image:
             continue
-        
+
         # Get node name/label (case-insensitive)
-        node_name_lower = (img_node.name + " " + (img_node.label or "")).lower()
-        
-        # Check where this texture is connected
-        connected_targets = []
-        for link in nt.links:
-            if link.from_node == img_node:
-                to_socket = link.to_socket
-                if to_socket:
-                    connected_targets.append(to_socket.name)
-                    # Also check parent node type
-                    if to_socket.node:
-                        connected_targets.append(to_socket.node.type)
-        
-        # Try to match to a channel
-        best_match = None
-        best_score = 0
-        
-        for channel_name, keywords, targets in channel_detection:
-            score = 0
-            
-            # Check node name/label for keywords
-            for keyword in keywords:
-                if keyword in node_name_lower:
-                    score += 10
-            
-            # Check connections
-            for target in targets:
-                if target in connected_targets:
-                    score += 20  # Connection is stronger indicator
-            
-            # Special handling for lightmap (connected to emission)
-            if channel_name == "lightmap":
-                for link in nt.links:
-                    if link.from_node == img_node and link.to_node and link.to_node.type == "EMISSION":
-                        score += 30  # Very strong indicator
-            
-            # Special handling for normal (connected to normal map or normal input)
-            if channel_name == "normal":
-                for link in nt.links:
-                    if link.from_node == img_node:
-                        to_node = link.to_node
-                        if to_node and (to_node.type == "NORMAL_MAP" or 
-                                       (hasattr(to_node, "inputs") and "Normal" in [s.name for s in to_node.inputs])):
-                            score += 30
-            
-            # Special handling for diffuse (connected to base color)
-            if channel_name == "diffuse":
-                for link in nt.links:
-                    if link.from_node == img_node:
-                        to_socket = link.to_socket
-                        if to_socket and ("Base Color" in to_socket.name or "Color" in to_socket.name):
-                            to_node = link.to_node
-                            if to_node and to_node.type in ["BSDF_PRINCIPLED", "BSDF_DIFFUSE"]:
-                                score += 30
-            
-            # Special handling for specular (connected to specular input)
-            if channel_name == "specular":
-                for link in nt.links:
-                    if link.from_node == img_node:
-                        to_socket = link.to_socket
-                        if to_socket and "Specular" in to_socket.name:
-                            score += 30
-            
-            if score > best_score:
-                best_score = score
-                best_match = channel_name
-        
+        name_lower = (node.name + " " + (node.label or "")).lower()
+        features = _image_node_features(links_from_node.get(node.as_pointer(), ()), normal_input_nodes)
+        best_match, best_score = _score_image_node(name_lower, features)
+
         # If we found a match and haven't already assigned this channel
         if best_match and best_score > 0 and best_match not in detected_textures:
-            uv_map_name = _resolve_uv_map_for_image_node(nt, img_node, mat)
+            uv_map_name = _resolve_uv_map_for_image_node(nt, node, mat, link_index)
 
             detected_textures[best_match] = {
-                "image": img_node.image,
+                "image": node.image,
                 "uv_node": None,
                 "uv_map_name": uv_map_name,
-                "image_node": img_node
+                "image_node": node
             }
-    
+
     return detected_textures
 
 
@@ -692,7 +1087,7 @@ def _auto_fill_textures_from_node_tree(settings, update_existing=False):
                 # Update texture (respecting update_existing flag)
                 current_image = getattr(settings, tex_prop, None)
                 if update_existing or not current_image:
-                    setattr(settings, tex_prop, texture_info["image"])
+                    _set_if_changed(settings, tex_prop, texture_info["image"])
             
             if uv_prop:
                 uv_map_name = texture_info.get("uv_map_name")
@@ -703,7 +1098,7 @@ def _auto_fill_textures_from_node_tree(settings, update_existing=False):
                         for identifier, name, desc in uv_enum_items:
                             if identifier == uv_map_name or name == uv_map_name:
                                 # Set using the identifier string (first element of tuple)
-                                setattr(settings, uv_prop, identifier)
+                                _set_if_changed(settings, uv_prop, identifier)
                                 break
                     except:
                         pass  # Silently fail if context is not available
@@ -750,40 +1145,199 @@ def _update_uv_from_prop(self, node_name, uv_prop):
         uv_node.uv_map = uv_name
 
 
+# BR_* node(s) owned by each settings property. Property update callbacks
+# only resync the nodes their property owns.
+_TEXTURE_NODE_PROPS = {
+    "diffuse_tex": "BR_DiffuseTex",
+    "lightmap_tex": "BR_LightmapTex",
+    "specular_tex": "BR_SpecularTex",
+    "normal_tex": "BR_NormalTex",
+    "detail_tex": "BR_DetailTex",
+    "macro_overlay_tex": "BR_MacroOverlayTex",
+    "environment_tex": "BR_EnvironmentTex",
+    "decal_tex": "BR_DecalTex",
+    "transparent_tex": "BR_TransparentTex",
+    "noise_tex": "BR_NoiseTex",
+}
+
+_UV_NODE_PROPS = {
+    "diffuse_uv": "BR_DiffuseUV",
+    "lightmap_uv": "BR_LightmapUV",
+    "specular_uv": "BR_SpecularUV",
+    "normal_uv": "BR_NormalUV",
+    "detail_uv": "BR_DetailUV",
+    "macro_overlay_uv": "BR_MacroOverlayUV",
+    "environment_uv": "BR_EnvironmentUV",
+    "decal_uv": "BR_DecalUV",
+    "transparent_uv": "BR_TransparentUV",
+    "noise_uv": "BR_NoiseUV",
+}
+
+# Scalar properties: (node name, input socket, default, write as UV scale vector)
+_SCALAR_NODE_PROPS = {
+    "detail_normal_uv_scale": ("BR_DetailMapping", "Scale", 8.0, True),
+    "macro_overlay_uv_scale": ("BR_MacroMapping", "Scale", 0.3, True),
+    "macro_overlay_opacity": ("BR_MacroMix", "Fac", 1.0, False),
+}
+
+# Texture nodes whose whole sub-graph is added/removed with the texture.
+_OPTIONAL_SUBGRAPH_NODES = {"BR_DetailTex", "BR_MacroOverlayTex"}
+
+_NODE_SYNC_PROPS = tuple(_TEXTURE_NODE_PROPS) + tuple(_UV_NODE_PROPS) + tuple(_SCALAR_NODE_PROPS)
+
+# Open blenrose_batch() transactions and the node syncs they have collected.
+_SYNC_BATCH = {"depth": 0, "pending": {}}
+
+
+def _queue_settings_sync(settings, prop_name=None):
+    """Queue a node resync for one property (or all properties if None) of a settings block."""
+    mat = _get_owner_material(settings)
+    if not mat:
+        return
+
+    if mat.as_pointer() in _SUPPRESSED_UPDATE_MATERIALS:
+        return
+
+    _queue_material_sync(mat, parts=None if prop_name is None else (prop_name,))
+
+
+@contextmanager
+def blenrose_batch():
+    """
+    Batch Blenrose property assignments into one node reconciliation per material.
+
+    Update callbacks fired inside the block only record what changed; the
+    affected nodes are synced once, synchronously, when the outermost block
+    exits. If the block raises, the collected syncs are discarded instead of
+    pushing half-applied settings into the node trees. Intended for scripted
+    bulk edits:
+
+        with BlenRose.blenrose_batch():
+            for mat in bpy.data.materials:
+                mat.blenrose_settings.macro_overlay_opacity = 0.5
+    """
+    _SYNC_BATCH["depth"] += 1
+    try:
+        yield
+    except BaseException:
+        _SYNC_BATCH["depth"] -= 1
+        if _SYNC_BATCH["depth"] == 0:
+            _SYNC_BATCH["pending"] = {}
+        raise
+    _SYNC_BATCH["depth"] -= 1
+    if _SYNC_BATCH["depth"] == 0:
+        pending = _SYNC_BATCH["pending"]
+        _SYNC_BATCH["pending"] = {}
+        for mat_ptr, entry in pending.items():
+            _process_sync_entry(mat_ptr, entry)
+
+
 def _update_diffuse_uv(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "diffuse_uv")
 
 
 def _update_lightmap_uv(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "lightmap_uv")
 
 
 def _update_specular_uv(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "specular_uv")
 
 
 def _update_normal_uv(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "normal_uv")
 
 
-def _update_scalar_values(self, context):
-    """Update scalar values in node tree when they change."""
-    _update_all_blenrose_nodes(self, context)
+def _update_detail_uv(self, context):
+    _queue_settings_sync(self, "detail_uv")
 
 
-def _update_all_blenrose_nodes(self, context):
-    """
-    Update all Blenrose nodes (textures, UVs, and scalar values) from current settings.
-    This ensures all nodes stay in sync when any property changes.
-    If critical nodes are missing, rebuild the entire node tree.
-    """
-    mat = _get_owner_material(self)
-    if not mat:
+def _update_macro_overlay_uv(self, context):
+    _queue_settings_sync(self, "macro_overlay_uv")
+
+
+def _update_environment_uv(self, context):
+    _queue_settings_sync(self, "environment_uv")
+
+
+def _update_decal_uv(self, context):
+    _queue_settings_sync(self, "decal_uv")
+
+
+def _update_transparent_uv(self, context):
+    _queue_settings_sync(self, "transparent_uv")
+
+
+def _update_noise_uv(self, context):
+    _queue_settings_sync(self, "noise_uv")
+
+
+def _update_detail_normal_uv_scale(self, context):
+    _queue_settings_sync(self, "detail_normal_uv_scale")
+
+
+def _update_macro_overlay_uv_scale(self, context):
+    _queue_settings_sync(self, "macro_overlay_uv_scale")
+
+
+def _update_macro_overlay_opacity(self, context):
+    _queue_settings_sync(self, "macro_overlay_opacity")
+
+
+def _apply_setting_to_nodes(nt, settings, prop_name):
+    """Push a single settings property into the BR_* node that owns it."""
+    node_name = _TEXTURE_NODE_PROPS.get(prop_name)
+    if node_name in _OPTIONAL_SUBGRAPH_NODES:
+        # Detail / macro overlay sub-graphs only exist while their texture is set.
+        if bool(nt.nodes.get(node_name)) != bool(getattr(settings, prop_name, None)):
+            _reconcile_blenrose_subgraphs(settings.id_data)
+            return
+    if node_name:
+        tex_node = nt.nodes.get(node_name)
+        if tex_node and tex_node.type == "TEX_IMAGE":
+            _set_if_changed(tex_node, "image", getattr(settings, prop_name, None))
         return
 
-    if mat.as_pointer() in _SUPPRESSED_UPDATE_MATERIALS:
+    node_name = _UV_NODE_PROPS.get(prop_name)
+    if node_name:
+        uv_node = nt.nodes.get(node_name)
+        if uv_node and uv_node.type == "UVMAP":
+            uv_name = getattr(settings, prop_name, None)
+            if uv_name:
+                _set_if_changed(uv_node, "uv_map", uv_name)
         return
-    
+
+    scalar = _SCALAR_NODE_PROPS.get(prop_name)
+    if scalar:
+        node_name, socket_name, default, is_uv_scale = scalar
+        node = nt.nodes.get(node_name)
+        if node:
+            value = getattr(settings, prop_name, default)
+            _set_if_changed(node.inputs[socket_name], "default_value", (value, value, 1.0) if is_uv_scale else value)
+
+
+def _ensure_lightmap_emission_link(nt):
+    """Always keep BR_LightmapTex Color wired into BR_Emission Color (even without an image)."""
+    emit_node = nt.nodes.get("BR_Emission")
+    lightmap_tex_node = nt.nodes.get("BR_LightmapTex")
+    if not emit_node or not lightmap_tex_node:
+        return
+
+    emit_color = emit_node.inputs["Color"]
+    for link in emit_color.links:
+        if link.from_node == lightmap_tex_node and link.from_socket.name == "Color":
+            return
+    nt.links.new(lightmap_tex_node.outputs["Color"], emit_color)
+
+
+def _sync_blenrose_nodes(mat, parts=None):
+    """
+    Push Blenrose settings into the material's BR_* nodes.
+    ``parts`` limits the sync to the nodes owned by those properties; None
+    syncs everything. If critical nodes are missing, rebuild the entire node tree.
+    """
+    settings = mat.blenrose_settings
+
     # Ensure nodes are enabled
     if not mat.use_nodes:
         mat.use_nodes = True
@@ -805,343 +1359,360 @@ def _update_all_blenrose_nodes(self, context):
     if missing_critical:
         _build_blenrose_node_tree(mat)
         return
-    
-    # Otherwise, proceed with normal updates
-    
-    # Update all texture nodes
-    texture_mappings = [
-        ("BR_DiffuseTex", "diffuse_tex"),
-        ("BR_LightmapTex", "lightmap_tex"),
-        ("BR_SpecularTex", "specular_tex"),
-        ("BR_NormalTex", "normal_tex"),
-        ("BR_DetailTex", "detail_tex"),
-        ("BR_MacroOverlayTex", "macro_overlay_tex"),
-        ("BR_EnvironmentTex", "environment_tex"),
-        ("BR_DecalTex", "decal_tex"),
-        ("BR_TransparentTex", "transparent_tex"),
-        ("BR_NoiseTex", "noise_tex"),
-    ]
-    
-    for node_name, prop_name in texture_mappings:
-        tex_node = nt.nodes.get(node_name)
-        if tex_node and tex_node.type == "TEX_IMAGE":
-            tex_image = getattr(self, prop_name, None)
-            tex_node.image = tex_image
-    
-    # Update all UV map nodes
-    uv_mappings = [
-        ("BR_DiffuseUV", "diffuse_uv"),
-        ("BR_LightmapUV", "lightmap_uv"),
-        ("BR_SpecularUV", "specular_uv"),
-        ("BR_NormalUV", "normal_uv"),
-        ("BR_DetailUV", "detail_uv"),
-        ("BR_MacroOverlayUV", "macro_overlay_uv"),
-        ("BR_EnvironmentUV", "environment_uv"),
-        ("BR_DecalUV", "decal_uv"),
-        ("BR_TransparentUV", "transparent_uv"),
-        ("BR_NoiseUV", "noise_uv"),
-    ]
-    
-    for node_name, prop_name in uv_mappings:
-        uv_node = nt.nodes.get(node_name)
-        if uv_node and uv_node.type == "UVMAP":
-            uv_name = getattr(self, prop_name, None)
-            if uv_name:
-                uv_node.uv_map = uv_name
-    
-    # Update scalar values that affect nodes
-    # Detail Normal UV Scale
-    detail_mapping = nt.nodes.get("BR_DetailMapping")
-    if detail_mapping:
-        scale_val = getattr(self, "detail_normal_uv_scale", 8.0)
-        detail_mapping.inputs["Scale"].default_value = (scale_val, scale_val, 1.0)
-    
-    # Macro Overlay UV Scale
-    macro_mapping = nt.nodes.get("BR_MacroMapping")
-    if macro_mapping:
-        scale_val = getattr(self, "macro_overlay_uv_scale", 0.3)
-        macro_mapping.inputs["Scale"].default_value = (scale_val, scale_val, 1.0)
-    
-    # Macro Overlay Opacity
-    macro_mix = nt.nodes.get("BR_MacroMix")
-    if macro_mix:
-        opacity_val = getattr(self, "macro_overlay_opacity", 1.0)
-        macro_mix.inputs["Fac"].default_value = opacity_val
-    
-    # Update Mix Shader Fac to 0.02 (always use this value, regardless of lightmap)
-    mix_shader_node = nt.nodes.get("BR_MixShader")
-    if mix_shader_node and mix_shader_node.inputs["Fac"].is_linked == False:
-        mix_shader_node.inputs["Fac"].default_value = 0.02
-    
-    # Update lightmap-to-emission connection (always maintain the connection)
-    emit_node = nt.nodes.get("BR_Emission")
-    lightmap_tex_node = nt.nodes.get("BR_LightmapTex")
-    
-    if emit_node and lightmap_tex_node:
-        # Check if connection already exists
-        connection_exists = False
-        for link in nt.links:
-            if link.from_node == lightmap_tex_node and link.to_node == emit_node and link.from_socket.name == "Color" and link.to_socket.name == "Color":
-                connection_exists = True
-                break
-        
-        # Always connect lightmap to emission (even if texture is None, the connection should exist)
-        if not connection_exists:
-            nt.links.new(lightmap_tex_node.outputs["Color"], emit_node.inputs["Color"])
+
+    for prop_name in (_NODE_SYNC_PROPS if parts is None else parts):
+        _apply_setting_to_nodes(nt, settings, prop_name)
+
+    if parts is None:
+        # Update Mix Shader Fac to 0.02 (always use this value, regardless of lightmap)
+        mix_shader_node = nt.nodes.get("BR_MixShader")
+        if mix_shader_node and mix_shader_node.inputs["Fac"].is_linked == False:
+            _set_if_changed(mix_shader_node.inputs["Fac"], "default_value", 0.02)
+
+    if parts is None or "lightmap_tex" in parts:
+        _ensure_lightmap_emission_link(nt)
 
 
 def _update_diffuse_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "diffuse_tex")
 
 
 def _update_lightmap_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "lightmap_tex")
 
 
 def _update_specular_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "specular_tex")
 
 
 def _update_normal_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "normal_tex")
 
 
 def _update_detail_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "detail_tex")
 
 
 def _update_macro_overlay_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "macro_overlay_tex")
 
 
 def _update_environment_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "environment_tex")
 
 
 def _update_decal_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "decal_tex")
 
 
 def _update_transparent_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "transparent_tex")
 
 
 def _update_noise_tex(self, context):
-    _update_all_blenrose_nodes(self, context)
+    _queue_settings_sync(self, "noise_tex")
 
 
-def _build_blenrose_node_tree(mat):
+# Principled BSDF specular input, by Blender version
+_BSDF_SPECULAR_INPUTS = ("Specular", "Specular IOR Level", "Specular Tint")
+
+
+def _blenrose_graph_spec(settings):
     """
-    Build or rebuild the Blenrose node tree for a material.
-    Clears existing nodes and creates a complete Blenrose setup.
+    Declarative description of the Blenrose node graph for a settings block.
+
+    Returns (nodes, links). ``nodes`` maps each BR_* node name to a dict with
+    its "type" (bl_idname), "location", and optional "label", "props" (node
+    attributes such as image / uv_map) and "inputs" (input default values).
+    A node with "requires": (node, input socket) only exists while that
+    node has such an input. ``links`` is a list of (from_node, from_socket,
+    to_node, to_socket) where a socket is a name, an index, or a tuple of
+    alternative names.
+    The detail normal and macro overlay sub-graphs are only present while
+    their texture is set.
     """
-    if not mat.use_nodes:
-        mat.use_nodes = True
-    
-    nt = mat.node_tree
-    
-    # Clear all existing nodes
-    for node in list(nt.nodes):
-        nt.nodes.remove(node)
-    
-    # Create output node
-    out = nt.nodes.new("ShaderNodeOutputMaterial")
-    out.location = (600, 0)
-    
-    # Create BSDF
-    bsdf = nt.nodes.new("ShaderNodeBsdfPrincipled")
-    bsdf.name = "BR_BSDF"
-    bsdf.location = (200, 0)
-    
-    # Final shader output: Mix Shader blends BSDF with lightmap emission
-    mix_shader = nt.nodes.new("ShaderNodeMixShader")
-    mix_shader.name = "BR_MixShader"
-    mix_shader.location = (400, 100)
-    
-    # Emission shader for lightmap
-    emit = nt.nodes.new("ShaderNodeEmission")
-    emit.name = "BR_Emission"
-    emit.location = (200, 200)
-    
-    settings = mat.blenrose_settings
-    
-    # Diffuse
-    uv_diff = nt.nodes.new("ShaderNodeUVMap")
-    uv_diff.name = "BR_DiffuseUV"
-    uv_diff.location = (-800, 200)
-    diffuse_uv_name = getattr(settings, "diffuse_uv", None)
-    if diffuse_uv_name:
-        uv_diff.uv_map = diffuse_uv_name
-    
-    tex_diff = nt.nodes.new("ShaderNodeTexImage")
-    tex_diff.name = "BR_DiffuseTex"
-    tex_diff.label = "DiffuseTexture"
-    tex_diff.location = (-600, 200)
-    tex_diff.image = settings.diffuse_tex
-    nt.links.new(uv_diff.outputs["UV"], tex_diff.inputs["Vector"])
-    # Don't connect directly - will be connected after macro overlay blending
-    base_color_result = tex_diff.outputs["Color"]
-    
-    # Normal
-    uv_norm = nt.nodes.new("ShaderNodeUVMap")
-    uv_norm.name = "BR_NormalUV"
-    uv_norm.location = (-800, 0)
-    normal_uv_name = getattr(settings, "normal_uv", None)
-    if normal_uv_name:
-        uv_norm.uv_map = normal_uv_name
-    
-    tex_norm = nt.nodes.new("ShaderNodeTexImage")
-    tex_norm.name = "BR_NormalTex"
-    tex_norm.label = "NormalTexture"
-    tex_norm.location = (-600, 0)
-    tex_norm.image = settings.normal_tex
-    nt.links.new(uv_norm.outputs["UV"], tex_norm.inputs["Vector"])
-    
-    normal_map = nt.nodes.new("ShaderNodeNormalMap")
-    normal_map.location = (-400, 0)
-    normal_map.name = "BR_NormalMap"
-    nt.links.new(tex_norm.outputs["Color"], normal_map.inputs["Color"])
-    # Don't connect yet - will connect after detail normal blending if needed
-    base_normal_result = normal_map.outputs["Normal"]
-    
-    # Specular
-    uv_spec = nt.nodes.new("ShaderNodeUVMap")
-    uv_spec.name = "BR_SpecularUV"
-    uv_spec.location = (-800, -200)
-    specular_uv_name = getattr(settings, "specular_uv", None)
-    if specular_uv_name:
-        uv_spec.uv_map = specular_uv_name
-    
-    tex_spec = nt.nodes.new("ShaderNodeTexImage")
-    tex_spec.name = "BR_SpecularTex"
-    tex_spec.label = "SpecularTexture"
-    tex_spec.location = (-600, -200)
-    tex_spec.image = settings.specular_tex
-    nt.links.new(uv_spec.outputs["UV"], tex_spec.inputs["Vector"])
-    
-    # Connect specular texture - check if Specular input exists
-    specular_input = None
-    if "Specular" in bsdf.inputs:
-        specular_input = bsdf.inputs["Specular"]
-    elif "Specular IOR Level" in bsdf.inputs:
-        specular_input = bsdf.inputs["Specular IOR Level"]
-    elif "Specular Tint" in bsdf.inputs:
-        specular_input = bsdf.inputs["Specular Tint"]
-    
-    if specular_input is not None:
-        separate_rgb = nt.nodes.new("ShaderNodeSeparateRGB")
-        separate_rgb.location = (-400, -200)
-        separate_rgb.label = "Specular Extract"
-        nt.links.new(tex_spec.outputs["Color"], separate_rgb.inputs["Image"])
-        nt.links.new(separate_rgb.outputs["R"], specular_input)
-    
-    # Lightmap as emission contribution
-    uv_light = nt.nodes.new("ShaderNodeUVMap")
-    uv_light.name = "BR_LightmapUV"
-    uv_light.location = (-800, 400)
-    lightmap_uv_name = getattr(settings, "lightmap_uv", None)
-    if lightmap_uv_name:
-        uv_light.uv_map = lightmap_uv_name
-    
-    tex_light = nt.nodes.new("ShaderNodeTexImage")
-    tex_light.name = "BR_LightmapTex"
-    tex_light.label = "LightMapTexture"
-    tex_light.location = (-600, 400)
-    tex_light.image = settings.lightmap_tex
-    nt.links.new(uv_light.outputs["UV"], tex_light.inputs["Vector"])
-    
-    # Always connect lightmap texture Color output to Emission Color input
-    nt.links.new(tex_light.outputs["Color"], emit.inputs["Color"])
-    
-    # Always connect Emission to Mix Shader input 2 (second shader)
-    nt.links.new(emit.outputs["Emission"], mix_shader.inputs[2])
-    
-    # Set Mix Shader Fac to 0.02 (always use this value)
-    mix_shader.inputs["Fac"].default_value = 0.02
-    
-    # Detail Normal with UV Scale
-    detail_normal_result = None
+    def uv_props(prop_name):
+        uv_name = getattr(settings, prop_name, None)
+        return {"uv_map": uv_name} if uv_name else {}
+
+    nodes = {
+        # Final shader output: Mix Shader blends BSDF with lightmap emission
+        "BR_Output": {"type": "ShaderNodeOutputMaterial", "location": (600, 0)},
+        "BR_BSDF": {"type": "ShaderNodeBsdfPrincipled", "location": (200, 0)},
+        # Mix Shader Fac is always 0.02
+        "BR_MixShader": {"type": "ShaderNodeMixShader", "location": (400, 100), "inputs": {"Fac": 0.02}},
+        # Emission shader for lightmap
+        "BR_Emission": {"type": "ShaderNodeEmission", "location": (200, 200)},
+        # Diffuse
+        "BR_DiffuseUV": {"type": "ShaderNodeUVMap", "location": (-800, 200), "props": uv_props("diffuse_uv")},
+        "BR_DiffuseTex": {
+            "type": "ShaderNodeTexImage", "location": (-600, 200), "label": "DiffuseTexture",
+            "props": {"image": settings.diffuse_tex},
+        },
+        # Normal
+        "BR_NormalUV": {"type": "ShaderNodeUVMap", "location": (-800, 0), "props": uv_props("normal_uv")},
+        "BR_NormalTex": {
+            "type": "ShaderNodeTexImage", "location": (-600, 0), "label": "NormalTexture",
+            "props": {"image": settings.normal_tex},
+        },
+        "BR_NormalMap": {"type": "ShaderNodeNormalMap", "location": (-400, 0)},
+        # Specular
+        "BR_SpecularUV": {"type": "ShaderNodeUVMap", "location": (-800, -200), "props": uv_props("specular_uv")},
+        "BR_SpecularTex": {
+            "type": "ShaderNodeTexImage", "location": (-600, -200), "label": "SpecularTexture",
+            "props": {"image": settings.specular_tex},
+        },
+        # Only when the BSDF has a specular input (its name depends on the Blender version)
+        "BR_SpecularExtract": {
+            "type": "ShaderNodeSeparateRGB", "location": (-400, -200), "label": "Specular Extract",
+            "requires": ("BR_BSDF", _BSDF_SPECULAR_INPUTS),
+        },
+        # Lightmap as emission contribution
+        "BR_LightmapUV": {"type": "ShaderNodeUVMap", "location": (-800, 400), "props": uv_props("lightmap_uv")},
+        "BR_LightmapTex": {
+            "type": "ShaderNodeTexImage", "location": (-600, 400), "label": "LightMapTexture",
+            "props": {"image": settings.lightmap_tex},
+        },
+    }
+    links = [
+        ("BR_DiffuseUV", "UV", "BR_DiffuseTex", "Vector"),
+        ("BR_NormalUV", "UV", "BR_NormalTex", "Vector"),
+        ("BR_NormalTex", "Color", "BR_NormalMap", "Color"),
+        ("BR_SpecularUV", "UV", "BR_SpecularTex", "Vector"),
+        ("BR_SpecularTex", "Color", "BR_SpecularExtract", "Image"),
+        ("BR_SpecularExtract", "R", "BR_BSDF", _BSDF_SPECULAR_INPUTS),
+        ("BR_LightmapUV", "UV", "BR_LightmapTex", "Vector"),
+        # Always connect lightmap texture Color output to Emission Color input
+        ("BR_LightmapTex", "Color", "BR_Emission", "Color"),
+        # Emission is Mix Shader input 2, the BSDF input 1
+        ("BR_Emission", "Emission", "BR_MixShader", 2),
+        ("BR_BSDF", "BSDF", "BR_MixShader", 1),
+        ("BR_MixShader", "Shader", "BR_Output", "Surface"),
+    ]
+
+    # Detail Normal with UV Scale, blended 50% over the base normal
+    base_normal_result = ("BR_NormalMap", "Normal")
     if settings.detail_tex:
-        uv_detail = nt.nodes.new("ShaderNodeUVMap")
-        uv_detail.name = "BR_DetailUV"
-        uv_detail.location = (-1000, -100)
-        detail_uv_name = getattr(settings, "detail_uv", None)
-        if detail_uv_name:
-            uv_detail.uv_map = detail_uv_name
-        
-        # Apply detailNormalUVScale using Mapping node
-        detail_mapping = nt.nodes.new("ShaderNodeMapping")
-        detail_mapping.name = "BR_DetailMapping"
-        detail_mapping.location = (-800, -100)
-        detail_mapping.inputs["Scale"].default_value = (settings.detail_normal_uv_scale, settings.detail_normal_uv_scale, 1.0)
-        nt.links.new(uv_detail.outputs["UV"], detail_mapping.inputs["Vector"])
-        
-        tex_detail = nt.nodes.new("ShaderNodeTexImage")
-        tex_detail.name = "BR_DetailTex"
-        tex_detail.label = "DetailTexture"
-        tex_detail.location = (-600, -100)
-        tex_detail.image = settings.detail_tex
-        nt.links.new(detail_mapping.outputs["Vector"], tex_detail.inputs["Vector"])
-        
-        # Blend detail normal with base normal
-        detail_normal_map = nt.nodes.new("ShaderNodeNormalMap")
-        detail_normal_map.location = (-400, -100)
-        detail_normal_map.label = "Detail Normal Map"
-        nt.links.new(tex_detail.outputs["Color"], detail_normal_map.inputs["Color"])
-        
-        # Mix detail normal with base normal (blend them together)
-        normal_mix = nt.nodes.new("ShaderNodeMixRGB")
-        normal_mix.location = (-200, 0)
-        normal_mix.name = "BR_NormalMix"
-        normal_mix.blend_type = "MIX"
-        normal_mix.inputs["Fac"].default_value = 0.5  # 50% blend of detail over base
-        nt.links.new(base_normal_result, normal_mix.inputs["Color1"])
-        nt.links.new(detail_normal_map.outputs["Normal"], normal_mix.inputs["Color2"])
-        base_normal_result = normal_mix.outputs["Color"]
-    
-    # Connect final normal (either base or blended with detail)
-    nt.links.new(base_normal_result, bsdf.inputs["Normal"])
-    
-    # Macro Overlay with UV Scale and Opacity
+        detail_scale = settings.detail_normal_uv_scale
+        nodes.update({
+            "BR_DetailUV": {"type": "ShaderNodeUVMap", "location": (-1000, -100), "props": uv_props("detail_uv")},
+            "BR_DetailMapping": {
+                "type": "ShaderNodeMapping", "location": (-800, -100),
+                "inputs": {"Scale": (detail_scale, detail_scale, 1.0)},
+            },
+            "BR_DetailTex": {
+                "type": "ShaderNodeTexImage", "location": (-600, -100), "label": "DetailTexture",
+                "props": {"image": settings.detail_tex},
+            },
+            "BR_DetailNormalMap": {"type": "ShaderNodeNormalMap", "location": (-400, -100), "label": "Detail Normal Map"},
+            "BR_NormalMix": {
+                "type": "ShaderNodeMixRGB", "location": (-200, 0),
+                "props": {"blend_type": "MIX"}, "inputs": {"Fac": 0.5},
+            },
+        })
+        links += [
+            ("BR_DetailUV", "UV", "BR_DetailMapping", "Vector"),
+            ("BR_DetailMapping", "Vector", "BR_DetailTex", "Vector"),
+            ("BR_DetailTex", "Color", "BR_DetailNormalMap", "Color"),
+            ("BR_NormalMap", "Normal", "BR_NormalMix", "Color1"),
+            ("BR_DetailNormalMap", "Normal", "BR_NormalMix", "Color2"),
+        ]
+        base_normal_result = ("BR_NormalMix", "Color")
+    links.append(base_normal_result + ("BR_BSDF", "Normal"))
+
+    # Macro Overlay with UV Scale and Opacity blended over the base color
+    base_color_result = ("BR_DiffuseTex", "Color")
     if settings.macro_overlay_tex:
-        uv_macro = nt.nodes.new("ShaderNodeUVMap")
-        uv_macro.name = "BR_MacroOverlayUV"
-        uv_macro.location = (-1000, 300)
-        macro_uv_name = getattr(settings, "macro_overlay_uv", None)
-        if macro_uv_name:
-            uv_macro.uv_map = macro_uv_name
-        
-        # Apply macroOverlayUVScale using Mapping node
-        macro_mapping = nt.nodes.new("ShaderNodeMapping")
-        macro_mapping.name = "BR_MacroMapping"
-        macro_mapping.location = (-800, 300)
-        macro_mapping.inputs["Scale"].default_value = (settings.macro_overlay_uv_scale, settings.macro_overlay_uv_scale, 1.0)
-        nt.links.new(uv_macro.outputs["UV"], macro_mapping.inputs["Vector"])
-        
-        tex_macro = nt.nodes.new("ShaderNodeTexImage")
-        tex_macro.name = "BR_MacroOverlayTex"
-        tex_macro.label = "MacroOverlayTexture"
-        tex_macro.location = (-600, 300)
-        tex_macro.image = settings.macro_overlay_tex
-        nt.links.new(macro_mapping.outputs["Vector"], tex_macro.inputs["Vector"])
-        
-        # Blend macro overlay with base color using macroOverlayOpacity
-        macro_mix = nt.nodes.new("ShaderNodeMixRGB")
-        macro_mix.name = "BR_MacroMix"
-        macro_mix.location = (-400, 250)
-        macro_mix.blend_type = "MIX"
-        macro_mix.inputs["Fac"].default_value = settings.macro_overlay_opacity
-        nt.links.new(base_color_result, macro_mix.inputs["Color1"])
-        nt.links.new(tex_macro.outputs["Color"], macro_mix.inputs["Color2"])
-        base_color_result = macro_mix.outputs["Color"]
-    
-    # Connect final base color (with macro overlay blended)
-    nt.links.new(base_color_result, bsdf.inputs["Base Color"])
-    
-    # Connect Principled BSDF to Mix Shader input 1 (first shader)
-    nt.links.new(bsdf.outputs["BSDF"], mix_shader.inputs[1])
-    # Mix Shader output goes to Material Output Surface
-    nt.links.new(mix_shader.outputs["Shader"], out.inputs["Surface"])
+        macro_scale = settings.macro_overlay_uv_scale
+        nodes.update({
+            "BR_MacroOverlayUV": {"type": "ShaderNodeUVMap", "location": (-1000, 300), "props": uv_props("macro_overlay_uv")},
+            "BR_MacroMapping": {
+                "type": "ShaderNodeMapping", "location": (-800, 300),
+                "inputs": {"Scale": (macro_scale, macro_scale, 1.0)},
+            },
+            "BR_MacroOverlayTex": {
+                "type": "ShaderNodeTexImage", "location": (-600, 300), "label": "MacroOverlayTexture",
+                "props": {"image": settings.macro_overlay_tex},
+            },
+            "BR_MacroMix": {
+                "type": "ShaderNodeMixRGB", "location": (-400, 250),
+                "props": {"blend_type": "MIX"}, "inputs": {"Fac": settings.macro_overlay_opacity},
+            },
+        })
+        links += [
+            ("BR_MacroOverlayUV", "UV", "BR_MacroMapping", "Vector"),
+            ("BR_MacroMapping", "Vector", "BR_MacroOverlayTex", "Vector"),
+            ("BR_DiffuseTex", "Color", "BR_MacroMix", "Color1"),
+            ("BR_MacroOverlayTex", "Color", "BR_MacroMix", "Color2"),
+        ]
+        base_color_result = ("BR_MacroMix", "Color")
+    links.append(base_color_result + ("BR_BSDF", "Base Color"))
+
+    return nodes, links
+
+
+def _resolve_spec_socket(sockets, key):
+    """Look up a socket from a graph spec key: index, name, or tuple of alternative names."""
+    if isinstance(key, int):
+        return sockets[key] if key < len(sockets) else None
+    if isinstance(key, tuple):
+        for name in key:
+            socket = sockets.get(name)
+            if socket is not None:
+                return socket
+        return None
+    return sockets.get(key)
+
+
+def _create_spec_node(nt, name, node_spec):
+    node = nt.nodes.new(node_spec["type"])
+    node.name = name
+    node.location = node_spec["location"]
+    if node_spec.get("label"):
+        node.label = node_spec["label"]
+    return node
+
+
+def _resolve_conditional_nodes(nt, spec, stats):
+    """
+    Drop spec nodes whose "requires" input is missing, together with their
+    links. The required node is created first when the tree lacks it.
+    """
+    spec_nodes, spec_links = spec
+    dropped = set()
+    for name, node_spec in spec_nodes.items():
+        required = node_spec.get("requires")
+        if not required:
+            continue
+        owner_name, socket_key = required
+        owner = nt.nodes.get(owner_name)
+        if owner is not None and owner.bl_idname != spec_nodes[owner_name]["type"]:
+            nt.nodes.remove(owner)
+            stats["nodes_removed"] += 1
+            owner = None
+        if owner is None:
+            _create_spec_node(nt, owner_name, spec_nodes[owner_name])
+            stats["nodes_created"] += 1
+            owner = nt.nodes.get(owner_name)
+        if _resolve_spec_socket(owner.inputs, socket_key) is None:
+            dropped.add(name)
+
+    if not dropped:
+        return spec
+    return (
+        {name: node_spec for name, node_spec in spec_nodes.items() if name not in dropped},
+        [link for link in spec_links if link[0] not in dropped and link[2] not in dropped],
+    )
+
+
+def _reconcile_node_graph(nt, spec, remove_foreign=False):
+    """
+    Apply the minimal edits that turn ``nt`` into the graph described by ``spec``.
+
+    Managed nodes are those named "BR_*". Managed nodes missing from the spec
+    (or of the wrong type) are removed, missing ones are created, and only
+    properties/inputs that differ are written; existing nodes keep their
+    location. Links between managed nodes that the spec doesn't list are
+    removed, as is anything feeding a socket the spec wires. Links to or from
+    user nodes are otherwise left alone. With ``remove_foreign`` every
+    non-BR node is removed too (used when building a fresh Blenrose tree).
+
+    Returns a dict counting the edits performed.
+    """
+    stats = {"nodes_created": 0, "nodes_removed": 0, "links_created": 0, "links_removed": 0}
+    spec_nodes, spec_links = _resolve_conditional_nodes(nt, spec, stats)
+
+    existing = {}
+    for node in list(nt.nodes):
+        managed = node.name.startswith("BR_")
+        wanted = spec_nodes.get(node.name)
+        if (managed and (wanted is None or node.bl_idname != wanted["type"])) or (not managed and remove_foreign):
+            nt.nodes.remove(node)
+            stats["nodes_removed"] += 1
+        elif managed:
+            existing[node.name] = node
+
+    for name, node_spec in spec_nodes.items():
+        node = existing.get(name)
+        if node is None:
+            node = existing[name] = _create_spec_node(nt, name, node_spec)
+            stats["nodes_created"] += 1
+        for attr, value in node_spec.get("props", {}).items():
+            _set_if_changed(node, attr, value)
+        for socket_name, value in node_spec.get("inputs", {}).items():
+            _set_if_changed(node.inputs[socket_name], "default_value", value)
+
+    wanted_links = {}
+    for from_name, from_key, to_name, to_key in spec_links:
+        from_socket = _resolve_spec_socket(existing[from_name].outputs, from_key)
+        to_socket = _resolve_spec_socket(existing[to_name].inputs, to_key)
+        if from_socket is not None and to_socket is not None:
+            wanted_links[(from_socket.as_pointer(), to_socket.as_pointer())] = (from_socket, to_socket)
+    wired_targets = {to_ptr for _, to_ptr in wanted_links}
+
+    present = set()
+    for link in list(nt.links):
+        key = (link.from_socket.as_pointer(), link.to_socket.as_pointer())
+        if key in wanted_links:
+            present.add(key)
+            continue
+        internal = link.from_node.name.startswith("BR_") and link.to_node.name.startswith("BR_")
+        if internal or key[1] in wired_targets:
+            nt.links.remove(link)
+            stats["links_removed"] += 1
+
+    for key, (from_socket, to_socket) in wanted_links.items():
+        if key not in present:
+            nt.links.new(from_socket, to_socket)
+            stats["links_created"] += 1
+
+    return stats
+
+
+def _build_blenrose_node_tree(mat):
+    """
+    Build or rebuild the Blenrose node tree for a material.
+    Non-Blenrose nodes are cleared; existing BR_* nodes are reconciled in
+    place against the declarative graph spec rather than recreated.
+    """
+    if not mat.use_nodes:
+        mat.use_nodes = True
+
+    return _reconcile_node_graph(mat.node_tree, _blenrose_graph_spec(mat.blenrose_settings), remove_foreign=True)
+
+
+# Nodes that trees built before the declarative spec left unnamed:
+# (BR_* name, bl_idname, BR_* node feeding it, output socket of that node)
+_LEGACY_UNNAMED_NODES = (
+    ("BR_Output", "ShaderNodeOutputMaterial", "BR_MixShader", "Shader"),
+    ("BR_SpecularExtract", "ShaderNodeSeparateRGB", "BR_SpecularTex", "Color"),
+    ("BR_DetailNormalMap", "ShaderNodeNormalMap", "BR_DetailTex", "Color"),
+)
+
+
+def _migrate_legacy_blenrose_tree(nt):
+    """Give the unnamed nodes of an older Blenrose tree their BR_* names, in place."""
+    for name, bl_idname, source_name, socket_name in _LEGACY_UNNAMED_NODES:
+        source = nt.nodes.get(source_name)
+        if nt.nodes.get(name) or not source or socket_name not in source.outputs:
+            continue
+        for link in source.outputs[socket_name].links:
+            if link.to_node.bl_idname == bl_idname and not link.to_node.name.startswith("BR_"):
+                link.to_node.name = name
+                break
+
+
+def _reconcile_blenrose_subgraphs(mat):
+    """
+    Add or remove the optional detail / macro overlay sub-graphs after their
+    texture was toggled, leaving every other node untouched.
+    """
+    nt = mat.node_tree
+    if not nt.nodes.get("BR_Output"):
+        # Tree predates the declarative spec; name its nodes rather than
+        # rebuilding, which would delete the user's own nodes.
+        _migrate_legacy_blenrose_tree(nt)
+    return _reconcile_node_graph(nt, _blenrose_graph_spec(mat.blenrose_settings))
 
 
 def _update_enabled(self, context):
@@ -1284,7 +1855,7 @@ class BlenroseMaterialSettings(PropertyGroup):
         name="UV",
         items=uv_channel_items,
         default=0,  # UV0
-        update=_update_all_blenrose_nodes,
+        update=_update_detail_uv,
     )
 
     macro_overlay_tex: PointerProperty(
@@ -1296,7 +1867,7 @@ class BlenroseMaterialSettings(PropertyGroup):
         name="UV",
         items=uv_channel_items,
         default=0,  # UV0
-        update=_update_all_blenrose_nodes,
+        update=_update_macro_overlay_uv,
     )
 
     environment_tex: PointerProperty(
@@ -1308,7 +1879,7 @@ class BlenroseMaterialSettings(PropertyGroup):
         name="UV",
         items=uv_channel_items,
         default=0,  # UV0
-        update=_update_all_blenrose_nodes,
+        update=_update_environment_uv,
     )
 
     decal_tex: PointerProperty(
@@ -1320,7 +1891,7 @@ class BlenroseMaterialSettings(PropertyGroup):
         name="UV",
         items=uv_channel_items,
         default=0,  # UV0
-        update=_update_all_blenrose_nodes,
+        update=_update_decal_uv,
     )
 
     transparent_tex: PointerProperty(
@@ -1332,7 +1903,7 @@ class BlenroseMaterialSettings(PropertyGroup):
         name="UV",
         items=uv_channel_items,
         default=0,  # UV0
-        update=_update_all_blenrose_nodes,
+        update=_update_transparent_uv,
     )
 
     noise_tex: PointerProperty(
@@ -1344,7 +1915,7 @@ class BlenroseMaterialSettings(PropertyGroup):
         name="UV",
         items=uv_channel_items,
         default=0,  # UV0
-        update=_update_all_blenrose_nodes,
+        update=_update_noise_uv,
     )
 
     # --- Scalars (presentation) ---
@@ -1352,7 +1923,7 @@ class BlenroseMaterialSettings(PropertyGroup):
     detail_normal_uv_scale: FloatProperty(
         name="DetailNormalUVScale",
         default=8.0,
-        update=_update_scalar_values,
+        update=_update_detail_normal_uv_scale,
     )
 
     macro_overlay_opacity: FloatProperty(
@@ -1360,13 +1931,13 @@ class BlenroseMaterialSettings(PropertyGroup):
         default=1.0,
         min=0.0,
         max=1.0,
-        update=_update_scalar_values,
+        update=_update_macro_overlay_opacity,
     )
 
     macro_overlay_uv_scale: FloatProperty(
         name="MacroOverlayUVScale",
         default=0.3,  # PSG default is 0.3
-        update=_update_scalar_values,
+        update=_update_macro_overlay_uv_scale,
     )
 
     embedded_decal: FloatProperty(
@@ -1374,7 +1945,6 @@ class BlenroseMaterialSettings(PropertyGroup):
         default=1.0,
         min=0.0,
         max=1.0,
-        update=_update_scalar_values,
     )
 
     # --- Collision‑mapped channels ---
@@ -1497,6 +2067,7 @@ class BLENROSE_OT_delete_material(Operator):
         mat_name = mat.name
 
         # Delete the material
+        _evict_detection_cache(mat)
         bpy.data.materials.remove(mat)
 
         # Adjust index if necessary
@@ -1706,6 +2277,8 @@ class BLENROSE_OT_material_editor(Operator):
         row.operator("blenrose.auto_detect_textures", icon="VIEWZOOM", text="Auto-detect Textures from Node Tree")
 
     def invoke(self, context, event):
+        # Show settings and nodes that agree
+        _flush_sync_queue()
         # Large dialog window; Blender doesn't support arbitrary OS windows from Python,
         # but this behaves like a popup editor.
         return context.window_manager.invoke_props_dialog(self, width=800)
@@ -1723,203 +2296,1407 @@ class BLENROSE_OT_material_editor(Operator):
 # Bulk Export Operator
 # -------------------------------------------------------------------------
 
-def _calculate_bbox_from_points(points):
-    """Calculate bounding box from a list of (x, y, z) points."""
-    if not points:
-        return None
-    
-    min_x = min(p[0] for p in points)
-    max_x = max(p[0] for p in points)
-    min_y = min(p[1] for p in points)
-    max_y = max(p[1] for p in points)
-    min_z = min(p[2] for p in points)
-    max_z = max(p[2] for p in points)
-    
+_EXPORT_TEMP_COLLECTION = "BlenroseExportTemp"
+
+
+def _create_export_temp_collection(context):
+    """Create the scene collection that holds temporary export objects."""
+    collection = bpy.data.collections.new(_EXPORT_TEMP_COLLECTION)
+    context.scene.collection.children.link(collection)
+    return collection
+
+
+def _remove_export_temp_collection(collection):
+    """Delete a temporary export collection together with its objects and meshes."""
+    for child in list(collection.children):
+        bpy.data.collections.remove(child)
+    for obj in list(collection.objects):
+        mesh = obj.data
+        _forget_piece_bounds_alias(obj)
+        bpy.data.objects.remove(obj, do_unlink=True)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+    bpy.data.collections.remove(collection)
+
+
+def _find_layer_collection(layer_collection, collection):
+    """Depth-first search for the view layer's LayerCollection wrapping ``collection``."""
+    if layer_collection.collection == collection:
+        return layer_collection
+    for child in layer_collection.children:
+        found = _find_layer_collection(child, collection)
+        if found is not None:
+            return found
+    return None
+
+
+def _gltf_supports_active_collection():
+    """True if the glTF exporter can export just the active collection (Blender 3.2+)."""
+    try:
+        return "use_active_collection" in bpy.ops.export_scene.gltf.get_rna_type().properties.keys()
+    except (AttributeError, KeyError, RuntimeError):
+        return False
+
+
+class _GltfGroupScope:
+    """
+    Limits the glTF exporter to one material group without select_all.
+
+    When the exporter supports ``use_active_collection``, group objects are
+    linked into one reusable child collection of the temporary export
+    collection, which is made active. Otherwise only the previous group is
+    deselected before the next group is selected. Either way each group
+    costs O(group size) instead of touching every object in the view layer.
+    restore() puts back the user's active collection or selection.
+    """
+
+    def __init__(self, context, temp_collection):
+        self.view_layer = context.view_layer
+        self.use_collection = _gltf_supports_active_collection()
+        self._objects = []
+        if self.use_collection:
+            self.collection = bpy.data.collections.new(f"{_EXPORT_TEMP_COLLECTION}.group")
+            temp_collection.children.link(self.collection)
+            self.layer = _find_layer_collection(self.view_layer.layer_collection, self.collection)
+            self._previous_layer = self.view_layer.active_layer_collection
+        else:
+            self._previous_selection = list(context.selected_objects)
+            self._previous_active = self.view_layer.objects.active
+            for obj in self._previous_selection:
+                obj.select_set(False)
+
+    def activate(self, objects):
+        """Scope the exporter to ``objects``; returns the matching gltf operator options."""
+        if self.use_collection:
+            for obj in self._objects:
+                self.collection.objects.unlink(obj)
+            for obj in objects:
+                self.collection.objects.link(obj)
+            self.view_layer.active_layer_collection = self.layer
+            self._objects = list(objects)
+            return {"use_active_collection": True}
+
+        for obj in self._objects:
+            obj.select_set(False)
+        for obj in objects:
+            obj.select_set(True)
+        if objects:
+            self.view_layer.objects.active = objects[0]
+        self._objects = list(objects)
+        return {"use_selection": True}
+
+    def restore(self):
+        if self.use_collection:
+            self.view_layer.active_layer_collection = self._previous_layer
+            bpy.data.collections.remove(self.collection)
+            return
+        for obj in self._objects:
+            obj.select_set(False)
+        for obj in self._previous_selection:
+            obj.select_set(True)
+        self.view_layer.objects.active = self._previous_active
+
+
+def _read_loop_normals(mesh):
+    """Return the per-loop (split) normals of a mesh as an (N, 3) float32 array."""
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if hasattr(mesh, "corner_normals"):
+        # Blender 4.1+
+        mesh.corner_normals.foreach_get("vector", normals)
+    else:
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+
+def _read_mesh_arrays(mesh):
+    """Read the topology, UV and normal arrays of a mesh with foreach_get."""
+    vertex_count = len(mesh.vertices)
+    loop_count = len(mesh.loops)
+    poly_count = len(mesh.polygons)
+
+    co = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    loop_vertices = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_start = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_total = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    material_index = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    smooth = np.empty(poly_count, dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+
+    uv_layers = []
+    for layer in mesh.uv_layers:
+        uv = np.empty(loop_count * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uv)
+        uv_layers.append((layer.name, uv.reshape(-1, 2), layer.active_render))
+
+    # Loop normals carry smoothing, sharp edges and custom normals; pieces get
+    # them as custom normals so cutting the mesh doesn't change its shading.
+    normals = _read_loop_normals(mesh) if smooth.any() else None
+
     return {
-        "min": [min_x, min_y, min_z],
-        "max": [max_x, max_y, max_z],
+        "co": co.reshape(-1, 3),
+        "loop_vertices": loop_vertices,
+        "loop_start": loop_start,
+        "loop_total": loop_total,
+        "material_index": material_index,
+        "smooth": smooth,
+        "uv_layers": uv_layers,
+        "normals": normals,
+        "active_uv": mesh.uv_layers.active_index if mesh.uv_layers else -1,
     }
 
 
-def _calculate_bbox_for_objects(objects):
-    """Calculate combined bounding box for a collection of mesh objects."""
-    if not objects:
-        return None
-    
-    min_x = min_y = min_z = float('inf')
-    max_x = max_y = max_z = float('-inf')
-    
-    for obj in objects:
-        if obj.type != 'MESH':
+def _mesh_from_polygons(name, arrays, poly_indices, material):
+    """Build a new mesh from a subset of the polygons described by ``arrays``."""
+    starts = arrays["loop_start"][poly_indices]
+    totals = arrays["loop_total"][poly_indices]
+    loop_count = int(totals.sum())
+
+    # Old loop index for every loop of the piece, in polygon order.
+    new_starts = np.zeros(len(totals), dtype=np.int32)
+    np.cumsum(totals[:-1], out=new_starts[1:])
+    loop_indices = np.repeat(starts - new_starts, totals) + np.arange(loop_count, dtype=np.int32)
+
+    used_vertices, loop_vertices = np.unique(arrays["loop_vertices"][loop_indices], return_inverse=True)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(used_vertices))
+    mesh.loops.add(loop_count)
+    mesh.polygons.add(len(poly_indices))
+    mesh.vertices.foreach_set("co", arrays["co"][used_vertices].ravel())
+    mesh.loops.foreach_set("vertex_index", loop_vertices.astype(np.int32))
+    mesh.polygons.foreach_set("loop_start", new_starts)
+    try:
+        mesh.polygons.foreach_set("loop_total", totals)
+    except (AttributeError, TypeError, RuntimeError):
+        pass  # Read-only since Blender 4.0; derived from loop_start
+    mesh.update(calc_edges=True)
+    mesh.polygons.foreach_set("use_smooth", arrays["smooth"][poly_indices])
+
+    for layer_name, uv, active_render in arrays["uv_layers"]:
+        layer = mesh.uv_layers.new(name=layer_name)
+        layer.data.foreach_set("uv", uv[loop_indices].ravel())
+        layer.active_render = active_render
+    if arrays["active_uv"] >= 0 and len(mesh.uv_layers) > arrays["active_uv"]:
+        mesh.uv_layers.active_index = arrays["active_uv"]
+
+    if arrays["normals"] is not None:
+        if hasattr(mesh, "use_auto_smooth"):
+            mesh.use_auto_smooth = True  # Required for custom normals before Blender 4.1
+        mesh.normals_split_custom_set(arrays["normals"][loop_indices])
+
+    if material is not None:
+        mesh.materials.append(material)
+    mesh.update()
+    return mesh
+
+
+def _split_object_by_material(obj, depsgraph, collection, group_keys=None):
+    """
+    Split the evaluated mesh of ``obj`` into one temporary object per material.
+
+    Works on arrays read with foreach_get instead of Edit Mode and
+    ``bpy.ops.mesh.separate``, so ``obj`` and its mesh are left untouched.
+    Slots sharing a material end up in the same piece, and faces on empty
+    slots form the ``None`` piece. With ``group_keys`` only the pieces of
+    those groups are built. Returns a list of (material, object) pairs; the
+    objects are linked to ``collection``.
+    """
+    slot_materials = [slot.material for slot in obj.material_slots]
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        if not mesh.polygons:
+            return []
+        arrays = _read_mesh_arrays(mesh)
+    finally:
+        eval_obj.to_mesh_clear()
+
+    # Faces on out-of-range slots render with the last slot, like Blender does.
+    slot_indices = np.clip(arrays["material_index"], 0, max(len(slot_materials) - 1, 0))
+
+    poly_groups = {}
+    for slot_index in np.unique(slot_indices):
+        material = slot_materials[slot_index] if slot_materials else None
+        poly_groups.setdefault(material, []).append(np.flatnonzero(slot_indices == slot_index))
+
+    pieces = []
+    for material, index_lists in poly_groups.items():
+        if group_keys is not None and _export_group_key(material) not in group_keys:
             continue
-        
-        # Get world space bounding box
-        # Convert bound_box corners to Vector before matrix multiplication
-        from mathutils import Vector
-        bbox_corners = [obj.matrix_world @ Vector(obj.bound_box[i]) for i in range(8)]
-        
-        for corner in bbox_corners:
-            # COORDINATE TRANSFORM: Blender → PSG Game Space
-            # Blender (X, Y, Z) → PSG (X, Z, -Y)
-            psg_x = corner.x
-            psg_y = corner.z
-            psg_z = -corner.y
-            
-            min_x = min(min_x, psg_x)
-            max_x = max(max_x, psg_x)
-            min_y = min(min_y, psg_y)
-            max_y = max(max_y, psg_y)
-            min_z = min(min_z, psg_z)
-            max_z = max(max_z, psg_z)
-    
-    if min_x == float('inf'):
+        poly_indices = np.sort(np.concatenate(index_lists))
+        piece_name = f"{obj.name}.{material.name if material else 'NO_MATERIAL'}"
+        piece_mesh = _mesh_from_polygons(piece_name, arrays, poly_indices, material)
+        piece = bpy.data.objects.new(piece_name, piece_mesh)
+        piece.matrix_world = obj.matrix_world.copy()
+        collection.objects.link(piece)
+        _alias_piece_bounds(piece, obj, material)
+        pieces.append((material, piece))
+    return pieces
+
+
+# -------------------------------------------------------------------------
+# Native GLB writer (optional alternative to bpy.ops.export_scene.gltf)
+# -------------------------------------------------------------------------
+
+# glTF component types and buffer view targets
+_GLTF_FLOAT = 5126
+_GLTF_UNSIGNED_SHORT = 5123
+_GLTF_UNSIGNED_INT = 5125
+_GLTF_ARRAY_BUFFER = 34962
+_GLTF_ELEMENT_ARRAY_BUFFER = 34963
+
+# COORDINATE TRANSFORM: Blender (X, Y, Z) → PSG / glTF Y-up (X, Z, -Y)
+_BLENDER_TO_PSG = np.array([
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0],
+    [0.0, -1.0, 0.0],
+])
+
+
+def _read_evaluated_mesh(obj, depsgraph):
+    """
+    Read the evaluated mesh of ``obj`` once for the content hash and the
+    native writer: the ``_read_mesh_arrays`` arrays plus loop normals (also
+    for flat meshes) and the loop triangles as ``tri_loops``.
+    """
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        arrays = _read_mesh_arrays(mesh)
+        if arrays["normals"] is None:
+            arrays["normals"] = _read_loop_normals(mesh)
+        mesh.calc_loop_triangles()
+        tri_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("loops", tri_loops)
+        arrays["tri_loops"] = tri_loops
+    finally:
+        eval_obj.to_mesh_clear()
+    return arrays
+
+
+def _object_glb_arrays(obj, arrays):
+    """
+    Triangulated vertex arrays of one object, in PSG space.
+
+    ``arrays`` come from ``_read_evaluated_mesh``. Matches what the glTF
+    exporter writes with export_yup/export_apply: one vertex per unique
+    source vertex/loop normal/UV combination (separate vertices at the same
+    spot stay separate), loop normals, V flipped, UV layers as TEXCOORD_0..
+    in mesh order. The world transform is baked into the vertices. Returns
+    (positions, normals, uvs, indices) or None for objects without faces.
+    """
+    tri_loops = arrays["tri_loops"]
+    if not len(tri_loops):
         return None
-    
+    co = arrays["co"]
+    loop_vertices = arrays["loop_vertices"]
+    loop_normals = arrays["normals"]
+    uv_layers = [uv for _name, uv, _active_render in arrays["uv_layers"]]
+
+    # Weld corners sharing the source vertex index, loop normal and UVs into
+    # one vertex like the exporter, compared bit for bit and numbered in
+    # order of first use (np.unique alone would sort them)
+    keys = np.hstack(
+        [loop_vertices[tri_loops, None].astype(np.uint32)]
+        + [np.ascontiguousarray(values[tri_loops], dtype=np.float32).view(np.uint32)
+           for values in [loop_normals] + uv_layers]
+    )
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    loops = tri_loops[first[order]]
+    indices = rank[inverse.ravel()].reshape(-1, 3)
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    linear = matrix[:3, :3]
+    if np.linalg.det(linear) < 0.0:
+        indices = indices[:, ::-1]  # Mirrored transform flips the winding
+    positions = co[loop_vertices[loops]] @ (_BLENDER_TO_PSG @ linear).T + _BLENDER_TO_PSG @ matrix[:3, 3]
+    normals = loop_normals[loops] @ (np.linalg.pinv(linear) @ _BLENDER_TO_PSG.T)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = normals / np.where(lengths > 0.0, lengths, 1.0)
+    uvs = [(uv[loops] * (1.0, -1.0) + (0.0, 1.0)).astype(np.float32) for uv in uv_layers]
+    return positions.astype(np.float32), normals.astype(np.float32), uvs, indices.ravel()
+
+
+def _build_glb(objects_arrays, material_name):
+    """Encode per-object (name, arrays) pairs as GLB bytes sharing one material."""
+    binary = bytearray()
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Blenrose native GLB writer"},
+        "scene": 0,
+        "scenes": [{"nodes": []}],
+        "nodes": [],
+        "meshes": [],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": [],
+    }
+    if material_name is not None:
+        gltf["materials"] = [{"name": material_name, "doubleSided": False}]
+
+    def add_accessor(array, accessor_type, target, bounds=False):
+        padding = -len(binary) % 4
+        binary.extend(b"\x00" * padding)
+        gltf["bufferViews"].append({
+            "buffer": 0,
+            "byteOffset": len(binary),
+            "byteLength": array.nbytes,
+            "target": target,
+        })
+        binary.extend(array.tobytes())
+        accessor = {
+            "bufferView": len(gltf["bufferViews"]) - 1,
+            "componentType": _GLTF_UNSIGNED_INT if array.dtype == np.uint32 else
+            _GLTF_UNSIGNED_SHORT if array.dtype == np.uint16 else _GLTF_FLOAT,
+            "count": len(array),
+            "type": accessor_type,
+        }
+        if bounds:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        gltf["accessors"].append(accessor)
+        return len(gltf["accessors"]) - 1
+
+    for name, (positions, normals, uvs, indices) in objects_arrays:
+        attributes = {
+            "POSITION": add_accessor(np.ascontiguousarray(positions, dtype=np.float32), "VEC3",
+                                     _GLTF_ARRAY_BUFFER, bounds=True),
+            "NORMAL": add_accessor(np.ascontiguousarray(normals, dtype=np.float32), "VEC3", _GLTF_ARRAY_BUFFER),
+        }
+        for uv_index, uv in enumerate(uvs):
+            attributes[f"TEXCOORD_{uv_index}"] = add_accessor(
+                np.ascontiguousarray(uv, dtype=np.float32), "VEC2", _GLTF_ARRAY_BUFFER
+            )
+        index_dtype = np.uint16 if len(positions) < 65536 else np.uint32
+        primitive = {
+            "attributes": attributes,
+            "indices": add_accessor(indices.astype(index_dtype), "SCALAR", _GLTF_ELEMENT_ARRAY_BUFFER),
+            "mode": 4,
+        }
+        if material_name is not None:
+            primitive["material"] = 0
+        gltf["meshes"].append({"name": name, "primitives": [primitive]})
+        gltf["nodes"].append({"name": name, "mesh": len(gltf["meshes"]) - 1})
+        gltf["scenes"][0]["nodes"].append(len(gltf["nodes"]) - 1)
+
+    binary.extend(b"\x00" * (-len(binary) % 4))
+    gltf["buffers"].append({"byteLength": len(binary)})
+
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    total_length = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    return b"".join((
+        b"glTF", (2).to_bytes(4, "little"), total_length.to_bytes(4, "little"),
+        len(json_chunk).to_bytes(4, "little"), b"JSON", json_chunk,
+        len(binary).to_bytes(4, "little"), b"BIN\x00", bytes(binary),
+    ))
+
+
+def _snapshot_group_glb(objects, depsgraph, mesh_arrays=None):
+    """
+    Read the GLB arrays of every object in a material group (main thread only).
+
+    ``mesh_arrays`` are the objects' ``_read_evaluated_mesh`` results when
+    the caller already has them. Returns (name, arrays) pairs for
+    ``_encode_and_write_glb``; objects without faces are dropped.
+    """
+    if mesh_arrays is None:
+        mesh_arrays = [_read_evaluated_mesh(obj, depsgraph) for obj in objects]
+    objects_arrays = []
+    for obj, arrays in zip(objects, mesh_arrays):
+        arrays = _object_glb_arrays(obj, arrays)
+        if arrays is not None:
+            objects_arrays.append((obj.name, arrays))
+    return objects_arrays
+
+
+def _encode_and_write_glb(glb_path, objects_arrays, material_name, timings=None, group=None):
+    """
+    Encode a snapshot from ``_snapshot_group_glb`` and write it to disk.
+
+    Touches no bpy data, so it runs on the export thread pool. Produces the
+    attributes PsgBuilder reads (POSITION, NORMAL, TEXCOORD_n, indices,
+    material name), one node and mesh per object like the exporter.
+    """
+    start = time.perf_counter()
+    data = _build_glb(objects_arrays, material_name)
+    with open(glb_path, "wb") as f:
+        f.write(data)
+    if timings is not None:
+        timings.record("glb_encode_write", time.perf_counter() - start, group, len(data))
+    return len(data)
+
+
+# Encoding threads for the native writer, and how many snapshots may wait in
+# memory before the main thread blocks on the oldest write.
+_GLB_WRITER_THREADS = max(1, min(4, (os.cpu_count() or 2) - 1))
+_GLB_WRITER_MAX_PENDING = _GLB_WRITER_THREADS * 2
+
+
+def _collect_glb_writes(pending, block=False):
+    """
+    Pop finished writes from ``pending`` ({future: info}).
+
+    With ``block`` waits until at least one write has finished. Returns
+    (info, error) pairs, error being None on success.
+    """
+    if not pending:
+        return []
+    done, _ = wait(list(pending), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+    return [(pending.pop(future), future.exception()) for future in done]
+
+
+# -------------------------------------------------------------------------
+# PsgBuilder.Cli process pool
+# -------------------------------------------------------------------------
+
+_PSG_BUILD_SUMMARY_NAME = "psg_build_summary.json"
+
+
+def _psg_build_command(cli_path, glb_path, materials_json=None):
+    """Command line for ``psg-build`` on one GLB (a .dll is run through dotnet)."""
+    command = ["dotnet", cli_path] if cli_path.lower().endswith(".dll") else [cli_path]
+    command += ["psg-build", glb_path]
+    if materials_json:
+        command.append(f"--materials-json={materials_json}")
+    return command
+
+
+def _run_psg_build(cli_path, glb_path, materials_json=None):
+    """
+    Run ``psg-build`` for one GLB and wait for it (called on a pool thread).
+
+    Returns a summary dict: glb, exit_code (None if the process could not be
+    started), seconds, warnings (stdout lines mentioning a warning) and
+    errors (stderr lines).
+    """
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(
+            _psg_build_command(cli_path, glb_path, materials_json),
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(glb_path),
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+    except OSError as e:
+        return {
+            "glb": glb_path,
+            "exit_code": None,
+            "seconds": round(time.perf_counter() - start, 3),
+            "warnings": [],
+            "errors": [str(e)],
+        }
     return {
-        "min": [min_x, min_y, min_z],
-        "max": [max_x, max_y, max_z],
+        "glb": glb_path,
+        "exit_code": completed.returncode,
+        "seconds": round(time.perf_counter() - start, 3),
+        "warnings": [line.strip() for line in completed.stdout.splitlines() if "warn" in line.lower()],
+        "errors": [line.strip() for line in completed.stderr.splitlines() if line.strip()],
     }
 
 
-def _bbox_intersects(bbox1, bbox2):
-    """Check if two bounding boxes intersect."""
-    if not bbox1 or not bbox2:
-        return False
-    
-    # Check if boxes overlap on all axes
-    return (
-        bbox1["min"][0] <= bbox2["max"][0] and bbox1["max"][0] >= bbox2["min"][0] and
-        bbox1["min"][1] <= bbox2["max"][1] and bbox1["max"][1] >= bbox2["min"][1] and
-        bbox1["min"][2] <= bbox2["max"][2] and bbox1["max"][2] >= bbox2["min"][2]
-    )
+class _PsgBuildPool:
+    """
+    Runs ``psg-build`` on exported GLBs with at most ``jobs`` processes.
 
+    Builds start as soon as their GLB exists, so .NET startup and PSG
+    building overlap with the rest of the export.
+    """
 
-def _extract_splines_from_scene(context):
-    """Extract all splines from curve objects in the scene."""
-    splines = []
-    curve_objects = [obj for obj in context.scene.objects if obj.type == 'CURVE' and obj.visible_get()]
-    
-    for obj in curve_objects:
-        curve_data = obj.data
-        matrix_world = obj.matrix_world
-        
-        # Process each spline in the curve object
-        for spline in curve_data.splines:
-            points = []
-            
-            # Get spline points based on type
-            if spline.type == 'POLY' and spline.points:
-                for point in spline.points:
-                    # Transform to world space
-                    co_world = matrix_world @ point.co.xyz
-                    blender_x, blender_y, blender_z = co_world.x, co_world.y, co_world.z
-                    
-                    # COORDINATE TRANSFORM: Blender → PSG Game Space
-                    # Blender (X, Y, Z) → PSG (X, Z, -Y)
-                    psg_x = blender_x
-                    psg_y = blender_z
-                    psg_z = -blender_y
-                    
-                    points.append([psg_x, psg_y, psg_z])
-                    
-            elif spline.type == 'BEZIER' and spline.bezier_points:
-                for bezier_point in spline.bezier_points:
-                    # Transform to world space
-                    co_world = matrix_world @ bezier_point.co
-                    blender_x, blender_y, blender_z = co_world.x, co_world.y, co_world.z
-                    
-                    # COORDINATE TRANSFORM: Blender → PSG Game Space
-                    psg_x = blender_x
-                    psg_y = blender_z
-                    psg_z = -blender_y
-                    
-                    points.append([psg_x, psg_y, psg_z])
-                    
-            elif spline.type == 'NURBS' and spline.points:
-                for point in spline.points:
-                    # Transform to world space
-                    co_world = matrix_world @ point.co.xyz
-                    blender_x, blender_y, blender_z = co_world.x, co_world.y, co_world.z
-                    
-                    # COORDINATE TRANSFORM: Blender → PSG Game Space
-                    psg_x = blender_x
-                    psg_y = blender_z
-                    psg_z = -blender_y
-                    
-                    points.append([psg_x, psg_y, psg_z])
-            
-            # Only add splines with at least 2 points
-            if len(points) >= 2:
-                bbox = _calculate_bbox_from_points(points)
-                splines.append({
-                    "name": obj.name,
-                    "points": points,
-                    "is_closed": spline.use_cyclic_u,
-                    "type": spline.type,
-                    "bbox": bbox,
-                })
-    
-    return splines
+    def __init__(self, cli_path, jobs):
+        self.cli_path = cli_path
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._futures = []
 
+    def submit(self, glb_path, materials_json=None):
+        self._futures.append(self._executor.submit(_run_psg_build, self.cli_path, glb_path, materials_json))
 
-def _build_textures_dict(settings, get_image_path, get_uv_name):
-    """Build textures dict with only channels that have a texture (file path or embedded)."""
-    channel_configs = [
-        ("diffuse", "diffuse_tex", "diffuse_uv"),
-        ("lightmap", "lightmap_tex", "lightmap_uv"),
-        ("specular", "specular_tex", "specular_uv"),
-        ("normal", "normal_tex", "normal_uv"),
-        ("detail", "detail_tex", "detail_uv"),
-        ("macro_overlay", "macro_overlay_tex", "macro_overlay_uv"),
-        ("environment", "environment_tex", "environment_uv"),
-        ("decal", "decal_tex", "decal_uv"),
-        ("transparent", "transparent_tex", "transparent_uv"),
-        ("noise", "noise_tex", "noise_uv"),
-    ]
-    textures = {}
-    for channel_name, tex_prop, uv_prop in channel_configs:
-        tex = getattr(settings, tex_prop, None)
-        path = get_image_path(tex)
-        if path or tex:
-            textures[channel_name] = {
-                "image_path": path,
-                "uv": get_uv_name(settings, uv_prop),
-            }
-    return textures
+    def submit_after(self, write_future, glb_path, materials_json=None):
+        """
+        Queue a build for when ``write_future`` (a native GLB write) succeeds.
 
+        The build is only handed to the pool once the write is done, so no
+        build slot waits on a write. The tracked future resolves to the
+        build's summary, or None when the write failed (the exporter reports
+        that) or the pool was shut down first.
+        """
+        build_future = Future()
 
-def _extract_blenrose_material_data(mat):
-    """Extract all BlenRose material settings into a dictionary."""
-    settings = mat.blenrose_settings
-    
-    # Get texture image filepaths
-    def get_image_path(image):
-        if image and image.filepath:
-            return bpy.path.abspath(image.filepath)
-        return None
-    
-    # Get UV channel name (enum returns index, we need to resolve the actual name)
-    def get_uv_name(settings, prop_name):
-        uv_enum_items = uv_channel_items(settings, bpy.context)
-        uv_index = getattr(settings, prop_name, 0)
-        
-        # Handle both string (identifier) and int (index) cases
-        if isinstance(uv_index, str):
-            # If it's a string, find the index in the items list
-            for idx, (identifier, name, desc) in enumerate(uv_enum_items):
-                if identifier == uv_index:
-                    uv_index = idx
-                    break
+        def resolve(future):
+            if future.cancelled():
+                build_future.cancel()
+            elif future.exception() is not None:
+                build_future.set_exception(future.exception())
             else:
-                uv_index = 0  # Default to 0 if not found
-        
-        # Ensure it's an integer and within bounds
-        if isinstance(uv_index, int) and uv_index < len(uv_enum_items):
-            return uv_enum_items[uv_index][0]  # Return the identifier
-        return "UVMap"
-    
-    # Resolve material subclass name from index
-    material_class = settings.material_class
+                build_future.set_result(future.result())
+
+        def start_build(future):
+            if future.cancelled() or future.exception() is not None:
+                build_future.set_result(None)
+                return
+            try:
+                build = self._executor.submit(_run_psg_build, self.cli_path, glb_path, materials_json)
+            except RuntimeError:
+                build_future.set_result(None)  # Shut down (export cancelled)
+                return
+            build.add_done_callback(resolve)
+
+        self._futures.append(build_future)
+        write_future.add_done_callback(start_build)
+
+    def finish(self):
+        """Wait for every queued build; returns their summaries in submit order."""
+        results = [future.result() for future in self._futures]
+        return [result for result in results if result is not None]
+
+    def shutdown(self, cancel=False):
+        """Wait for running builds; with ``cancel`` queued builds never start."""
+        self._executor.shutdown(wait=True, cancel_futures=cancel)
+
+    def completed(self):
+        """Summaries of the builds that ran to the end (after a cancelling shutdown)."""
+        results = [future.result() for future in self._futures if future.done() and not future.cancelled()]
+        return [result for result in results if result is not None]
+
+
+def _write_psg_build_summary(path, results):
+    """
+    Write psg-build results (see ``_run_psg_build``) with totals; returns the
+    summary. If the file can't be written the summary gets a ``write_error``.
+    """
+    built = [r for r in results if r["exit_code"] == 0]
+    summary = {
+        "built": len(built),
+        "failed": len(results) - len(built),
+        "seconds": round(sum(r["seconds"] for r in results), 3),
+        "builds": results,
+    }
+    try:
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+    except OSError as e:
+        summary["write_error"] = str(e)
+    return summary
+
+
+# -------------------------------------------------------------------------
+# Export timing instrumentation
+# -------------------------------------------------------------------------
+
+_EXPORT_TIMINGS_NAME = "export_timings.json"
+_EXPORT_TIMINGS_TOP_N = 10
+
+
+class _ExportTimings:
+    """
+    Wall time, call counts and bytes written per export stage, overall and
+    per material group. record() is thread-safe so GLB writer threads can
+    report their own stage. ``sync_writes`` holds the material sync write
+    counters (see ``blenrose_write_stats``) when the report is written.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = {}
+        self.groups = {}
+        self.sync_writes = {"performed": 0, "skipped": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add(table, name, seconds, bytes_written):
+        entry = table.setdefault(name, {"seconds": 0.0, "calls": 0, "bytes": 0})
+        entry["seconds"] += seconds
+        entry["calls"] += 1
+        entry["bytes"] += bytes_written
+
+    def record(self, name, seconds, group=None, bytes_written=0):
+        with self._lock:
+            self._add(self.stages, name, seconds, bytes_written)
+            if group is not None:
+                self._add(self.groups.setdefault(group, {}), name, seconds, bytes_written)
+
+    @contextmanager
+    def stage(self, name, group=None):
+        """Time the body as one call of ``name``; add bytes via the yielded list."""
+        written = []
+        start = time.perf_counter()
+        try:
+            yield written
+        finally:
+            self.record(name, time.perf_counter() - start, group, sum(written))
+
+    def slowest_groups(self, count=_EXPORT_TIMINGS_TOP_N):
+        totals = [
+            (sum(entry["seconds"] for entry in stages.values()), group)
+            for group, stages in self.groups.items()
+        ]
+        return sorted(totals, key=lambda item: item[0], reverse=True)[:count]
+
+    def merge(self, report):
+        """Add the stages and groups of another run's timing report (see write())."""
+        with self._lock:
+            for field, count in report.get("sync_writes", {}).items():
+                self.sync_writes[field] = self.sync_writes.get(field, 0) + count
+            for table, stages in [(self.stages, report.get("stages", {}))] + [
+                (self.groups.setdefault(group, {}), entry["stages"])
+                for group, entry in report.get("groups", {}).items()
+            ]:
+                for name, entry in stages.items():
+                    total = table.setdefault(name, {"seconds": 0.0, "calls": 0, "bytes": 0})
+                    for field in total:
+                        total[field] += entry[field]
+
+    def write(self, export_dir, name=_EXPORT_TIMINGS_NAME):
+        """Write export_timings.json and print the slowest groups; returns the path."""
+        total = time.perf_counter() - self.start
+        report = {
+            "total_seconds": round(total, 6),
+            "stages": self.stages,
+            "groups": {
+                group: {"seconds": round(sum(e["seconds"] for e in stages.values()), 6), "stages": stages}
+                for group, stages in self.groups.items()
+            },
+            "slowest_groups": [group for _, group in self.slowest_groups()],
+            "sync_writes": self.sync_writes,
+        }
+        path = os.path.join(export_dir, name)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Blenrose: export took {total:.2f}s")
+        for name, entry in sorted(self.stages.items(), key=lambda item: item[1]["seconds"], reverse=True):
+            print(f"  {name:<20} {entry['seconds']:8.3f}s  {entry['calls']:6d} call(s)  {entry['bytes']:12d} bytes")
+        print(f"Blenrose: material sync wrote {self.sync_writes['performed']} value(s), "
+              f"skipped {self.sync_writes['skipped']} unchanged")
+        print(f"Blenrose: slowest {_EXPORT_TIMINGS_TOP_N} material groups:")
+        for seconds, group in self.slowest_groups():
+            print(f"  {seconds:8.3f}s  {_export_group_label(group)}")
+        return path
+
+
+# -------------------------------------------------------------------------
+# Incremental export manifest
+# -------------------------------------------------------------------------
+
+_EXPORT_MANIFEST_NAME = "blenrose_export_manifest.json"
+_EXPORT_MANIFEST_VERSION = 2
+_MATERIALS_JSON_NAME = "blenrose_materials.json"
+
+# Manifest key of the no-material group; Blender names can't contain NUL, so
+# no material can collide with it. Its files are named NO_MATERIAL[_n].glb.
+_NO_MATERIAL_KEY = "\x00none"
+_NO_MATERIAL_NAME = "NO_MATERIAL"
+
+
+def _load_export_manifest(export_dir, name=_EXPORT_MANIFEST_NAME):
+    """
+    Return {group_key: {"file", "hash"[, "sidecar", "psg_build"]}} from the
+    last export into ``export_dir``. ``psg_build`` is "ok" or "failed" for
+    groups whose GLB went through psg-build.
+    """
+    try:
+        with open(os.path.join(export_dir, name)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") not in (1, _EXPORT_MANIFEST_VERSION):
+        return {}
+    groups = manifest.get("groups", {})
+    if manifest["version"] == 1 and _NO_MATERIAL_NAME in groups:
+        # Version 1 keyed the no-material group by its file stem
+        groups[_NO_MATERIAL_KEY] = groups.pop(_NO_MATERIAL_NAME)
+    return groups
+
+
+def _save_export_manifest(export_dir, groups, name=_EXPORT_MANIFEST_NAME):
+    """Write the manifest atomically so an interrupted export can't corrupt it."""
+    path = os.path.join(export_dir, name)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"version": _EXPORT_MANIFEST_VERSION, "groups": groups}, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _export_group_key(material):
+    """Manifest / timings key of a material group (``None`` is the no-material group)."""
+    return material.name if material else _NO_MATERIAL_KEY
+
+
+def _export_group_label(group_key):
+    """Name of a group for reports and the status bar."""
+    return _NO_MATERIAL_NAME if group_key == _NO_MATERIAL_KEY else group_key
+
+
+def _remove_stale_group_files(export_dir, manifest, groups):
+    """
+    Delete the GLBs of ``manifest`` groups that are not in ``groups`` any
+    more, and the sidecars their entries record. Files the manifest does
+    not record are never touched.
+    """
+    current_files = {entry["file"] for entry in groups.values()}
+    current_files.update(entry["sidecar"] for entry in groups.values() if entry.get("sidecar"))
+    for key, entry in manifest.items():
+        if key in groups:
+            continue
+        for file_name in (entry["file"], entry.get("sidecar")):
+            if file_name and file_name not in current_files:
+                path = os.path.join(export_dir, file_name)
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def _unmanaged_export_files(export_dir, manifest):
+    """
+    ``<stem>.glb`` names that group files must not use because a .glb or
+    .json with that stem in ``export_dir`` is not one the manifest records.
+    """
+    owned_stems = {os.path.splitext(entry["file"])[0] for entry in manifest.values()}
+    try:
+        names = os.listdir(export_dir)
+    except OSError:
+        return set()
+    stems = {os.path.splitext(name)[0] for name in names if name.endswith((".glb", ".json"))}
+    return {f"{stem}.glb" for stem in stems - owned_stems}
+
+
+def _is_reserved_export_stem(stem):
+    """
+    True for the stems of the export's own files (materials JSON, manifest,
+    timings, psg-build summary, shard plan and their ``.shard<n>`` copies),
+    which a group's GLB or sidecar must never take.
+    """
+    for name in (_MATERIALS_JSON_NAME, _EXPORT_MANIFEST_NAME, _EXPORT_TIMINGS_NAME,
+                 _PSG_BUILD_SUMMARY_NAME, _SHARD_PLAN_NAME):
+        reserved = os.path.splitext(name)[0]
+        if stem == reserved or re.fullmatch(re.escape(reserved) + r"\.shard\d+", stem):
+            return True
+    return False
+
+
+def _reserve_glb_name(group_key, base_name, manifest, owned_files, reserved_files):
+    """
+    Pick the GLB file name for a group and add it to ``reserved_files``.
+
+    Reuses the group's file from the last run, otherwise takes the first
+    ``base_name[_n].glb`` that no other group owns (``owned_files`` maps the
+    manifest's file names to their group keys) and that is not reserved,
+    including the stems of the export's own files. Seed ``reserved_files``
+    with ``_unmanaged_export_files`` so files the manifest doesn't know
+    about are never overwritten.
+    """
+    previous = manifest.get(group_key)
+    if (previous and previous["file"] not in reserved_files
+            and not _is_reserved_export_stem(os.path.splitext(previous["file"])[0])):
+        file_name = previous["file"]
+    else:
+        file_name = f"{base_name}.glb"
+        counter = 1
+        while (file_name in reserved_files or owned_files.get(file_name, group_key) != group_key
+               or _is_reserved_export_stem(os.path.splitext(file_name)[0])):
+            file_name = f"{base_name}_{counter}.glb"
+            counter += 1
+    reserved_files.add(file_name)
+    return file_name
+
+
+def _write_text_if_changed(path, text):
+    """Write ``text`` to ``path`` unless the file already holds it; returns True if written."""
+    try:
+        with open(path) as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, "w") as f:
+        f.write(text)
+    return True
+
+
+def _materials_json_text(entries, compact=False):
+    """Serialize ``{material name: data}`` the way blenrose_materials.json is written."""
+    if compact:
+        return json.dumps(entries, separators=(",", ":"))
+    return json.dumps(entries, indent=2)
+
+
+class _MaterialsJsonWriter:
+    """
+    Streams ``{material name: data}`` entries to a JSON file as groups finish.
+
+    The output is identical to ``_materials_json_text`` of the whole dict,
+    without holding every material (and spline point) in memory. Entries go
+    to ``<path>.tmp``; close() replaces ``path`` only if the contents changed
+    and at least one entry was written.
+    """
+
+    def __init__(self, path, compact=False):
+        self.path = path
+        self.compact = compact
+        self.count = 0
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "w")
+        self._file.write("{")
+
+    def add(self, name, data):
+        """Append one entry; returns the number of bytes written."""
+        separator = "," if self.count else ""
+        if self.compact:
+            text = f"{separator}{json.dumps(name)}:{json.dumps(data, separators=(',', ':'))}"
+        else:
+            value = json.dumps(data, indent=2).replace("\n", "\n  ")
+            text = f"{separator}\n  {json.dumps(name)}: {value}"
+        self._file.write(text)
+        self.count += 1
+        return len(text)  # ASCII: json.dumps escapes everything else
+
+    def _finish(self):
+        if self.count and not self.compact:
+            self._file.write("\n")
+        self._file.write("}")
+        self._file.close()
+
+    def close(self):
+        """Finish the file; returns True if ``path`` was (re)written."""
+        if self._file.closed:
+            return False
+        self._finish()
+        if not self.count or (os.path.exists(self.path) and filecmp.cmp(self._tmp_path, self.path, shallow=False)):
+            os.remove(self._tmp_path)
+            return False
+        os.replace(self._tmp_path, self.path)
+        return True
+
+    def close_merged(self):
+        """
+        Finish a run that stopped early: the entries written so far replace
+        theirs in the existing ``path`` and its other entries are kept.
+        Returns True if ``path`` was (re)written.
+        """
+        if self._file.closed:
+            return False
+        self._finish()
+        try:
+            with open(self._tmp_path) as f:
+                entries = json.load(f)
+        finally:
+            os.remove(self._tmp_path)
+        if not entries:
+            return False
+        try:
+            with open(self.path) as f:
+                merged = json.load(f)
+        except (OSError, ValueError):
+            merged = {}
+        if not isinstance(merged, dict):
+            merged = {}
+        merged.update(entries)
+        return _write_text_if_changed(self.path, _materials_json_text(merged, self.compact))
+
+    def abort(self):
+        """Discard the partial file if close() was never reached."""
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self._tmp_path)
+
+
+def _group_content_hash(objects, mesh_arrays, material_data, options):
+    """
+    Hash everything that ends up in a material group's GLB and JSON entry.
+
+    Covers evaluated geometry (``mesh_arrays`` from ``_read_evaluated_mesh``:
+    positions, topology, smoothing, UVs, loop normals), object names and
+    world matrices, the exported material data (splines included), the
+    size/mtime of referenced image files and the export ``options``.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(json.dumps([options, material_data], sort_keys=True, default=str).encode("utf-8"))
+
+    for texture in (material_data or {}).get("textures", {}).values():
+        path = texture.get("image_path")
+        if not path:
+            continue
+        try:
+            stat = os.stat(path)
+            hasher.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8"))
+        except OSError:
+            hasher.update(f"{path}|missing".encode("utf-8"))
+
+    for obj, arrays in sorted(zip(objects, mesh_arrays), key=lambda item: item[0].name):
+        hasher.update(obj.name.encode("utf-8"))
+        hasher.update(np.array(obj.matrix_world, dtype=np.float64).tobytes())
+        for key in ("co", "loop_vertices", "loop_start", "loop_total", "material_index", "smooth"):
+            hasher.update(arrays[key].tobytes())
+        for layer_name, uv, active_render in arrays["uv_layers"]:
+            hasher.update(f"{layer_name}|{active_render}".encode("utf-8"))
+            hasher.update(uv.tobytes())
+        hasher.update(arrays["normals"].tobytes())
+    return hasher.hexdigest()
+
+
+def _calculate_bbox_from_points(points):
+    """Calculate bounding box from an (N, 3) array (or list) of points."""
+    if len(points) == 0:
+        return None
+
+    points = np.asarray(points)
+    return {
+        "min": points.min(axis=0).tolist(),
+        "max": points.max(axis=0).tolist(),
+    }
+
+
+# Exact PSG-space bounds of evaluated mesh objects, reused across export
+# stages and repeated exports:
+#   (object ptr, mesh ptr, material ptr) -> (matrix_world bytes, bbox dict)
+# material ptr is non-zero only for split pieces, which are aliased to their
+# source object's key. Cleared on file load and frame change (animated
+# geometry sends no depsgraph update); entries of deleted objects are pruned.
+_WORLD_BOUNDS_CACHE = {}
+_WORLD_BOUNDS_ALIASES = {}  # temporary piece object ptr -> source cache key
+_WORLD_BOUNDS_STATE = {"object_count": None}
+
+
+def _bounds_source_key(obj, material=None):
+    return obj.as_pointer(), obj.data.as_pointer(), material.as_pointer() if material else 0
+
+
+def _alias_piece_bounds(piece, source_obj, material):
+    """Cache a split piece's bounds under its source object and material."""
+    _WORLD_BOUNDS_ALIASES[piece.as_pointer()] = _bounds_source_key(source_obj, material)
+
+
+def _forget_piece_bounds_alias(piece):
+    _WORLD_BOUNDS_ALIASES.pop(piece.as_pointer(), None)
+
+
+def _invalidate_world_bounds():
+    _WORLD_BOUNDS_CACHE.clear()
+    _WORLD_BOUNDS_ALIASES.clear()
+    _WORLD_BOUNDS_STATE["object_count"] = None
+
+
+def _prune_world_bounds():
+    """
+    Drop cached bounds and aliases of objects that no longer exist. The
+    pointer scan only runs when the object count changed.
+    """
+    object_count = len(bpy.data.objects)
+    previous_count = _WORLD_BOUNDS_STATE["object_count"]
+    _WORLD_BOUNDS_STATE["object_count"] = object_count
+    if object_count == previous_count:
+        return
+
+    live = {obj.as_pointer() for obj in bpy.data.objects}
+    for key in [k for k in _WORLD_BOUNDS_CACHE if k[0] not in live]:
+        del _WORLD_BOUNDS_CACHE[key]
+    for piece_ptr in [p for p in _WORLD_BOUNDS_ALIASES if p not in live]:
+        del _WORLD_BOUNDS_ALIASES[piece_ptr]
+
+
+def _update_world_bounds_from_depsgraph(depsgraph):
+    """Drop cached bounds of meshes and objects whose geometry changed or that were deleted."""
+    if not _WORLD_BOUNDS_CACHE:
+        return
+    _prune_world_bounds()
+    changed = set()
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        datablock = update.id.original
+        if isinstance(datablock, bpy.types.Object):
+            changed.add(datablock.as_pointer())
+            if datablock.data is not None:
+                changed.add(datablock.data.as_pointer())
+        elif isinstance(datablock, bpy.types.Mesh):
+            changed.add(datablock.as_pointer())
+    if changed:
+        for key in [k for k in _WORLD_BOUNDS_CACHE if k[0] in changed or k[1] in changed]:
+            del _WORLD_BOUNDS_CACHE[key]
+
+
+def _object_psg_bounds(obj, depsgraph):
+    """
+    Tight PSG-space bounding box of an object's evaluated vertices.
+
+    Every vertex is transformed (not just the eight local bound_box
+    corners), so rotated objects get exact boxes. Cached until the object's
+    geometry changes; a new matrix_world recomputes.
+    """
+    key = _WORLD_BOUNDS_ALIASES.get(obj.as_pointer()) or _bounds_source_key(obj)
+    psg_matrix = _psg_world_matrix(obj)
+    matrix_bytes = psg_matrix.tobytes()
+    cached = _WORLD_BOUNDS_CACHE.get(key)
+    if cached is not None and cached[0] == matrix_bytes:
+        return cached[1]
+
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+    finally:
+        eval_obj.to_mesh_clear()
+
+    bbox = None
+    if len(co):
+        bbox = _calculate_bbox_from_points(co.reshape(-1, 3) @ psg_matrix[:3, :3].T + psg_matrix[:3, 3])
+    _WORLD_BOUNDS_CACHE[key] = (matrix_bytes, bbox)
+    return bbox
+
+
+def _object_material_bounds(obj, depsgraph):
+    """
+    Face count and PSG-space bounds of each material's faces of an object,
+    grouped like ``_split_object_by_material`` but without building pieces:
+    {material or None: (faces, bbox)}.
+    """
+    slot_materials = [slot.material for slot in obj.material_slots]
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        poly_count = len(mesh.polygons)
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)
+        loop_start = np.empty(poly_count, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_start", loop_start)
+        loop_total = np.empty(poly_count, dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_total)
+        material_index = np.empty(poly_count, dtype=np.int32)
+        mesh.polygons.foreach_get("material_index", material_index)
+    finally:
+        eval_obj.to_mesh_clear()
+    if not poly_count:
+        return {}
+
+    psg_matrix = _psg_world_matrix(obj)
+    co = co.reshape(-1, 3)
+    slot_indices = np.clip(material_index, 0, max(len(slot_materials) - 1, 0))
+    # Slot of every loop, in polygon order
+    offsets = np.zeros(poly_count, dtype=np.int32)
+    np.cumsum(loop_total[:-1], out=offsets[1:])
+    loop_indices = np.repeat(loop_start - offsets, loop_total) + np.arange(int(loop_total.sum()), dtype=np.int32)
+    loop_slots = np.repeat(slot_indices, loop_total)
+
+    faces = {}
+    vertices = {}
+    for slot_index in np.unique(slot_indices).tolist():
+        material = slot_materials[slot_index] if slot_materials else None
+        faces[material] = faces.get(material, 0) + int(np.count_nonzero(slot_indices == slot_index))
+        vertices.setdefault(material, []).append(loop_vertices[loop_indices[loop_slots == slot_index]])
+    bounds = {}
+    for material, vertex_lists in vertices.items():
+        points = co[np.unique(np.concatenate(vertex_lists))]
+        bounds[material] = (faces[material], _calculate_bbox_from_points(points @ psg_matrix[:3, :3].T + psg_matrix[:3, 3]))
+    return bounds
+
+
+def _union_bboxes(boxes):
+    """Bounding box around every non-empty box in ``boxes`` (None if there is none)."""
+    boxes = [bbox for bbox in boxes if bbox]
+    if not boxes:
+        return None
+
+    return {
+        "min": [min(bbox["min"][axis] for bbox in boxes) for axis in range(3)],
+        "max": [max(bbox["max"][axis] for bbox in boxes) for axis in range(3)],
+    }
+
+
+def _calculate_bbox_for_objects(objects, depsgraph):
+    """Calculate combined PSG-space bounding box for a collection of mesh objects."""
+    return _union_bboxes(_object_psg_bounds(obj, depsgraph) for obj in objects if obj.type == 'MESH')
+
+
+# Padding added to every overlap extent when ranking intersecting boxes
+_BBOX_OVERLAP_EPSILON = 1e-3
+
+
+def _bbox_overlap_score(bbox1, bbox2):
+    """
+    Rank how well two intersecting boxes overlap: (volume, -center distance²).
+
+    Each overlap extent is padded by ``_BBOX_OVERLAP_EPSILON`` so flat boxes
+    (a spline lying in a plane, a planar group) still compare by area or
+    length instead of all scoring zero. Returns None if they don't intersect.
+    """
+    volume = 1.0
+    distance_sq = 0.0
+    for axis in range(3):
+        min1, max1 = bbox1["min"][axis], bbox1["max"][axis]
+        min2, max2 = bbox2["min"][axis], bbox2["max"][axis]
+        extent = min(max1, max2) - max(min1, min2)
+        if extent < 0.0:
+            return None
+        volume *= extent + _BBOX_OVERLAP_EPSILON
+        offset = (min1 + max1) - (min2 + max2)
+        distance_sq += offset * offset
+    return volume, -distance_sq
+
+
+class _BBoxGrid:
+    """
+    Uniform grid over keyed bounding boxes for "which box overlaps this most".
+
+    Cells are sized from the median box extent. Boxes spanning more than
+    ``MAX_CELLS`` cells skip the grid and are checked on every query.
+    """
+
+    MAX_CELLS = 4096
+
+    def __init__(self, bboxes):
+        self.keys = list(bboxes)
+        self.boxes = [bboxes[key] for key in self.keys]
+        extents = sorted(max(b["max"][axis] - b["min"][axis] for axis in range(3)) for b in self.boxes)
+        self.cell_size = (extents[len(extents) // 2] if extents else 0.0) or 1.0
+        self.cells = {}
+        self.oversized = []
+        for index, bbox in enumerate(self.boxes):
+            cell_range = self._cell_range(bbox)
+            if cell_range is None:
+                self.oversized.append(index)
+                continue
+            for cell in self._cells_in(cell_range):
+                self.cells.setdefault(cell, []).append(index)
+
+    def _cell_range(self, bbox):
+        """Inclusive (low, high) cell coordinates of a box, or None if it spans too many cells."""
+        size = self.cell_size
+        low = tuple(math.floor(v / size) for v in bbox["min"])
+        high = tuple(math.floor(v / size) for v in bbox["max"])
+        count = 1
+        for axis in range(3):
+            count *= high[axis] - low[axis] + 1
+        if count > self.MAX_CELLS:
+            return None
+        return low, high
+
+    @staticmethod
+    def _cells_in(cell_range):
+        low, high = cell_range
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                for z in range(low[2], high[2] + 1):
+                    yield x, y, z
+
+    def candidates(self, bbox):
+        """Indices of boxes that may intersect ``bbox``, in insertion order."""
+        cell_range = self._cell_range(bbox)
+        if cell_range is None:
+            return range(len(self.boxes))
+        found = set(self.oversized)
+        for cell in self._cells_in(cell_range):
+            found.update(self.cells.get(cell, ()))
+        return sorted(found)
+
+    def best_overlap(self, bbox):
+        """
+        Index of the box overlapping ``bbox`` the most, or -1 if none touch.
+
+        Ties on overlap go to the closer box center, then to the earlier key.
+        """
+        best_index = -1
+        best_score = None
+        for index in self.candidates(bbox):
+            score = _bbox_overlap_score(bbox, self.boxes[index])
+            if score is not None and (best_score is None or score > best_score):
+                best_index = index
+                best_score = score
+        return best_index
+
+
+def _spline_points_psg(spline, psg_matrix):
+    """
+    World-space PSG points of a POLY/BEZIER/NURBS spline as an (N, 3) float32 array.
+
+    ``psg_matrix`` is the object's world matrix with the Blender → PSG axis
+    swap folded in (see ``_psg_world_matrix``), applied in one multiply.
+    Returns None for other spline types.
+    """
+    if spline.type == 'BEZIER':
+        points, width = spline.bezier_points, 3
+    elif spline.type in ('POLY', 'NURBS'):
+        points, width = spline.points, 4  # (x, y, z, w)
+    else:
+        return None
+
+    co = np.empty(len(points) * width, dtype=np.float32)
+    points.foreach_get("co", co)
+    co = co.reshape(-1, width)[:, :3]
+    return (co @ psg_matrix[:3, :3].T + psg_matrix[:3, 3]).astype(np.float32)
+
+
+def _psg_world_matrix(obj):
+    """4x4 numpy matrix mapping local coordinates to PSG space: Blender (X, Y, Z) → PSG (X, Z, -Y)."""
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    matrix[:3] = _BLENDER_TO_PSG @ matrix[:3]
+    return matrix
+
+
+def _group_objects_by_material(mesh_objects, depsgraph, temp_collection, group_keys=None):
+    """
+    Group visible mesh objects by material: {material or None: [objects]}.
+
+    Multi-material objects are split into temporary per-material pieces
+    (see ``_split_object_by_material``). The user's objects and meshes are
+    never modified; the pieces live in ``temp_collection``. With
+    ``group_keys`` only those groups are collected.
+    """
+    material_groups = {}
+    for obj in mesh_objects:
+        if not obj.visible_get():
+            continue
+
+        # Check if object has multiple materials
+        materials = [slot.material for slot in obj.material_slots if slot.material]
+
+        if len(set(materials)) <= 1:
+            # No material or a single one - add directly to that group
+            material = materials[0] if materials else None
+            if group_keys is None or _export_group_key(material) in group_keys:
+                material_groups.setdefault(material, []).append(obj)
+        else:
+            # Multiple materials - one temporary piece per material
+            for material, piece in _split_object_by_material(obj, depsgraph, temp_collection, group_keys):
+                material_groups.setdefault(material, []).append(piece)
+    return material_groups
+
+
+def _best_overlap_splines(splines, group_bboxes):
+    """Indices of the splines whose bbox overlaps each group's the most: {key: [index]}."""
+    assigned = {key: [] for key in group_bboxes}
+    group_grid = _BBoxGrid(group_bboxes)
+    for index, spline in enumerate(splines):
+        spline_bbox = spline.get("bbox")
+        if not spline_bbox:
+            continue
+
+        best = group_grid.best_overlap(spline_bbox)
+        if best >= 0:
+            assigned[group_grid.keys[best]].append(index)
+    return assigned
+
+
+def _assign_splines_to_groups(splines, material_groups, depsgraph, timings=None):
+    """
+    Map each material group to the splines whose bbox overlaps it the most.
+
+    Returns {material_key: [splines]} with an entry for every group.
+    """
+    timings = timings or _ExportTimings()
+
+    # Calculate bounding boxes for each material group (using split objects)
+    material_group_bboxes = {}
+    for material_key, objects in material_groups.items():
+        with timings.stage("bounds", _export_group_key(material_key)):
+            bbox = _calculate_bbox_for_objects(objects, depsgraph)
+        if bbox:
+            material_group_bboxes[material_key] = bbox
+
+    with timings.stage("spline_assignment"):
+        material_splines = {material_key: [] for material_key in material_groups}
+        for material_key, indices in _best_overlap_splines(splines, material_group_bboxes).items():
+            material_splines[material_key] = [splines[index] for index in indices]
+    return material_splines
+
+
+def _extract_splines_from_scene(context):
+    """
+    Extract all splines from curve objects in the scene.
+
+    Points are (N, 3) float32 arrays in PSG space; call ``tolist()`` before
+    serializing them.
+    """
+    splines = []
+    curve_objects = [obj for obj in context.scene.objects if obj.type == 'CURVE' and obj.visible_get()]
+
+    for obj in curve_objects:
+        psg_matrix = _psg_world_matrix(obj)
+
+        # Process each spline in the curve object
+        for spline in obj.data.splines:
+            points = _spline_points_psg(spline, psg_matrix)
+
+            # Only add splines with at least 2 points
+            if points is not None and len(points) >= 2:
+                splines.append({
+                    "name": obj.name,
+                    "points": points,
+                    "is_closed": spline.use_cyclic_u,
+                    "type": spline.type,
+                    "bbox": _calculate_bbox_from_points(points),
+                })
+
+    return splines
+
+
+def _build_textures_dict(settings, get_image_path, get_uv_name):
+    """Build textures dict with only channels that have a texture (file path or embedded)."""
+    channel_configs = [
+        ("diffuse", "diffuse_tex", "diffuse_uv"),
+        ("lightmap", "lightmap_tex", "lightmap_uv"),
+        ("specular", "specular_tex", "specular_uv"),
+        ("normal", "normal_tex", "normal_uv"),
+        ("detail", "detail_tex", "detail_uv"),
+        ("macro_overlay", "macro_overlay_tex", "macro_overlay_uv"),
+        ("environment", "environment_tex", "environment_uv"),
+        ("decal", "decal_tex", "decal_uv"),
+        ("transparent", "transparent_tex", "transparent_uv"),
+        ("noise", "noise_tex", "noise_uv"),
+    ]
+    textures = {}
+    for channel_name, tex_prop, uv_prop in channel_configs:
+        tex = getattr(settings, tex_prop, None)
+        path = get_image_path(tex)
+        if path or tex:
+            textures[channel_name] = {
+                "image_path": path,
+                "uv": get_uv_name(settings, uv_prop),
+            }
+    return textures
+
+
+def _extract_blenrose_material_data(mat):
+    """Extract all BlenRose material settings into a dictionary."""
+    settings = mat.blenrose_settings
+    
+    # Get texture image filepaths
+    def get_image_path(image):
+        if image and image.filepath:
+            return bpy.path.abspath(image.filepath)
+        return None
+    
+    # Get UV channel name (enum returns index, we need to resolve the actual name)
+    def get_uv_name(settings, prop_name):
+        uv_enum_items = uv_channel_items(settings, bpy.context)
+        uv_index = getattr(settings, prop_name, 0)
+        
+        # Handle both string (identifier) and int (index) cases
+        if isinstance(uv_index, str):
+            # If it's a string, find the index in the items list
+            for idx, (identifier, name, desc) in enumerate(uv_enum_items):
+                if identifier == uv_index:
+                    uv_index = idx
+                    break
+            else:
+                uv_index = 0  # Default to 0 if not found
+        
+        # Ensure it's an integer and within bounds
+        if isinstance(uv_index, int) and uv_index < len(uv_enum_items):
+            return uv_enum_items[uv_index][0]  # Return the identifier
+        return "UVMap"
+    
+    # Resolve material subclass name from index
+    material_class = settings.material_class
     material_subclass_name = "default"
     if material_class in MATERIAL_SUBCLASSES:
         subclass_items = MATERIAL_SUBCLASSES[material_class]
@@ -1972,6 +3749,9 @@ class BLENROSE_OT_auto_detect_textures(Operator):
     bl_options = {"REGISTER", "UNDO"}
     
     def execute(self, context):
+        # Detect from the tree as it will be once queued syncs have run
+        _flush_sync_queue()
+
         scene = context.scene
         mats = bpy.data.materials
         if not mats:
@@ -2017,24 +3797,26 @@ class BLENROSE_OT_auto_detect_textures(Operator):
             "noise": "noise_uv",
         }
         
-        for channel_name, texture_info in detected.items():
-            tex_prop = texture_prop_map.get(channel_name)
-            uv_prop = uv_prop_map.get(channel_name)
-            
-            if tex_prop:
-                # Update texture (always sync with node tree when manually triggered)
-                setattr(settings, tex_prop, texture_info["image"])
-                detected_count += 1
-            
-            if uv_prop:
-                uv_map_name = texture_info.get("uv_map_name")
-                if uv_map_name:
-                    uv_enum_items = uv_channel_items(settings, context)
-                    for identifier, name, desc in uv_enum_items:
-                        if identifier == uv_map_name or name == uv_map_name:
-                            # Set using the identifier string (first element of tuple)
-                            setattr(settings, uv_prop, identifier)
-                            break
+        # One node reconciliation for all channels instead of one per assignment
+        with blenrose_batch():
+            for channel_name, texture_info in detected.items():
+                tex_prop = texture_prop_map.get(channel_name)
+                uv_prop = uv_prop_map.get(channel_name)
+                
+                if tex_prop:
+                    # Update texture (always sync with node tree when manually triggered)
+                    _set_if_changed(settings, tex_prop, texture_info["image"])
+                    detected_count += 1
+                
+                if uv_prop:
+                    uv_map_name = texture_info.get("uv_map_name")
+                    if uv_map_name:
+                        uv_enum_items = uv_channel_items(settings, context)
+                        for identifier, name, desc in uv_enum_items:
+                            if identifier == uv_map_name or name == uv_map_name:
+                                # Set using the identifier string (first element of tuple)
+                                _set_if_changed(settings, uv_prop, identifier)
+                                break
         
         if detected_count > 0:
             self.report({"INFO"}, f"Detected and updated {detected_count} texture(s)")
@@ -2057,6 +3839,9 @@ class BLENROSE_OT_enable_all_and_prepare_export(Operator):
             self.report({"WARNING"}, "No materials in this file")
             return {"CANCELLED"}
 
+        # Detect from the tree as it will be once queued syncs have run
+        _flush_sync_queue()
+
         enabled_count = 0
         for mat in mats:
             settings = mat.blenrose_settings
@@ -2084,167 +3869,253 @@ class BLENROSE_OT_enable_all_and_prepare_export(Operator):
         return {"FINISHED"}
 
 
-class BLENROSE_OT_bulk_export(Operator):
-    """Export all objects in the scene as GLB files with BlenRose material data"""
-
-    bl_idname = "blenrose.bulk_export"
-    bl_label = "Bulk Export All Objects"
-    bl_options = {"REGISTER", "UNDO"}
-
-    filepath: StringProperty(
-        name="Export Directory",
-        description="Directory where GLB files and material data will be exported",
-        subtype="DIR_PATH",
-    )
+# -------------------------------------------------------------------------
+# Bulk export job
+# -------------------------------------------------------------------------
 
-    def execute(self, context):
-        export_dir = bpy.path.abspath(self.filepath)
-        os.makedirs(export_dir, exist_ok=True)
+class _BulkExportJob:
+    """
+    One bulk export, split into start(), one step() per material group and
+    finish() (or cancel()), so the operator can run it in a single call or
+    one group per modal timer tick.
+
+    ``options`` is the operator whose properties configure the export and
+    ``report`` its report method. cleanup() releases the temporary
+    collection and pools and is safe to call more than once.
+
+    With a ``shard_plan`` (see ``_plan_export_shards``) only the objects of
+    shard ``shard_index``'s groups are split and exported, under their
+    planned file names and with their planned splines, and the JSON,
+    manifest and timings get a ``.shard<n>`` suffix for the driver to merge.
+    """
 
-        # Get all mesh objects in the scene
+    def __init__(self, export_dir, options, report, shard_plan=None, shard_index=0):
+        self.export_dir = export_dir
+        self.options = options
+        self.report = report
+        self.shard_plan = shard_plan
+        self.shard_index = shard_index
+        self.exported_objects = 0
+        self.failed = 0
+        self.unchanged = 0
+        self.index = 0
+        self.timings = _ExportTimings()
+        self.materials_writer = None
+        self.temp_collection = None
+        self.writer_pool = None
+        self.group_scope = None
+        self.build_pool = None
+        self._groups = []
+
+    @property
+    def total(self):
+        return len(self._groups)
+
+    @property
+    def done(self):
+        return self.index >= len(self._groups)
+
+    def _output_name(self, name):
+        """``name`` in the export directory, with this shard's suffix when sharded."""
+        if self.shard_plan is None:
+            return name
+        return _shard_file_name(name, self.shard_index)
+
+    def current_name(self):
+        """Name of the group the next step() exports."""
+        if self.done:
+            return None
+        return _export_group_label(_export_group_key(self._groups[self.index][0]))
+
+    def start(self, context):
+        """Split and group the scene's meshes; returns False when there is nothing to export."""
+        options = self.options
+        timings = self.timings
+
+        # Apply any pending background sync so settings and node trees agree.
+        _flush_sync_queue()
+
+        # Get all mesh objects in the scene (a shard only needs its groups' objects)
         mesh_objects = [obj for obj in context.scene.objects if obj.type == "MESH"]
-        
+        planned = None
+        if self.shard_plan is not None:
+            planned = self.shard_plan[self.shard_index]
+            names = {name for group in planned.values() for name in group["objects"]}
+            mesh_objects = [obj for obj in mesh_objects if obj.name in names]
         if not mesh_objects:
             self.report({"WARNING"}, "No mesh objects found in scene")
-            return {"CANCELLED"}
-
-        exported_objects = 0
-        exported_materials = {}
-        failed = 0
+            return False
 
         # Extract all splines from the scene
-        all_splines = _extract_splines_from_scene(context)
-
-        # Split objects by material and group the split pieces by material
-        # Note: This modifies the scene by splitting multi-material objects.
-        # Use Blender's undo (Ctrl+Z) to restore original objects if needed.
-        material_groups = {}
-        material_group_bboxes = {}
-        split_objects = []  # Track objects created by splitting
-        
-        # Create a temporary collection or use existing scene
-        for obj in mesh_objects:
-            if not obj.visible_get():
-                continue
-            
-            # Check if object has multiple materials
-            materials = [slot.material for slot in obj.material_slots if slot.material]
-            
-            if not materials:
-                # Object with no material - add directly
-                material_key = None
-                material_groups.setdefault(material_key, []).append(obj)
-            elif len(materials) == 1:
-                # Single material - add directly to that material group
-                material_groups.setdefault(materials[0], []).append(obj)
-            else:
-                # Multiple materials - split by material
-                # Make object active and enter edit mode
-                bpy.ops.object.select_all(action="DESELECT")
-                obj.select_set(True)
-                context.view_layer.objects.active = obj
-                
-                # Enter edit mode and split by material
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.select_all(action='SELECT')
-                bpy.ops.mesh.separate(type='MATERIAL')
-                bpy.ops.object.mode_set(mode='OBJECT')
-                
-                # Get the separated objects (original object is now one of the pieces)
-                # The separate operation creates new objects, all selected after operation
-                separated_objects = [o for o in context.selected_objects if o.type == 'MESH']
-                
-                # Track newly created objects (all except the original)
-                for sep_obj in separated_objects:
-                    if sep_obj != obj:
-                        split_objects.append(sep_obj)
-                
-                # Group separated objects by their material
-                # Each separated piece should have only one material
-                for sep_obj in separated_objects:
-                    # Get the material for this separated object
-                    sep_materials = [slot.material for slot in sep_obj.material_slots if slot.material]
-                    if sep_materials:
-                        # Each separated piece should have one material
-                        material = sep_materials[0]
-                        material_groups.setdefault(material, []).append(sep_obj)
-                    else:
-                        material_groups.setdefault(None, []).append(sep_obj)
-        
-        # Calculate bounding boxes for each material group (using split objects)
-        for material_key, objects in material_groups.items():
-            bbox = _calculate_bbox_for_objects(objects)
-            if bbox:
-                material_group_bboxes[material_key] = bbox
-        
-        # Assign splines to material groups based on bounding box intersection
-        # Map: material_key -> list of splines assigned to that material
-        material_splines = {}
-        for material_key in material_groups.keys():
-            material_splines[material_key] = []
-        
-        for spline in all_splines:
-            spline_bbox = spline.get("bbox")
-            if not spline_bbox:
-                continue
-            
-            # Find the material group whose bounding box intersects with this spline
-            # If multiple match, use the first one (or could use closest center point)
-            assigned = False
-            for material_key, group_bbox in material_group_bboxes.items():
-                if _bbox_intersects(spline_bbox, group_bbox):
-                    material_splines[material_key].append(spline)
-                    assigned = True
-                    break
+        with timings.stage("splines"):
+            all_splines = _extract_splines_from_scene(context)
+
+        depsgraph = context.evaluated_depsgraph_get()
+        self.materials_writer = _MaterialsJsonWriter(
+            os.path.join(self.export_dir, self._output_name(_MATERIALS_JSON_NAME)), compact=options.compact_json
+        )
+        self.temp_collection = _create_export_temp_collection(context)
+        if options.use_native_writer:
+            self.writer_pool = ThreadPoolExecutor(max_workers=_GLB_WRITER_THREADS)
+        if options.run_psg_build:
+            self.build_pool = _PsgBuildPool(bpy.path.abspath(options.psg_builder_path), options.psg_build_jobs)
+        # psg-build runs while the export continues, before the combined JSON
+        # is complete, so it reads the per-GLB sidecars instead.
+        self.write_sidecars = options.material_sidecars or self.build_pool is not None
+
+        with timings.stage("split"):
+            material_groups = _group_objects_by_material(mesh_objects, depsgraph, self.temp_collection, planned)
+
+            # Re-evaluate so the temporary pieces are part of the depsgraph
+            depsgraph = context.evaluated_depsgraph_get()
+
+        if planned is None:
+            self.material_splines = _assign_splines_to_groups(all_splines, material_groups, depsgraph, timings)
+        else:
+            # The driver bounded every group and assigned the splines once
+            self.material_splines = {
+                material: [all_splines[index] for index in planned[_export_group_key(material)]["splines"]]
+                for material in material_groups
+            }
 
-        # Export each material group
-        for material, objects in material_groups.items():
-            # Select objects for export
-            bpy.ops.object.select_all(action="DESELECT")
-            for obj in objects:
-                obj.select_set(True)
-            
-            if objects:
-                context.view_layer.objects.active = objects[0]
-
-            # Generate filename
-            if material:
-                base_name = bpy.path.clean_name(material.name)
-                # Extract BlenRose material data if enabled
-                if hasattr(material, "blenrose_settings") and material.blenrose_settings.enabled:
+        # Groups whose content hash matches the manifest are skipped and every
+        # group keeps its file name across runs.
+        self.manifest = _load_export_manifest(self.export_dir)
+        self.manifest_groups = {}
+        self.owned_files = {entry["file"]: key for key, entry in self.manifest.items()}
+        self.reserved_files = _unmanaged_export_files(self.export_dir, self.manifest)
+        self.pending_writes = {}
+        self._groups = list(material_groups.items())
+        if self.shard_plan is not None:
+            self.reserved_files.update(group["file"] for shard in self.shard_plan for group in shard.values())
+        return True
+
+    def step(self, context):
+        """Export the next material group; returns True while groups remain."""
+        if not self.done:
+            material, objects = self._groups[self.index]
+            self._export_group(context, material, objects)
+            self.index += 1
+        return not self.done
+
+    def _export_group(self, context, material, objects):
+        options = self.options
+        timings = self.timings
+        depsgraph = context.evaluated_depsgraph_get()
+
+        # Generate filename
+        mat_data = None
+        if material:
+            group_key = material.name
+            base_name = bpy.path.clean_name(material.name)
+            # Extract BlenRose material data if enabled
+            if hasattr(material, "blenrose_settings") and material.blenrose_settings.enabled:
+                with timings.stage("material_data", group_key):
                     mat_data = _extract_blenrose_material_data(material)
                     # Add assigned splines to this material
-                    assigned_splines = material_splines.get(material, [])
+                    assigned_splines = self.material_splines.get(material, [])
                     mat_data["splines"] = [
                         {
                             "name": s["name"],
-                            "points": s["points"],
+                            "points": s["points"].tolist(),
                             "is_closed": s["is_closed"],
                             "type": s["type"],
                             "bbox": s["bbox"],
                         }
                         for s in assigned_splines
                     ]
-                    exported_materials[material.name] = mat_data
+                with timings.stage("materials_json", group_key) as written:
+                    written.append(self.materials_writer.add(material.name, mat_data))
+        else:
+            group_key = _NO_MATERIAL_KEY
+            base_name = _NO_MATERIAL_NAME
+
+        # Reuse this group's file from the last run, otherwise pick a
+        # name no other group owns
+        previous = self.manifest.get(group_key)
+        planned = self.shard_plan[self.shard_index] if self.shard_plan is not None else {}
+        if group_key in planned:
+            file_name = planned[group_key]["file"]
+        else:
+            file_name = _reserve_glb_name(group_key, base_name, self.manifest, self.owned_files, self.reserved_files)
+        safe_name = os.path.splitext(file_name)[0]
+        glb_path = os.path.join(self.export_dir, file_name)
+
+        # <glb>.json sidecar, picked up by psg-build when no
+        # --materials-json is given
+        sidecar_path = None
+        if self.write_sidecars:
+            sidecar_path = os.path.join(self.export_dir, f"{safe_name}.json")
+            if mat_data is not None:
+                with timings.stage("sidecar", group_key) as written:
+                    text = _materials_json_text({material.name: mat_data}, options.compact_json)
+                    if _write_text_if_changed(sidecar_path, text):
+                        written.append(len(text))
             else:
-                base_name = "NO_MATERIAL"
-
-            # Make filename unique
-            safe_name = base_name
-            counter = 1
-            glb_path = os.path.join(export_dir, f"{safe_name}.glb")
-            while os.path.exists(glb_path):
-                safe_name = f"{base_name}_{counter}"
-                glb_path = os.path.join(export_dir, f"{safe_name}.glb")
-                counter += 1
-
-            # Export GLB (tangents disabled: Blender can produce malformed tangents for some meshes;
-            # PsgBuilder computes its own tangents from positions/normals/UVs)
+                # Only remove a sidecar this group wrote last time
+                if previous and previous.get("sidecar") == os.path.basename(sidecar_path) \
+                        and os.path.exists(sidecar_path):
+                    os.remove(sidecar_path)
+                sidecar_path = None
+
+        # Each object's evaluated mesh is read once; the hash and the native
+        # writer share the arrays
+        with timings.stage("mesh_read", group_key):
+            mesh_arrays = [_read_evaluated_mesh(obj, depsgraph) for obj in objects]
+        with timings.stage("hash", group_key):
+            content_hash = _group_content_hash(
+                objects, mesh_arrays, mat_data, [group_key, bool(options.use_native_writer)]
+            )
+        self.manifest_groups[group_key] = {"file": file_name, "hash": content_hash}
+        if sidecar_path is not None:
+            self.manifest_groups[group_key]["sidecar"] = os.path.basename(sidecar_path)
+        if (options.incremental and previous and previous["hash"] == content_hash
+                and os.path.exists(glb_path)):
+            self.unchanged += 1
+            if "psg_build" in previous:
+                self.manifest_groups[group_key]["psg_build"] = previous["psg_build"]
+            # An unchanged GLB whose last psg-build failed (or never ran) is built again
+            if self.build_pool is not None and previous.get("psg_build") != "ok":
+                self.build_pool.submit(glb_path, sidecar_path)
+            return
+
+        # Export GLB (tangents disabled: Blender can produce malformed tangents for some meshes;
+        # PsgBuilder computes its own tangents from positions/normals/UVs)
+        if self.writer_pool is not None:
+            # Arrays are snapshotted here and encoded/written on the pool
+            # while the next group is being read.
             try:
+                with timings.stage("glb_snapshot", group_key):
+                    snapshot = _snapshot_group_glb(objects, depsgraph, mesh_arrays)
+                future = self.writer_pool.submit(
+                    _encode_and_write_glb,
+                    glb_path,
+                    snapshot,
+                    material.name if material else None,
+                    timings,
+                    group_key,
+                )
+                self.pending_writes[future] = (group_key, safe_name, len(objects))
+                if self.build_pool is not None:
+                    self.build_pool.submit_after(future, glb_path, sidecar_path)
+            except Exception as e:
+                self.failed += 1
+                self.manifest_groups[group_key]["hash"] = None
+                self.report({"ERROR"}, f"Failed to export {base_name}: {e}")
+            self._collect_writes(block=len(self.pending_writes) >= _GLB_WRITER_MAX_PENDING)
+            return
+
+        # Scope the exporter to this group (cost follows the group size)
+        if self.group_scope is None:
+            self.group_scope = _GltfGroupScope(context, self.temp_collection)
+        scope_options = self.group_scope.activate(objects)
+
+        try:
+            with timings.stage("gltf_export", group_key) as written:
                 bpy.ops.export_scene.gltf(
                     filepath=glb_path,
                     export_format="GLB",
-                    use_selection=True,
+                    **scope_options,
                     export_yup=True,
                     export_apply=True,
                     export_normals=True,
@@ -2252,31 +4123,312 @@ class BLENROSE_OT_bulk_export(Operator):
                     export_texcoords=True,
                     export_materials="EXPORT",
                 )
-                exported_objects += len(objects)
+                written.append(os.path.getsize(glb_path))
+            self.exported_objects += len(objects)
+            if self.build_pool is not None:
+                self.build_pool.submit(glb_path, sidecar_path)
+        except Exception as e:
+            self.failed += 1
+            self.manifest_groups[group_key]["hash"] = None
+            self.report({"ERROR"}, f"Failed to export {base_name}: {e}")
+
+    def _collect_writes(self, block=False):
+        """Report finished native writes; failed groups get no manifest hash."""
+        for (group_key, name, object_count), error in _collect_glb_writes(self.pending_writes, block):
+            if error is None:
+                self.exported_objects += object_count
+                self.report({"INFO"}, f"Wrote {name}.glb ({object_count} object(s))")
+            else:
+                self.failed += 1
+                self.manifest_groups[group_key]["hash"] = None
+                self.report({"ERROR"}, f"Failed to export {name}: {error}")
+
+    def _drain_writes(self):
+        with self.timings.stage("glb_write_wait"):
+            while self.pending_writes:
+                self._collect_writes(block=True)
+
+    def finish(self):
+        """Complete the export: PSG builds, manifest, combined JSON and timings."""
+        timings = self.timings
+        try:
+            # Wait for the remaining native writes
+            self._drain_writes()
+
+            if self.build_pool is not None:
+                with timings.stage("psg_build_wait"):
+                    build_results = self.build_pool.finish()
+                self._record_psg_builds(build_results)
+                self._report_psg_builds(build_results)
+
+            # GLBs of groups that no longer exist would otherwise be rebuilt
+            # downstream forever (a shard only sees its own groups, so the
+            # driver does this after merging)
+            if self.shard_plan is None:
+                _remove_stale_group_files(self.export_dir, self.manifest, self.manifest_groups)
+            _save_export_manifest(self.export_dir, self.manifest_groups, self._output_name(_EXPORT_MANIFEST_NAME))
+
+            # Finish the material data JSON (entries were streamed per group)
+            materials_writer = self.materials_writer
+            try:
+                with timings.stage("materials_json"):
+                    rewritten = materials_writer.close()
+                if rewritten:
+                    self.report(
+                        {"INFO"},
+                        f"Exported {materials_writer.count} BlenRose material(s) to {materials_writer.path}",
+                    )
             except Exception as e:
-                failed += 1
-                self.report({"ERROR"}, f"Failed to export {base_name}: {e}")
+                self.report({"ERROR"}, f"Failed to export material data: {e}")
+        finally:
+            self.cleanup()
+
+        self._write_timings()
+        self.report(
+            {"INFO"},
+            f"✅ Exported {self.exported_objects} object(s), {self.materials_writer.count} material(s). "
+            f"{self.unchanged} unchanged group(s) skipped. {self.failed} failed.",
+        )
 
-        # Export material data to JSON
-        if exported_materials:
-            json_path = os.path.join(export_dir, "blenrose_materials.json")
+    def cancel(self):
+        """
+        Stop after the groups exported so far. Their GLBs are kept and the
+        manifest records them next to the previous run's entries for the
+        groups not reached, so the next incremental run resumes from here.
+        The combined materials JSON gets the finished groups' entries; the
+        materials not reached keep their previous ones.
+        """
+        try:
+            self._drain_writes()
+            if self.build_pool is not None:
+                # Builds already running finish; their outcome is kept
+                self.build_pool.shutdown(cancel=True)
+                self._record_psg_builds(self.build_pool.completed())
+            partial = dict(self.manifest) if self.shard_plan is None else {}
+            partial.update(self.manifest_groups)
+            _save_export_manifest(self.export_dir, partial, self._output_name(_EXPORT_MANIFEST_NAME))
+
+            materials_writer = self.materials_writer
             try:
-                with open(json_path, "w") as f:
-                    json.dump(exported_materials, f, indent=2)
-                self.report(
-                    {"INFO"},
-                    f"Exported {len(exported_materials)} BlenRose material(s) to {json_path}",
-                )
+                with self.timings.stage("materials_json"):
+                    materials_writer.close_merged()
             except Exception as e:
-                self.report({"ERROR"}, f"Failed to export material data: {e}")
+                self.report({"WARNING"}, f"{materials_writer.path} is stale, it could not be updated: {e}")
+        finally:
+            self.cleanup(cancel_builds=True)
+
+        self._write_timings()
+        self.report(
+            {"WARNING"},
+            f"Export cancelled after {self.index}/{self.total} group(s): "
+            f"{self.exported_objects} object(s) exported, {self.failed} failed. "
+            "The next run resumes from the manifest.",
+        )
 
+    def cleanup(self, cancel_builds=False):
+        if self.materials_writer is not None:
+            self.materials_writer.abort()
+        if self.writer_pool is not None:
+            self.writer_pool.shutdown(wait=True)
+            self.writer_pool = None
+        if self.build_pool is not None:
+            self.build_pool.shutdown(cancel=cancel_builds)
+            self.build_pool = None
+        if self.group_scope is not None:
+            self.group_scope.restore()
+            self.group_scope = None
+        if self.temp_collection is not None:
+            _remove_export_temp_collection(self.temp_collection)
+            self.temp_collection = None
+
+    def _write_timings(self):
+        # Sync writes since the previous export, including the flush in start()
+        self.timings.sync_writes = blenrose_write_stats(reset=True)
+        try:
+            self.timings.write(self.export_dir, self._output_name(_EXPORT_TIMINGS_NAME))
+        except OSError as e:
+            self.report({"WARNING"}, f"Failed to write export timings: {e}")
+
+    def _record_psg_builds(self, results):
+        """Store each group's psg-build outcome in its manifest entry."""
+        entries = {entry["file"]: entry for entry in self.manifest_groups.values()}
+        for result in results:
+            entry = entries.get(os.path.basename(result["glb"]))
+            if entry is not None:
+                entry["psg_build"] = "ok" if result["exit_code"] == 0 else "failed"
+
+    def _report_psg_builds(self, results):
+        """Report psg-build outcomes and write them to psg_build_summary.json."""
+        for result in results:
+            name = os.path.basename(result["glb"])
+            if result["exit_code"] != 0:
+                detail = (result["errors"] or ["no output"])[-1]
+                self.report({"ERROR"}, f"psg-build failed for {name} (exit {result['exit_code']}): {detail}")
+            for warning in result["warnings"]:
+                self.report({"WARNING"}, f"psg-build {name}: {warning}")
+
+        summary = _write_psg_build_summary(
+            os.path.join(self.export_dir, self._output_name(_PSG_BUILD_SUMMARY_NAME)), results
+        )
+        if "write_error" in summary:
+            self.report({"WARNING"}, f"Failed to write psg-build summary: {summary['write_error']}")
         self.report(
             {"INFO"},
-            f"✅ Exported {exported_objects} object(s), {len(exported_materials)} material(s). {failed} failed.",
+            f"PsgBuilder: {summary['built']} built, {summary['failed']} failed "
+            f"({summary['seconds']:.1f}s of build time)",
         )
+
+
+class BLENROSE_OT_bulk_export(Operator):
+    """Export all objects in the scene as GLB files with BlenRose material data"""
+
+    bl_idname = "blenrose.bulk_export"
+    bl_label = "Bulk Export All Objects"
+    bl_options = {"REGISTER", "UNDO"}
+
+    filepath: StringProperty(
+        name="Export Directory",
+        description="Directory where GLB files and material data will be exported",
+        subtype="DIR_PATH",
+    )
+
+    use_native_writer: BoolProperty(
+        name="Fast GLB Writer",
+        description="Write GLBs directly from mesh arrays instead of running the glTF exporter per material. "
+                    "Only geometry and material names are written, which is all PsgBuilder reads",
+        default=False,
+    )
+
+    incremental: BoolProperty(
+        name="Skip Unchanged",
+        description="Skip material groups whose geometry, transforms, settings and textures "
+                    "match the export manifest from the previous run",
+        default=True,
+    )
+
+    compact_json: BoolProperty(
+        name="Compact JSON",
+        description="Write material JSON without indentation or spaces",
+        default=False,
+    )
+
+    material_sidecars: BoolProperty(
+        name="Per-GLB JSON Sidecars",
+        description="Also write each BlenRose material's data next to its GLB as <name>.json, "
+                    "which psg-build picks up automatically",
+        default=False,
+    )
+
+    run_psg_build: BoolProperty(
+        name="Build PSGs",
+        description="Run PsgBuilder.Cli psg-build on every GLB as soon as it is written. "
+                    "Implies per-GLB JSON sidecars",
+        default=False,
+    )
+
+    psg_builder_path: StringProperty(
+        name="PsgBuilder.Cli",
+        description="PsgBuilder.Cli executable (or PsgBuilder.Cli.dll, run through dotnet)",
+        subtype="FILE_PATH",
+    )
+
+    psg_build_jobs: IntProperty(
+        name="Build Processes",
+        description="Maximum number of psg-build processes running at once",
+        default=2,
+        min=1,
+        max=16,
+    )
+
+    use_modal: BoolProperty(
+        name="Cancellable",
+        description="When started from the UI, export one material group at a time with a progress bar; "
+                    "press Esc to stop. Groups finished before cancelling are skipped by the next "
+                    "incremental run",
+        default=False,
+    )
+
+    _MODAL_TICK = 0.01
+
+    def execute(self, context):
+        export_dir = bpy.path.abspath(self.filepath)
+        os.makedirs(export_dir, exist_ok=True)
+
+        if self.run_psg_build and not os.path.isfile(bpy.path.abspath(self.psg_builder_path)):
+            self.report({"ERROR"}, "Set the PsgBuilder.Cli path to build PSGs after export")
+            return {"CANCELLED"}
+
+        job = _BulkExportJob(export_dir, self, self.report)
+        try:
+            if not job.start(context):
+                job.cleanup()
+                return {"CANCELLED"}
+        except Exception:
+            job.cleanup()
+            raise
+
+        # Only an invoked operator can go modal: a script calling
+        # bpy.ops.blenrose.bulk_export() expects the files when it returns
+        invoked = getattr(self, "_invoked", False)
+        if self.use_modal and invoked and not bpy.app.background and context.window is not None:
+            self._job = job
+            wm = context.window_manager
+            self._timer = wm.event_timer_add(self._MODAL_TICK, window=context.window)
+            wm.progress_begin(0, max(job.total, 1))
+            wm.modal_handler_add(self)
+            self._update_status(context)
+            return {"RUNNING_MODAL"}
+
+        try:
+            while job.step(context):
+                pass
+        except Exception:
+            job.cleanup()
+            raise
+        job.finish()
         return {"FINISHED"}
 
+    def modal(self, context, event):
+        job = self._job
+        if event.type == "ESC":
+            self._end_modal(context)
+            job.cancel()
+            return {"CANCELLED"}
+
+        if event.type != "TIMER":
+            # Swallow input so the scene cannot change under the export
+            return {"RUNNING_MODAL"}
+
+        try:
+            more = job.step(context)
+        except Exception:
+            self._end_modal(context)
+            job.cleanup()
+            raise
+        context.window_manager.progress_update(job.index)
+        if more:
+            self._update_status(context)
+            return {"RUNNING_MODAL"}
+
+        self._end_modal(context)
+        job.finish()
+        return {"FINISHED"}
+
+    def _update_status(self, context):
+        job = self._job
+        context.workspace.status_text_set(
+            f"Blenrose export: group {job.index + 1}/{job.total} ({job.current_name()}), "
+            f"{job.unchanged} unchanged, {job.failed} failed  |  Esc to cancel"
+        )
+
+    def _end_modal(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
     def invoke(self, context, event):
+        self._invoked = True
         context.window_manager.fileselect_add(self)
         return {"RUNNING_MODAL"}
 
@@ -2325,59 +4477,251 @@ classes = (
 )
 
 
-def _node_tree_update_handler(scene):
+def _materials_from_depsgraph(depsgraph):
     """
-    Handler that auto-detects textures when node trees are updated.
-    Called when materials are modified in the shader editor.
-    This syncs BlenRose UI with changes in the shader node tree.
+    Collect the original materials touched by a depsgraph update.
+
+    Material node trees are embedded IDs, so an edit in the shader editor can
+    surface as a ShaderNodeTree update rather than a Material one; those are
+    mapped back to their owning material. Returns an empty list when no
+    material-related ID changed so the caller can bail out immediately.
     """
-    # Only process materials that have Blenrose enabled
-    # Use a flag to prevent infinite loops
-    if not hasattr(bpy.app, "_blenrose_updating"):
-        bpy.app._blenrose_updating = False
-    
-    if bpy.app._blenrose_updating:
+    if not (depsgraph.id_type_updated("MATERIAL") or depsgraph.id_type_updated("NODETREE")):
+        return []
+
+    materials = {}
+    node_tree_ptrs = set()
+    for update in depsgraph.updates:
+        id_data = getattr(update.id, "original", update.id)
+        if isinstance(id_data, bpy.types.Material):
+            materials[id_data.as_pointer()] = id_data
+        elif isinstance(id_data, bpy.types.ShaderNodeTree):
+            node_tree_ptrs.add(id_data.as_pointer())
+
+    if node_tree_ptrs:
+        for mat in bpy.data.materials:
+            nt = mat.node_tree
+            if nt and nt.as_pointer() in node_tree_ptrs:
+                materials[mat.as_pointer()] = mat
+
+    return list(materials.values())
+
+
+# -------------------------------------------------------------------------
+# Background sync queue
+# -------------------------------------------------------------------------
+
+def _queue_material_sync(mat, detect=False, parts=()):
+    """
+    Mark a material dirty for background sync and make sure the drain timer runs.
+
+    detect: re-read textures from the shader node tree into the settings.
+    parts:  settings properties whose BR_* nodes need resyncing; None means all.
+    Repeated requests for the same material coalesce into one queue entry.
+    Inside a blenrose_batch() block the work is held back until the block ends.
+    """
+    batching = _SYNC_BATCH["depth"] > 0
+    queue = _SYNC_BATCH["pending"] if batching else _SYNC_QUEUE
+    entry = queue.get(mat.as_pointer())
+    if entry is None:
+        entry = queue[mat.as_pointer()] = {"name": mat.name, "detect": False, "all": False, "parts": set()}
+    entry["detect"] = entry["detect"] or detect
+    if parts is None:
+        entry["all"] = True
+    else:
+        entry["parts"].update(parts)
+
+    if not batching and not bpy.app.timers.is_registered(_drain_sync_queue):
+        bpy.app.timers.register(_drain_sync_queue, first_interval=0.0)
+
+
+def _material_from_pointer(mat_ptr, name):
+    """The material with pointer ``mat_ptr`` (``name`` is only a fast-path hint), or None if removed."""
+    mat = bpy.data.materials.get(name)
+    if mat is not None and mat.as_pointer() == mat_ptr:
+        return mat
+    # Renamed since it was queued (or removed and its name reused)
+    for mat in bpy.data.materials:
+        if mat.as_pointer() == mat_ptr:
+            return mat
+    return None
+
+
+def _process_sync_entry(mat_ptr, entry):
+    """Run the queued work for a single material."""
+    mat = _material_from_pointer(mat_ptr, entry["name"])
+    if not mat:
+        _SYNC_WRITTEN_FINGERPRINTS.pop(mat_ptr, None)
         return
-    
+
+    has_tree = mat.use_nodes and mat.node_tree
+    detect = entry["detect"]
+    if detect and not entry["all"] and not entry["parts"] and has_tree:
+        detect = _SYNC_WRITTEN_FINGERPRINTS.get(mat_ptr) != _node_tree_fingerprint(mat)
+
+    # Our own node and settings writes must not queue more syncs through
+    # the property update callbacks.
+    suppressed = mat_ptr in _SUPPRESSED_UPDATE_MATERIALS
+    _SUPPRESSED_UPDATE_MATERIALS.add(mat_ptr)
+    try:
+        if entry["all"]:
+            _sync_blenrose_nodes(mat)
+        elif entry["parts"]:
+            _sync_blenrose_nodes(mat, entry["parts"])
+        if detect:
+            changed = _sync_settings_from_node_tree(mat)
+            if changed:
+                # What the suppressed update callbacks would have queued
+                _sync_blenrose_nodes(mat, changed)
+    finally:
+        if not suppressed:
+            _SUPPRESSED_UPDATE_MATERIALS.discard(mat_ptr)
+
+    if mat.use_nodes and mat.node_tree:
+        _SYNC_WRITTEN_FINGERPRINTS[mat_ptr] = _node_tree_fingerprint(mat)
+
+
+def _process_queued_material(mat_ptr):
+    """Pop and process one queue entry; failures are reported, not raised."""
+    entry = _SYNC_QUEUE.pop(mat_ptr)
+    try:
+        _process_sync_entry(mat_ptr, entry)
+    except Exception as e:
+        print(f"Blenrose: background sync of '{entry['name']}' failed: {type(e).__name__}: {e}")
+
+
+def _drain_sync_queue():
+    """
+    Timer callback: process queued materials until the per-tick budget is spent.
+    Returns the delay until the next tick, or None once the queue is empty.
+    """
+    deadline = time.perf_counter() + _SYNC_TICK_BUDGET
+    while _SYNC_QUEUE:
+        _process_queued_material(next(iter(_SYNC_QUEUE)))
+        if time.perf_counter() >= deadline:
+            break
+    return _SYNC_TICK_INTERVAL if _SYNC_QUEUE else None
+
+
+def _flush_sync_queue():
+    """Synchronously process everything still queued (before operators read BR_* nodes)."""
+    while _SYNC_QUEUE:
+        _process_queued_material(next(iter(_SYNC_QUEUE)))
+
+
+def _clear_sync_queue():
+    """Drop all pending work and stop the drain timer."""
+    _SYNC_QUEUE.clear()
+    _SYNC_WRITTEN_FINGERPRINTS.clear()
+    if bpy.app.timers.is_registered(_drain_sync_queue):
+        bpy.app.timers.unregister(_drain_sync_queue)
+
+
+def _sync_settings_from_node_tree(mat):
+    """
+    Auto-detect textures in a material's shader tree and copy changed images
+    into its Blenrose settings (syncs the UI with shader editor edits).
+    Returns the settings properties that were written.
+    """
+    changed = []
+    if not mat.use_nodes or not mat.node_tree:
+        return changed
+
+    settings = getattr(mat, "blenrose_settings", None)
+    if not settings or not settings.enabled:
+        return changed
+
+    # Use a flag to prevent infinite loops
+    if getattr(bpy.app, "_blenrose_updating", False):
+        return changed
+
     try:
         bpy.app._blenrose_updating = True
-        
-        for mat in bpy.data.materials:
-            if not mat or not mat.use_nodes or not mat.node_tree:
-                continue
-            
-            settings = getattr(mat, "blenrose_settings", None)
-            if not settings or not settings.enabled:
-                continue
-            
-            # Auto-detect and update textures (sync with node tree changes)
-            # Only update if the detected texture is different from current
-            detected = _detect_textures_from_node_tree(mat)
-            
-            texture_prop_map = {
-                "diffuse": "diffuse_tex",
-                "lightmap": "lightmap_tex",
-                "specular": "specular_tex",
-                "normal": "normal_tex",
-                "detail": "detail_tex",
-                "macro_overlay": "macro_overlay_tex",
-                "environment": "environment_tex",
-                "decal": "decal_tex",
-                "transparent": "transparent_tex",
-                "noise": "noise_tex",
-            }
-            
-            for channel_name, texture_info in detected.items():
-                tex_prop = texture_prop_map.get(channel_name)
-                if tex_prop:
-                    current_image = getattr(settings, tex_prop, None)
-                    detected_image = texture_info.get("image")
-                    
-                    # Update if different (syncs with node tree)
-                    if detected_image and detected_image != current_image:
-                        setattr(settings, tex_prop, detected_image)
+
+        # Auto-detect and update textures (sync with node tree changes)
+        # Only update if the detected texture is different from current
+        detected = _detect_textures_from_node_tree(mat)
+
+        texture_prop_map = {
+            "diffuse": "diffuse_tex",
+            "lightmap": "lightmap_tex",
+            "specular": "specular_tex",
+            "normal": "normal_tex",
+            "detail": "detail_tex",
+            "macro_overlay": "macro_overlay_tex",
+            "environment": "environment_tex",
+            "decal": "decal_tex",
+            "transparent": "transparent_tex",
+            "noise": "noise_tex",
+        }
+
+        for channel_name, texture_info in detected.items():
+            tex_prop = texture_prop_map.get(channel_name)
+            if tex_prop:
+                current_image = getattr(settings, tex_prop, None)
+                detected_image = texture_info.get("image")
+
+                # Update if different (syncs with node tree)
+                if detected_image and _set_if_changed(settings, tex_prop, detected_image):
+                    changed.append(tex_prop)
     finally:
         bpy.app._blenrose_updating = False
+    return changed
+
+
+@persistent
+def _node_tree_update_handler(scene, depsgraph=None):
+    """
+    Handler that auto-detects textures when node trees are updated.
+    Called when materials are modified in the shader editor.
+    Only materials reported in ``depsgraph.updates`` are considered; viewport
+    navigation, object transforms and frame changes do no work at all.
+    Changed materials are only marked dirty here; the actual sync runs from
+    the background queue so the UI stays responsive.
+    """
+    # UV layers live on mesh data; any mesh change may add, remove or rename one.
+    if depsgraph is None or depsgraph.id_type_updated("MESH"):
+        _invalidate_uv_items_cache()
+    else:
+        _update_uv_items_from_depsgraph(depsgraph)
+    if depsgraph is None:
+        _invalidate_material_users_index()
+        _invalidate_world_bounds()
+    else:
+        _update_material_users_from_depsgraph(depsgraph)
+        _update_world_bounds_from_depsgraph(depsgraph)
+
+    if getattr(bpy.app, "_blenrose_updating", False):
+        return
+
+    _prune_detection_cache()
+
+    if depsgraph is None:
+        # Older callers pass only the scene; fall back to a full sweep.
+        changed_materials = list(bpy.data.materials)
+    else:
+        changed_materials = _materials_from_depsgraph(depsgraph)
+
+    for mat in changed_materials:
+        settings = getattr(mat, "blenrose_settings", None)
+        if settings and settings.enabled and mat.use_nodes and mat.node_tree:
+            _queue_material_sync(mat, detect=True)
+
+
+@persistent
+def _frame_change_post_handler(*_args):
+    """Animated modifiers and shape keys change geometry without a depsgraph update."""
+    _invalidate_world_bounds()
+
+
+@persistent
+def _load_post_handler(*_args):
+    """Forget per-material caches and queued work; pointers from the previous file are meaningless."""
+    _clear_sync_queue()
+    _evict_detection_cache()
+    _invalidate_uv_items_cache()
+    _invalidate_material_users_index()
+    _invalidate_world_bounds()
 
 
 def register():
@@ -2399,6 +4743,10 @@ def register():
     # Register node tree update handler to auto-detect textures
     if _node_tree_update_handler not in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.append(_node_tree_update_handler)
+    if _load_post_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_load_post_handler)
+    if _frame_change_post_handler not in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.append(_frame_change_post_handler)
 
 
 def unregister():
@@ -2407,6 +4755,13 @@ def unregister():
     # Unregister node tree update handler
     if _node_tree_update_handler in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(_node_tree_update_handler)
+    if _load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_load_post_handler)
+    if _frame_change_post_handler in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(_frame_change_post_handler)
+    _clear_sync_queue()
+    _evict_detection_cache()
+    _invalidate_world_bounds()
 
     del bpy.types.Material.blenrose_settings
     del bpy.types.Scene.blenrose_mat_index
@@ -2415,5 +4770,337 @@ def unregister():
         unregister_class(cls)
 
 
+# -------------------------------------------------------------------------
+# Sharded export (several background Blender processes)
+# -------------------------------------------------------------------------
+
+_SHARD_PLAN_NAME = "blenrose_shard_plan.json"
+# Fixed cost of one group in faces, for the exporter call and file I/O
+_SHARD_GROUP_COST = 2000
+
+
+def _shard_file_name(name, index):
+    """``name`` with a ``.shard<index>`` suffix before the extension."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.shard{index}{ext}"
+
+
+def _plan_material_groups(mesh_objects, depsgraph):
+    """
+    Group visible mesh objects like ``_group_objects_by_material`` without
+    splitting anything: {group_key: {"objects": [names], "faces", "bbox"}}.
+    Multi-material objects are listed in every group they have faces in,
+    with the bounds of just those faces.
+    """
+    groups = {}
+    for obj in mesh_objects:
+        if not obj.visible_get():
+            continue
+        materials = {slot.material for slot in obj.material_slots if slot.material}
+        if len(materials) <= 1:
+            material = next(iter(materials), None)
+            parts = {material: (len(obj.data.polygons), _object_psg_bounds(obj, depsgraph))}
+        else:
+            parts = _object_material_bounds(obj, depsgraph)
+        for material, (faces, bbox) in parts.items():
+            group = groups.setdefault(_export_group_key(material), {"objects": [], "faces": 0, "bbox": None})
+            group["objects"].append(obj.name)
+            group["faces"] += faces
+            group["bbox"] = _union_bboxes([group["bbox"], bbox])
+    return groups
+
+
+def _plan_export_shards(context, count, export_dir, manifest, timings=None):
+    """
+    Plan a sharded export: group the scene's meshes, bound the groups and
+    assign the splines once, then split the groups into ``count`` shards of
+    similar cost.
+
+    Returns one {group_key: {"file", "objects", "splines"}} dict per shard:
+    the group's GLB file name, the names of its mesh objects and the
+    indices of its splines in ``_extract_splines_from_scene`` order. Groups
+    are dealt largest first to the cheapest shard. File names are reserved
+    here for all shards at once, so shards can never pick the same name.
+    """
+    timings = timings or _ExportTimings()
+    depsgraph = context.evaluated_depsgraph_get()
+    with timings.stage("splines"):
+        splines = _extract_splines_from_scene(context)
+    with timings.stage("bounds"):
+        mesh_objects = [obj for obj in context.scene.objects if obj.type == "MESH"]
+        groups = _plan_material_groups(mesh_objects, depsgraph)
+    with timings.stage("spline_assignment"):
+        group_bboxes = {key: group["bbox"] for key, group in groups.items() if group["bbox"]}
+        group_splines = _best_overlap_splines(splines, group_bboxes)
+
+    owned_files = {entry["file"]: key for key, entry in manifest.items()}
+    reserved_files = _unmanaged_export_files(export_dir, manifest)
+    shards = [{} for _ in range(count)]
+    loads = [0] * count
+    for group_key, group in sorted(groups.items(), key=lambda item: (-item[1]["faces"], item[0])):
+        base_name = _NO_MATERIAL_NAME if group_key == _NO_MATERIAL_KEY else bpy.path.clean_name(group_key)
+        index = loads.index(min(loads))
+        shards[index][group_key] = {
+            "file": _reserve_glb_name(group_key, base_name, manifest, owned_files, reserved_files),
+            "objects": group["objects"],
+            "splines": group_splines.get(group_key, []),
+        }
+        loads[index] += group["faces"] + _SHARD_GROUP_COST
+    return shards
+
+
+def _merge_export_shards(export_dir, shards, indices, manifest, compact_json, timings, report):
+    """
+    Combine the shards' outputs into the files a single-process export
+    writes: materials JSON, manifest, timings and psg-build summary. Shard
+    files are removed. Returns False when a shard left no manifest (it
+    crashed); its groups then keep their previous manifest entries and the
+    combined materials JSON is left as it was.
+    """
+    complete = True
+    groups = {}
+    materials = {}
+    builds = []
+    has_builds = False
+    for index in indices:
+        manifest_name = _shard_file_name(_EXPORT_MANIFEST_NAME, index)
+        if os.path.exists(os.path.join(export_dir, manifest_name)):
+            groups.update(_load_export_manifest(export_dir, manifest_name))
+        else:
+            complete = False
+            groups.update({key: manifest[key] for key in shards[index] if key in manifest})
+            report({"ERROR"}, f"Shard {index} did not finish; its groups keep their previous manifest entries")
+
+        for name in (_MATERIALS_JSON_NAME, _EXPORT_TIMINGS_NAME, _PSG_BUILD_SUMMARY_NAME):
+            path = os.path.join(export_dir, _shard_file_name(name, index))
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if name == _MATERIALS_JSON_NAME:
+                materials.update(data)
+            elif name == _EXPORT_TIMINGS_NAME:
+                timings.merge(data)
+            else:
+                has_builds = True
+                builds.extend(data.get("builds", []))
+
+        for name in (_MATERIALS_JSON_NAME, _EXPORT_MANIFEST_NAME, _EXPORT_TIMINGS_NAME, _PSG_BUILD_SUMMARY_NAME):
+            path = os.path.join(export_dir, _shard_file_name(name, index))
+            if os.path.exists(path):
+                os.remove(path)
+
+    if complete:
+        materials_writer = _MaterialsJsonWriter(os.path.join(export_dir, _MATERIALS_JSON_NAME), compact=compact_json)
+        try:
+            # Sorted by group key, so the file doesn't depend on the shard count
+            for name in sorted(materials):
+                materials_writer.add(name, materials[name])
+            if materials_writer.close():
+                report({"INFO"}, f"Exported {materials_writer.count} BlenRose material(s) to {materials_writer.path}")
+        finally:
+            materials_writer.abort()
+        _remove_stale_group_files(export_dir, manifest, groups)
+        _save_export_manifest(export_dir, groups)
+    else:
+        partial = dict(manifest)
+        partial.update(groups)
+        _save_export_manifest(export_dir, partial)
+
+    if has_builds:
+        summary = _write_psg_build_summary(os.path.join(export_dir, _PSG_BUILD_SUMMARY_NAME), builds)
+        if "write_error" in summary:
+            report({"WARNING"}, f"Failed to write psg-build summary: {summary['write_error']}")
+        report({"INFO"}, f"PsgBuilder: {summary['built']} built, {summary['failed']} failed")
+    return complete
+
+
+def _run_export_shards(export_dir, shard_count, option_args, compact_json, report):
+    """
+    Export the saved .blend with ``shard_count`` background Blender processes
+    and merge their outputs. ``option_args`` are passed on to every shard's
+    command line. Returns the process exit code like ``main``.
+    """
+    blend_path = bpy.data.filepath
+    if not blend_path:
+        report({"ERROR"}, "Save the .blend file before a sharded export")
+        return 2
+
+    timings = _ExportTimings()
+    manifest = _load_export_manifest(export_dir)
+    with timings.stage("plan"):
+        shards = _plan_export_shards(bpy.context, shard_count, export_dir, manifest, timings)
+    if not any(shards):
+        report({"WARNING"}, "No mesh objects found in scene")
+        return 2
+
+    indices = [index for index, shard in enumerate(shards) if shard]
+    for index in indices:
+        for name in (_MATERIALS_JSON_NAME, _EXPORT_MANIFEST_NAME, _EXPORT_TIMINGS_NAME, _PSG_BUILD_SUMMARY_NAME):
+            path = os.path.join(export_dir, _shard_file_name(name, index))
+            if os.path.exists(path):
+                os.remove(path)
+
+    plan_path = os.path.join(export_dir, _SHARD_PLAN_NAME)
+    with open(plan_path, "w") as f:
+        json.dump({"blend": blend_path, "shards": shards}, f, indent=2)
+
+    try:
+        with timings.stage("shards"):
+            processes = []
+            try:
+                for index in indices:
+                    command = [
+                        bpy.app.binary_path, "-b", "--factory-startup", blend_path,
+                        "--python", os.path.abspath(__file__), "--",
+                        _CLI_FLAG, export_dir, "--shard-plan", plan_path, "--shard-index", str(index),
+                    ] + option_args
+                    report({"INFO"}, f"Shard {index}: {len(shards[index])} group(s)")
+                    processes.append((index, subprocess.Popen(command)))
+                exit_codes = {index: process.wait() for index, process in processes}
+            except BaseException as e:
+                # Don't leave shards running (and writing) after the driver gave up
+                for _index, process in processes:
+                    process.terminate()
+                for _index, process in processes:
+                    process.wait()
+                if not isinstance(e, OSError):
+                    raise
+                report({"ERROR"}, f"Failed to start shard {index}: {e}")
+                return 1
+        for index, code in exit_codes.items():
+            if code:
+                report({"ERROR"}, f"Shard {index} exited with code {code}")
+
+        with timings.stage("merge"):
+            complete = _merge_export_shards(export_dir, shards, indices, manifest, compact_json, timings, report)
+    finally:
+        os.remove(plan_path)
+
+    try:
+        timings.write(export_dir)
+    except OSError as e:
+        report({"WARNING"}, f"Failed to write export timings: {e}")
+    return 0 if complete and not any(exit_codes.values()) else 1
+
+
+# -------------------------------------------------------------------------
+# Command line
+# -------------------------------------------------------------------------
+
+_CLI_FLAG = "--blenrose-export"
+
+
+def _parse_cli_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="blender -b level.blend --python BlenRose.py --",
+        description="Export every mesh of the scene as per-material GLBs with BlenRose material data.",
+    )
+    parser.add_argument(_CLI_FLAG, dest="export_dir", required=True, metavar="DIR",
+                        help="directory for the GLBs, JSON and manifest")
+    parser.add_argument("--native-writer", action="store_true", help="write GLBs without the glTF exporter")
+    parser.add_argument("--full", action="store_true", help="re-export groups the manifest marks unchanged")
+    parser.add_argument("--compact-json", action="store_true", help="write material JSON without indentation")
+    parser.add_argument("--sidecars", action="store_true", help="write a <name>.json next to every GLB")
+    parser.add_argument("--psg-builder", metavar="PATH", help="run PsgBuilder.Cli psg-build on every GLB")
+    parser.add_argument("--psg-jobs", type=int, default=2, metavar="N", help="psg-build processes at once")
+    parser.add_argument("--shards", type=int, default=1, metavar="N",
+                        help="split the export across N background Blender processes")
+    parser.add_argument("--shard-plan", metavar="PATH", help=argparse.SUPPRESS)
+    parser.add_argument("--shard-index", type=int, default=0, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def _cli_option_args(args):
+    """
+    The export options of parsed ``args`` as command line arguments for a
+    shard. The psg-build processes are divided between the shards.
+    """
+    option_args = ["--psg-jobs", str(max(1, args.psg_jobs // max(1, args.shards)))]
+    for flag, enabled in (("--native-writer", args.native_writer), ("--full", args.full),
+                          ("--compact-json", args.compact_json), ("--sidecars", args.sidecars)):
+        if enabled:
+            option_args.append(flag)
+    if args.psg_builder:
+        option_args += ["--psg-builder", os.path.abspath(args.psg_builder)]
+    return option_args
+
+
+def main(argv=None):
+    """
+    Run a bulk export of the open .blend without UI, e.g.
+
+        blender -b level.blend --python BlenRose.py -- --blenrose-export out/ [options]
+
+    or, with the add-on installed,
+    ``--python-expr "import BlenRose, sys; sys.exit(BlenRose.main())" -- ...``.
+    With ``--shards N`` the groups are planned here and exported by N
+    background Blender processes on the saved file. ``argv`` defaults to
+    the arguments after Blender's ``--``. Returns the process exit code: 0
+    on success, 1 when anything failed to export and 2 when there is
+    nothing to export or the options are invalid.
+    """
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    try:
+        args = _parse_cli_args(argv)
+    except SystemExit as e:
+        return e.code
+
+    if not hasattr(bpy.types.Material, "blenrose_settings"):
+        register()
+
+    errors = []
+
+    def report(level, message):
+        kind = next(iter(level))
+        if kind == "ERROR":
+            errors.append(message)
+        print(f"Blenrose {kind.lower()}: {message}", file=sys.stderr if kind == "ERROR" else sys.stdout)
+
+    psg_builder_path = os.path.abspath(args.psg_builder) if args.psg_builder else ""
+    if psg_builder_path and not os.path.isfile(psg_builder_path):
+        report({"ERROR"}, f"PsgBuilder.Cli not found: {psg_builder_path}")
+        return 2
+
+    options = argparse.Namespace(
+        use_native_writer=args.native_writer,
+        incremental=not args.full,
+        compact_json=args.compact_json,
+        material_sidecars=args.sidecars,
+        run_psg_build=bool(psg_builder_path),
+        psg_builder_path=psg_builder_path,
+        psg_build_jobs=max(1, args.psg_jobs),
+    )
+    export_dir = os.path.abspath(args.export_dir)
+    os.makedirs(export_dir, exist_ok=True)
+
+    shard_plan = None
+    if args.shard_plan:
+        with open(args.shard_plan) as f:
+            shard_plan = json.load(f)["shards"]
+    elif args.shards > 1:
+        return _run_export_shards(export_dir, args.shards, _cli_option_args(args), args.compact_json, report)
+
+    context = bpy.context
+    job = _BulkExportJob(export_dir, options, report, shard_plan, args.shard_index)
+    try:
+        if not job.start(context):
+            job.cleanup()
+            return 2
+        while job.step(context):
+            pass
+    except Exception as e:
+        traceback.print_exc()
+        job.cleanup()
+        report({"ERROR"}, f"Export aborted: {e}")
+        return 1
+    job.finish()
+    return 1 if errors else 0
+
+
 if __name__ == "__main__":
     register()
+    if _CLI_FLAG in sys.argv:
+        sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Check and benchmark the native GLB writer against a per-corner reference.
+
+The reference welds triangle corners the way the glTF exporter does: it keys
+every corner on its source vertex index, loop normal and UVs (never on the
+position, so coincident vertices stay apart) and, walking the corners in
+order, gives every new key the next vertex index. Every GLB the native
+writer produces is parsed back and its POSITION, NORMAL, TEXCOORD_n and
+index accessors must match the reference before anything is timed. One mesh
+has its faces on duplicated, coincident vertices so a position-keyed weld
+fails the check.
+
+    python benchmarks/bench_glb_writer.py [object_count ...]
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_bpy
+
+fake_bpy.install()
+
+import BlenRose  # noqa: E402
+
+
+# -------------------------------------------------------------------------
+# Reference: exporter-style welding, one corner at a time
+# -------------------------------------------------------------------------
+
+def _reference_object_arrays(obj):
+    mesh = obj.evaluated_get(None).to_mesh()
+    mesh.calc_loop_triangles()
+    tri_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    normals = BlenRose._read_loop_normals(mesh)
+    uv_layers = []
+    for layer in mesh.uv_layers:
+        uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        layer.data.foreach_get("uv", uv)
+        uv_layers.append(uv.reshape(-1, 2))
+    co = co.reshape(-1, 3)
+
+    vertex_of = {}
+    corners = []
+    indices = []
+    for loop in tri_loops:
+        key = (int(loop_vertices[loop]), tuple(normals[loop])) + tuple(tuple(uv[loop]) for uv in uv_layers)
+        if key not in vertex_of:
+            vertex_of[key] = len(corners)
+            corners.append(loop)
+        indices.append(vertex_of[key])
+
+    matrix = np.array(obj.matrix_world, dtype=np.float64)
+    linear = matrix[:3, :3]
+    corners = np.array(corners)
+    positions = co[loop_vertices[corners]] @ (BlenRose._BLENDER_TO_PSG @ linear).T \
+        + BlenRose._BLENDER_TO_PSG @ matrix[:3, 3]
+    vertex_normals = normals[corners] @ (np.linalg.pinv(linear) @ BlenRose._BLENDER_TO_PSG.T)
+    vertex_normals /= np.linalg.norm(vertex_normals, axis=1, keepdims=True)
+    uvs = [uv[corners] * (1.0, -1.0) + (0.0, 1.0) for uv in uv_layers]
+    indices = np.array(indices).reshape(-1, 3)
+    if np.linalg.det(linear) < 0.0:
+        indices = indices[:, ::-1]
+    return positions, vertex_normals, uvs, indices.ravel()
+
+
+# -------------------------------------------------------------------------
+# GLB parsing
+# -------------------------------------------------------------------------
+
+_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3}
+_DTYPES = {5126: np.float32, 5125: np.uint32, 5123: np.uint16}
+
+
+def _parse_glb(data):
+    """Return {mesh name: {attribute or "indices": array}} from GLB bytes."""
+    magic, version, length = struct.unpack_from("<4sII", data, 0)
+    assert magic == b"glTF" and version == 2 and length == len(data)
+    json_length, json_type = struct.unpack_from("<I4s", data, 12)
+    assert json_type == b"JSON"
+    gltf = json.loads(data[20:20 + json_length])
+    bin_offset = 20 + json_length
+    bin_length, bin_type = struct.unpack_from("<I4s", data, bin_offset)
+    assert bin_type == b"BIN\x00"
+    binary = data[bin_offset + 8:bin_offset + 8 + bin_length]
+
+    def read(accessor_index):
+        accessor = gltf["accessors"][accessor_index]
+        view = gltf["bufferViews"][accessor["bufferView"]]
+        array = np.frombuffer(binary, dtype=_DTYPES[accessor["componentType"]],
+                              count=accessor["count"] * _COMPONENTS[accessor["type"]],
+                              offset=view["byteOffset"])
+        return array.reshape(accessor["count"], -1) if accessor["type"] != "SCALAR" else array
+
+    meshes = {}
+    for mesh in gltf["meshes"]:
+        primitive = mesh["primitives"][0]
+        arrays = {name: read(index) for name, index in primitive["attributes"].items()}
+        arrays["indices"] = read(primitive["indices"])
+        meshes[mesh["name"]] = arrays
+    return meshes
+
+
+def _split_faces_apart(mesh):
+    """Move every other face onto its own copies of the vertices (same positions, normals and UVs)."""
+    co = mesh.vertices.array("co").copy()
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", np.concatenate([co, co]))
+    loop_vertices = mesh.loops.array("vertex_index").ravel().copy()
+    starts = mesh.polygons.array("loop_start").ravel()
+    totals = mesh.polygons.array("loop_total").ravel()
+    for start, total in list(zip(starts.tolist(), totals.tolist()))[1::2]:
+        loop_vertices[start:start + total] += len(co)
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+
+
+def check(objects):
+    """Assert the native GLB of ``objects`` round-trips to the reference arrays."""
+    meshes = _parse_glb(BlenRose._build_glb(BlenRose._snapshot_group_glb(objects, None), "Material"))
+    assert len(meshes) == len(objects)
+    for obj in objects:
+        positions, normals, uvs, indices = _reference_object_arrays(obj)
+        written = meshes[obj.name]
+        assert np.array_equal(written["indices"], indices), obj.name
+        assert np.allclose(written["POSITION"], positions, atol=1e-5), obj.name
+        assert np.allclose(written["NORMAL"], normals, atol=1e-5), obj.name
+        for uv_index, uv in enumerate(uvs):
+            assert np.allclose(written[f"TEXCOORD_{uv_index}"], uv, atol=1e-6), obj.name
+        assert f"TEXCOORD_{len(uvs)}" not in written
+    return meshes
+
+
+def _best_of(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(object_counts):
+    print(f"{'objects':>8} | {'reference':>10} {'native':>10} {'x':>6}")
+    for object_count in object_counts:
+        context = fake_bpy.make_scene(material_count=1, object_count=object_count, node_count=10,
+                                      curve_count=0, multi_material_ratio=0.0)
+        objects = [obj for obj in context.scene.objects if obj.type == "MESH"]
+        mirrored = objects[0].matrix_world  # one mirrored object to cover the winding flip
+        mirrored[0] = [-value for value in mirrored[0]]
+        assert np.linalg.det(np.array(mirrored, dtype=np.float64)[:3, :3]) < 0.0
+        split = objects[-1]  # every object owns its mesh
+        _split_faces_apart(split.data)
+        meshes = check(objects)
+        positions = meshes[split.name]["POSITION"]
+        assert len(np.unique(positions, axis=0)) < len(positions), "coincident vertices were merged"
+
+        reference = _best_of(lambda: [_reference_object_arrays(obj) for obj in objects])
+        native = _best_of(lambda: BlenRose._snapshot_group_glb(objects, None))
+        print(f"{object_count:>8} | {reference * 1e3:>8.2f}ms {native * 1e3:>8.2f}ms {reference / native:>5.1f}x")
+
+
+if __name__ == "__main__":
+    counts = [int(a) for a in sys.argv[1:]] or [10, 50]
+    run(counts)
@@ -0,0 +1,176 @@
+"""
+Benchmark texture detection and UV tracing with and without the link index.
+
+The "linear" columns run the pre-index algorithms (every query rescans
+nt.links); the "indexed" columns run BlenRose's current code, which builds
+one from_node / to_socket index per detection pass.
+
+    python benchmarks/bench_node_links.py [node_count ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_bpy
+
+fake_bpy.install()
+
+import BlenRose  # noqa: E402
+
+
+# -------------------------------------------------------------------------
+# Reference implementations: link lookups by scanning nt.links
+# -------------------------------------------------------------------------
+
+def _linear_trace_uv(nt, socket, mat, visited_nodes=None, depth=0):
+    if depth > 8 or socket is None:
+        return None
+    if visited_nodes is None:
+        visited_nodes = set()
+    for link in nt.links:
+        if link.to_socket != socket:
+            continue
+        from_node = link.from_node
+        node_ptr = from_node.as_pointer()
+        if node_ptr in visited_nodes:
+            continue
+        visited_nodes.add(node_ptr)
+        if from_node.type == "UVMAP" and from_node.uv_map:
+            return from_node.uv_map
+        for input_socket in from_node.inputs:
+            resolved = _linear_trace_uv(nt, input_socket, mat, visited_nodes, depth + 1)
+            if resolved:
+                return resolved
+    return None
+
+
+_CHANNEL_DETECTION = [
+    ("diffuse", ["diffuse", "base", "color", "albedo"], ["Base Color", "Color"]),
+    ("specular", ["specular", "spec"], ["Specular", "Specular IOR Level", "Specular Tint"]),
+    ("normal", ["normal", "norm", "nrm"], ["Normal"]),
+    ("lightmap", ["lightmap", "light", "lm", "emission"], ["Emission", "Color"]),
+    ("detail", ["detail", "det"], []),
+    ("macro_overlay", ["macro", "overlay"], []),
+    ("environment", ["environment", "env", "reflection"], []),
+    ("decal", ["decal"], []),
+    ("transparent", ["transparent", "alpha"], ["Alpha"]),
+    ("noise", ["noise"], []),
+]
+
+
+def _linear_detect(mat):
+    """Texture detection as it was before the link index (UV resolution included)."""
+    nt = mat.node_tree
+    detected = {}
+    for img_node in [n for n in nt.nodes if n.type == "TEX_IMAGE" and n.image]:
+        node_name_lower = (img_node.name + " " + (img_node.label or "")).lower()
+        connected_targets = []
+        for link in nt.links:
+            if link.from_node == img_node:
+                connected_targets.append(link.to_socket.name)
+                connected_targets.append(link.to_socket.node.type)
+        best_match = None
+        best_score = 0
+        for channel_name, keywords, targets in _CHANNEL_DETECTION:
+            score = 10 * sum(1 for k in keywords if k in node_name_lower)
+            score += 20 * sum(1 for t in targets if t in connected_targets)
+            if channel_name == "lightmap":
+                for link in nt.links:
+                    if link.from_node == img_node and link.to_node.type == "EMISSION":
+                        score += 30
+            if channel_name == "normal":
+                for link in nt.links:
+                    if link.from_node == img_node:
+                        to_node = link.to_node
+                        if to_node.type == "NORMAL_MAP" or "Normal" in [s.name for s in to_node.inputs]:
+                            score += 30
+            if channel_name == "diffuse":
+                for link in nt.links:
+                    if link.from_node == img_node:
+                        name = link.to_socket.name
+                        if ("Base Color" in name or "Color" in name) and \
+                                link.to_node.type in ["BSDF_PRINCIPLED", "BSDF_DIFFUSE"]:
+                            score += 30
+            if channel_name == "specular":
+                for link in nt.links:
+                    if link.from_node == img_node and "Specular" in link.to_socket.name:
+                        score += 30
+            if score > best_score:
+                best_score = score
+                best_match = channel_name
+        if best_match and best_match not in detected:
+            detected[best_match] = {
+                "image": img_node.image,
+                "uv_map_name": _linear_trace_uv(nt, img_node.inputs.get("Vector"), mat),
+            }
+    return detected
+
+
+def _best_of(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _summary(detected):
+    return {channel: (info["image"].name, info["uv_map_name"]) for channel, info in detected.items()}
+
+
+def _check_uv_tie_break():
+    """
+    Several UV Map nodes reaching one socket resolve to the first link in
+    nt.links order, as the linear scan does, also after a link is re-added.
+    """
+    mat = fake_bpy.Material("TieBreak")
+    nt = mat.node_tree
+    tex = nt.add_node(fake_bpy.image_node("Diffuse Tex", fake_bpy.Image("tie.dds")))
+    second = nt.add_node(fake_bpy.uv_map_node("UV B", uv_map="UVMapB"))
+    first = nt.add_node(fake_bpy.uv_map_node("UV A", uv_map="UVMapA"))
+    link = nt.links.new(first.outputs["UV"], tex.inputs["Vector"])
+    nt.links.new(second.outputs["UV"], tex.inputs["Vector"])
+
+    for expected in ("UVMapA", "UVMapB"):
+        socket = tex.inputs["Vector"]
+        indexed = BlenRose._trace_uv_map_name_from_socket(nt, socket, mat)
+        assert indexed == _linear_trace_uv(nt, socket, mat) == expected, (indexed, expected)
+        nt.links.remove(link)
+        link = nt.links.new(first.outputs["UV"], socket)
+
+
+def run(node_counts):
+    _check_uv_tie_break()
+    print(f"{'nodes':>6} {'links':>6} | {'detect linear':>14} {'detect indexed':>15} {'x':>6} | "
+          f"{'uv linear':>10} {'uv indexed':>11} {'x':>6}")
+    for node_count in node_counts:
+        mat = fake_bpy.make_material(f"Bench{node_count}", node_count)
+        nt = mat.node_tree
+        vector_inputs = [n.inputs["Vector"] for n in nt.nodes if n.type == "TEX_IMAGE"]
+
+        assert _summary(_linear_detect(mat)) == _summary(BlenRose._scan_node_tree_for_textures(mat))
+        detect_linear = _best_of(lambda: _linear_detect(mat))
+        detect_indexed = _best_of(lambda: BlenRose._scan_node_tree_for_textures(mat))
+
+        def uv_indexed():
+            link_index = BlenRose._build_link_index(nt)
+            return [BlenRose._trace_uv_map_name_from_socket(nt, s, mat, link_index=link_index)
+                    for s in vector_inputs]
+
+        assert uv_indexed() == [_linear_trace_uv(nt, s, mat) for s in vector_inputs]
+        uv_linear = _best_of(lambda: [_linear_trace_uv(nt, s, mat) for s in vector_inputs])
+        uv_fast = _best_of(uv_indexed)
+
+        print(f"{node_count:>6} {len(nt.links):>6} | {detect_linear * 1e3:>12.2f}ms {detect_indexed * 1e3:>13.2f}ms "
+              f"{detect_linear / detect_indexed:>5.1f}x | {uv_linear * 1e3:>8.2f}ms {uv_fast * 1e3:>9.2f}ms "
+              f"{uv_linear / uv_fast:>5.1f}x")
+
+
+if __name__ == "__main__":
+    counts = [int(a) for a in sys.argv[1:]] or [200, 400, 800]
+    run(counts)
@@ -0,0 +1,124 @@
+"""
+Benchmark assigning splines to material groups by bounding box.
+
+The "linear" column runs the pre-index loop (every spline tested against every
+group, first hit wins); the "grid" column runs BlenRose's ``_BBoxGrid``, which
+picks the group with the largest overlap. Grid results are checked against a
+brute-force largest-overlap search.
+
+    python benchmarks/bench_spline_assignment.py [splines groups]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_bpy
+
+fake_bpy.install()
+
+import BlenRose  # noqa: E402
+
+
+def _box(center, half):
+    return {
+        "min": [c - h for c, h in zip(center, half)],
+        "max": [c + h for c, h in zip(center, half)],
+    }
+
+
+def make_level(spline_count, group_count, size=2000.0, seed=1):
+    """
+    Random level: group boxes 5-80 units wide scattered over a ``size``² area
+    (PSG Y up, ground at 0), and splines that are flat rails or short runs.
+    """
+    rng = random.Random(seed)
+    groups = {}
+    for index in range(group_count):
+        center = (rng.uniform(0, size), rng.uniform(0, 30), rng.uniform(0, size))
+        half = (rng.uniform(2.5, 40), rng.uniform(0.5, 15), rng.uniform(2.5, 40))
+        groups[f"Material.{index:04d}"] = _box(center, half)
+    splines = []
+    for _ in range(spline_count):
+        center = (rng.uniform(0, size), rng.uniform(0, 30), rng.uniform(0, size))
+        half = (rng.uniform(0.5, 20), 0.0, rng.uniform(0.0, 3.0))
+        splines.append(_box(center, half))
+    return splines, groups
+
+
+def _bbox_intersects(bbox1, bbox2):
+    """Check if two bounding boxes intersect (the pre-index test, kept as the reference)."""
+    if not bbox1 or not bbox2:
+        return False
+
+    # Check if boxes overlap on all axes
+    return (
+        bbox1["min"][0] <= bbox2["max"][0] and bbox1["max"][0] >= bbox2["min"][0] and
+        bbox1["min"][1] <= bbox2["max"][1] and bbox1["max"][1] >= bbox2["min"][1] and
+        bbox1["min"][2] <= bbox2["max"][2] and bbox1["max"][2] >= bbox2["min"][2]
+    )
+
+
+def assign_linear(splines, groups):
+    result = []
+    for spline_bbox in splines:
+        for key, group_bbox in groups.items():
+            if _bbox_intersects(spline_bbox, group_bbox):
+                result.append(key)
+                break
+        else:
+            result.append(None)
+    return result
+
+
+def assign_best_brute_force(splines, groups):
+    keys = list(groups)
+    result = []
+    for spline_bbox in splines:
+        best_key = None
+        best_score = None
+        for key in keys:
+            score = BlenRose._bbox_overlap_score(spline_bbox, groups[key])
+            if score is not None and (best_score is None or score > best_score):
+                best_key, best_score = key, score
+        result.append(best_key)
+    return result
+
+
+def assign_grid(splines, groups):
+    grid = BlenRose._BBoxGrid(groups)
+    result = []
+    for spline_bbox in splines:
+        index = grid.best_overlap(spline_bbox)
+        result.append(grid.keys[index] if index >= 0 else None)
+    return result
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(spline_count, group_count):
+    splines, groups = make_level(spline_count, group_count)
+    linear, linear_time = _timed(assign_linear, splines, groups)
+    grid, grid_time = _timed(assign_grid, splines, groups)
+    reference = assign_best_brute_force(splines, groups)
+    assert grid == reference, "grid disagrees with brute-force largest overlap"
+
+    assigned = sum(key is not None for key in grid)
+    changed = sum(a != b for a, b in zip(linear, grid))
+    print(f"{spline_count} splines x {group_count} groups, {assigned} assigned")
+    print(f"  linear first-hit : {linear_time * 1e3:9.1f}ms")
+    print(f"  grid best-overlap: {grid_time * 1e3:9.1f}ms  ({linear_time / grid_time:.1f}x)")
+    print(f"  assignments that differ from first-hit: {changed}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*(args or [10000, 1000]))
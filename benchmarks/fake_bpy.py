@@ -0,0 +1,682 @@
+"""
+Minimal stand-in for ``bpy`` so BlenRose.py can be imported and its pure
+Python hot paths timed outside Blender.
+
+Only the surface BlenRose actually touches is modelled. Call ``install()``
+before importing BlenRose, then build synthetic data with the helpers below;
+``make_scene()`` fills ``bpy.data`` with a whole level (materials with node
+trees, mesh objects, curves).
+"""
+
+import math
+import random
+import sys
+import types
+
+import numpy as np
+
+
+# -------------------------------------------------------------------------
+# Generic RNA-ish helpers
+# -------------------------------------------------------------------------
+
+class FakeStruct:
+    """Base for fake RNA structs: identity-based pointers like StructRNA."""
+
+    def as_pointer(self):
+        return id(self)
+
+
+class FakeCollection(list):
+    """bpy_prop_collection stand-in: list with name lookup and ``"name" in coll``."""
+
+    def get(self, name, default=None):
+        for item in self:
+            if getattr(item, "name", None) == name:
+                return item
+        return default
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(getattr(item, "name", None) == key for item in self)
+        return list.__contains__(self, key)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(key)
+            return item
+        return list.__getitem__(self, key)
+
+
+# -------------------------------------------------------------------------
+# ID types
+# -------------------------------------------------------------------------
+
+class ID(FakeStruct):
+    def __init__(self, name=""):
+        self.name = name
+        self.users = 1
+
+    @property
+    def original(self):
+        return self
+
+
+class Image(ID):
+    def __init__(self, name="", filepath=""):
+        super().__init__(name)
+        self.filepath = filepath
+
+
+class NodeSocket(FakeStruct):
+    def __init__(self, node, name, identifier=None, is_output=False):
+        self.node = node
+        self.name = name
+        self.identifier = identifier or name
+        self.is_output = is_output
+        self.default_value = 0.0
+        self.links = []
+
+    @property
+    def is_linked(self):
+        return bool(self.links)
+
+
+class Node(FakeStruct):
+    def __init__(self, name, node_type, bl_idname="", inputs=(), outputs=(), label=""):
+        self.name = name
+        self.type = node_type
+        self.bl_idname = bl_idname or node_type
+        self.label = label
+        self.location = (0.0, 0.0)
+        self.inputs = FakeCollection(NodeSocket(self, s) for s in inputs)
+        self.outputs = FakeCollection(NodeSocket(self, s, is_output=True) for s in outputs)
+
+
+class NodeLink(FakeStruct):
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.from_node = from_socket.node
+        self.to_node = to_socket.node
+
+
+class NodeLinks(FakeCollection):
+    def new(self, from_socket, to_socket):
+        link = NodeLink(from_socket, to_socket)
+        self.append(link)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        return link
+
+    def remove(self, link):
+        list.remove(self, link)
+        link.from_socket.links.remove(link)
+        link.to_socket.links.remove(link)
+
+
+class ShaderNodeTree(ID):
+    def __init__(self, name="Shader Nodetree"):
+        super().__init__(name)
+        self.nodes = FakeCollection()
+        self.links = NodeLinks()
+
+    def add_node(self, node):
+        self.nodes.append(node)
+        return node
+
+
+class PropertyGroup:
+    pass
+
+
+class Material(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.use_nodes = True
+        self.node_tree = ShaderNodeTree()
+        self.blenrose_settings = None
+
+
+class PropArray(FakeStruct):
+    """
+    bpy_prop_collection of uniform items (vertices, loops, ...) backed by
+    numpy arrays, with add() and foreach_get/foreach_set per field.
+    """
+
+    def __init__(self, fields, count=0):
+        # fields: {name: (width, dtype)}
+        self._data = {name: np.zeros((count, width), dtype=dtype) for name, (width, dtype) in fields.items()}
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def add(self, count):
+        self._data = {
+            name: np.concatenate([array, np.zeros((count, array.shape[1]), dtype=array.dtype)])
+            for name, array in self._data.items()
+        }
+        self._count += count
+
+    def foreach_get(self, name, out):
+        out[:] = self._data[name].ravel()
+
+    def foreach_set(self, name, values):
+        array = self._data[name]
+        array[:] = np.asarray(values).reshape(array.shape)
+
+    def array(self, name):
+        """Direct access to a field's (count, width) array (fake-only helper)."""
+        return self._data[name]
+
+
+class UVLayer(FakeStruct):
+    def __init__(self, name, loop_count):
+        self.name = name
+        self.active_render = False
+        self.data = PropArray({"uv": (2, np.float32)}, loop_count)
+
+
+class UVLayers(FakeCollection):
+    def __init__(self, mesh):
+        super().__init__()
+        self._mesh = mesh
+        self.active_index = -1
+
+    def new(self, name="UVMap"):
+        layer = UVLayer(name, len(self._mesh.loops))
+        if not self:
+            layer.active_render = True
+            self.active_index = 0
+        self.append(layer)
+        return layer
+
+
+class Mesh(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.users = 0
+        self.vertices = PropArray({"co": (3, np.float32)})
+        self.loops = PropArray({"vertex_index": (1, np.int32), "normal": (3, np.float32)})
+        self.polygons = PropArray({
+            "loop_start": (1, np.int32),
+            "loop_total": (1, np.int32),
+            "material_index": (1, np.int32),
+            "use_smooth": (1, bool),
+        })
+        self.loop_triangles = PropArray({"loops": (3, np.int32)})
+        self.uv_layers = UVLayers(self)
+        self.materials = FakeCollection()
+        self.use_auto_smooth = False
+        self.has_custom_normals = False
+
+    def update(self, calc_edges=False):
+        pass
+
+    def calc_loop_triangles(self):
+        """Fan-triangulate every polygon."""
+        starts = self.polygons.array("loop_start").ravel()
+        totals = self.polygons.array("loop_total").ravel()
+        tris = [
+            (start, start + i, start + i + 1)
+            for start, total in zip(starts.tolist(), totals.tolist())
+            for i in range(1, total - 1)
+        ]
+        self.loop_triangles = PropArray({"loops": (3, np.int32)}, len(tris))
+        if tris:
+            self.loop_triangles.foreach_set("loops", np.array(tris, dtype=np.int32))
+
+    def calc_normals_split(self):
+        """Flat shading: every loop gets its polygon's normal."""
+        co = self.vertices.array("co")
+        loop_vertices = self.loops.array("vertex_index").ravel()
+        starts = self.polygons.array("loop_start").ravel()
+        totals = self.polygons.array("loop_total").ravel()
+        if not len(starts):
+            return
+        v0, v1, v2 = (co[loop_vertices[starts + i]] for i in range(3))
+        normals = np.cross(v1 - v0, v2 - v0)
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        self.loops.foreach_set("normal", np.repeat(normals, totals, axis=0))
+
+    def normals_split_custom_set(self, normals):
+        self.loops.foreach_set("normal", normals)
+        self.has_custom_normals = True
+
+
+class MaterialSlot:
+    def __init__(self, material=None):
+        self.material = material
+
+
+class Object(ID):
+    def __init__(self, name="", obj_type="MESH", data=None):
+        super().__init__(name)
+        self.type = obj_type
+        self.data = data
+        self.material_slots = []
+        self.modifiers = []
+        self.matrix_world = np.eye(4)
+        self.hide = False
+        if data is not None:
+            data.users += 1
+
+    def visible_get(self):
+        return not self.hide
+
+    def evaluated_get(self, depsgraph):
+        return self
+
+    def to_mesh(self):
+        return self.data
+
+    def to_mesh_clear(self):
+        pass
+
+
+class Spline(FakeStruct):
+    def __init__(self, spline_type, coords, cyclic=False):
+        self.type = spline_type
+        self.use_cyclic_u = cyclic
+        coords = np.asarray(coords, dtype=np.float32)
+        self.points = PropArray({"co": (4, np.float32)})
+        self.bezier_points = PropArray({"co": (3, np.float32)})
+        if spline_type == "BEZIER":
+            self.bezier_points.add(len(coords))
+            self.bezier_points.foreach_set("co", coords)
+        else:
+            self.points.add(len(coords))
+            self.points.foreach_set("co", np.hstack([coords, np.ones((len(coords), 1), dtype=np.float32)]))
+
+
+class Curve(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.splines = []
+
+
+class ObjectLinks(FakeCollection):
+    def link(self, item):
+        self.append(item)
+
+    def unlink(self, item):
+        list.remove(self, item)
+
+
+class Collection(ID):
+    def __init__(self, name=""):
+        super().__init__(name)
+        self.objects = ObjectLinks()
+        self.children = ObjectLinks()
+
+
+class Operator:
+    def report(self, level, message):
+        pass
+
+
+class Panel:
+    pass
+
+
+class UIList:
+    pass
+
+
+# -------------------------------------------------------------------------
+# Node factories mirroring the Blender shader node sockets BlenRose reads
+# -------------------------------------------------------------------------
+
+def image_node(name, image=None, label=""):
+    node = Node(name, "TEX_IMAGE", "ShaderNodeTexImage", inputs=("Vector",), outputs=("Color", "Alpha"), label=label)
+    node.image = image
+    return node
+
+
+def uv_map_node(name, uv_map="UVMap"):
+    node = Node(name, "UVMAP", "ShaderNodeUVMap", outputs=("UV",))
+    node.uv_map = uv_map
+    return node
+
+
+def mapping_node(name):
+    return Node(name, "MAPPING", "ShaderNodeMapping", inputs=("Vector", "Location", "Rotation", "Scale"), outputs=("Vector",))
+
+
+def math_node(name):
+    return Node(name, "MATH", "ShaderNodeMath", inputs=("Value", "Value_001"), outputs=("Value",))
+
+
+def mix_rgb_node(name):
+    return Node(name, "MIX_RGB", "ShaderNodeMixRGB", inputs=("Fac", "Color1", "Color2"), outputs=("Color",))
+
+
+def principled_node(name):
+    return Node(
+        name,
+        "BSDF_PRINCIPLED",
+        "ShaderNodeBsdfPrincipled",
+        inputs=("Base Color", "Metallic", "Specular", "Roughness", "Alpha", "Normal", "Emission"),
+        outputs=("BSDF",),
+    )
+
+
+def normal_map_node(name):
+    return Node(name, "NORMAL_MAP", "ShaderNodeNormalMap", inputs=("Strength", "Color"), outputs=("Normal",))
+
+
+def emission_node(name):
+    return Node(name, "EMISSION", "ShaderNodeEmission", inputs=("Color", "Strength"), outputs=("Emission",))
+
+
+# Image node name stems paired with the principled input they feed.
+_CHANNEL_STEMS = (
+    ("Diffuse", "Base Color"),
+    ("Specular", "Specular"),
+    ("Normal", None),
+    ("Lightmap", None),
+    ("Detail", None),
+    ("Alpha", "Alpha"),
+)
+
+
+def make_material(name, node_count=200):
+    """
+    Build a material whose node tree has roughly ``node_count`` nodes.
+
+    The tree mixes realistic texture chains (UV Map -> Mapping -> Image ->
+    BSDF / Normal Map / Emission) with long Math node chains, so both
+    texture detection and upstream UV tracing have real work to do.
+    """
+    mat = Material(name)
+    nt = mat.node_tree
+    links = nt.links
+    bsdf = nt.add_node(principled_node("Principled BSDF"))
+    normal_map = nt.add_node(normal_map_node("Normal Map"))
+    emission = nt.add_node(emission_node("Emission"))
+    links.new(normal_map.outputs["Normal"], bsdf.inputs["Normal"])
+
+    index = 0
+    while len(nt.nodes) < node_count:
+        stem, target = _CHANNEL_STEMS[index % len(_CHANNEL_STEMS)]
+        uv = nt.add_node(uv_map_node(f"UV {index}", uv_map=f"UVMap{index % 3}"))
+        mapping = nt.add_node(mapping_node(f"Mapping {index}"))
+        tex = nt.add_node(image_node(f"{stem} Tex {index}", Image(f"{stem.lower()}_{index}.dds")))
+        links.new(uv.outputs["UV"], mapping.inputs["Vector"])
+        links.new(mapping.outputs["Vector"], tex.inputs["Vector"])
+        if target:
+            links.new(tex.outputs["Color"], bsdf.inputs[target])
+        elif stem == "Normal":
+            links.new(tex.outputs["Color"], normal_map.inputs["Color"])
+        elif stem == "Lightmap":
+            links.new(tex.outputs["Color"], emission.inputs["Color"])
+
+        # Filler math chain feeding the mapping location, lengthening the
+        # upstream walk and padding the link list.
+        previous = None
+        for step in range(4):
+            node = nt.add_node(math_node(f"Math {index}.{step}"))
+            if previous is not None:
+                links.new(previous.outputs["Value"], node.inputs["Value"])
+            previous = node
+        links.new(previous.outputs["Value"], mapping.inputs["Location"])
+        index += 1
+
+    return mat
+
+
+# -------------------------------------------------------------------------
+# Module installation
+# -------------------------------------------------------------------------
+
+class _Timers:
+    def __init__(self):
+        self._registered = []
+
+    def register(self, function, first_interval=0.0, persistent=False):
+        self._registered.append(function)
+
+    def unregister(self, function):
+        self._registered.remove(function)
+
+    def is_registered(self, function):
+        return function in self._registered
+
+
+class _IDCollection(FakeCollection):
+    """bpy.data.<type> stand-in with new()/remove()."""
+
+    def __init__(self, factory):
+        super().__init__()
+        self._factory = factory
+
+    def new(self, name, *args):
+        item = self._factory(name, *args)
+        self.append(item)
+        return item
+
+    def remove(self, item, do_unlink=True):
+        list.remove(self, item)
+        data = getattr(item, "data", None)
+        if isinstance(item, Object) and data is not None:
+            data.users -= 1
+        if do_unlink:
+            for collection in _data_collections():
+                if item in collection.objects:
+                    collection.objects.unlink(item)
+                if item in collection.children:
+                    collection.children.unlink(item)
+
+
+def _data_collections():
+    bpy = sys.modules["bpy"]
+    collections = list(bpy.data.collections)
+    scene = getattr(bpy.context, "scene", None)
+    if scene is not None:
+        collections.append(scene.collection)
+    return collections
+
+
+class _BlendData:
+    def __init__(self):
+        self.materials = _IDCollection(Material)
+        self.objects = _IDCollection(lambda name, data=None: Object(
+            name, "CURVE" if isinstance(data, Curve) else "MESH", data))
+        self.meshes = _IDCollection(Mesh)
+        self.curves = _IDCollection(Curve)
+        self.images = _IDCollection(Image)
+        self.collections = _IDCollection(Collection)
+
+
+class Scene(ID):
+    def __init__(self, name="Scene"):
+        super().__init__(name)
+        self.collection = Collection("Scene Collection")
+        self.blenrose_mat_index = 0
+
+    @property
+    def objects(self):
+        """All objects linked anywhere under the scene collection."""
+        seen = []
+        stack = [self.collection]
+        while stack:
+            collection = stack.pop()
+            for obj in collection.objects:
+                if obj not in seen:
+                    seen.append(obj)
+            stack.extend(collection.children)
+        return seen
+
+
+def _prop(*args, **kwargs):
+    return (args, kwargs)
+
+
+def install():
+    """Register fake ``bpy`` / ``mathutils`` modules in sys.modules and return bpy."""
+    if "bpy" in sys.modules and getattr(sys.modules["bpy"], "_blenrose_fake", False):
+        return sys.modules["bpy"]
+
+    bpy = types.ModuleType("bpy")
+    bpy._blenrose_fake = True
+
+    bpy_types = types.ModuleType("bpy.types")
+    for cls in (ID, Image, Material, Object, ShaderNodeTree, Node, NodeSocket, NodeLink,
+                Operator, Panel, PropertyGroup, UIList):
+        setattr(bpy_types, cls.__name__, cls)
+    for cls in (Mesh, Curve, Collection, Scene):
+        setattr(bpy_types, cls.__name__, cls)
+
+    bpy_props = types.ModuleType("bpy.props")
+    for name in ("BoolProperty", "EnumProperty", "FloatProperty", "PointerProperty",
+                 "StringProperty", "IntProperty"):
+        setattr(bpy_props, name, _prop)
+
+    bpy_app = types.ModuleType("bpy.app")
+    bpy_app.timers = _Timers()
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = lambda function: function
+    handlers.depsgraph_update_post = []
+    handlers.load_post = []
+    handlers.frame_change_post = []
+    bpy_app.handlers = handlers
+
+    bpy_path = types.ModuleType("bpy.path")
+    bpy_path.abspath = lambda path: path
+    bpy_path.clean_name = lambda name: "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+    bpy_utils = types.ModuleType("bpy.utils")
+    bpy_utils.register_class = lambda cls: None
+    bpy_utils.unregister_class = lambda cls: None
+
+    bpy.types = bpy_types
+    bpy.props = bpy_props
+    bpy.app = bpy_app
+    bpy.path = bpy_path
+    bpy.utils = bpy_utils
+    bpy.data = _BlendData()
+    bpy.context = types.SimpleNamespace(scene=None)
+    reset_data(bpy)
+
+    mathutils = types.ModuleType("mathutils")
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.types": bpy_types,
+        "bpy.props": bpy_props,
+        "bpy.app": bpy_app,
+        "bpy.app.handlers": handlers,
+        "bpy.path": bpy_path,
+        "bpy.utils": bpy_utils,
+        "mathutils": mathutils,
+    })
+    return bpy
+
+
+# -------------------------------------------------------------------------
+# Scene synthesis
+# -------------------------------------------------------------------------
+
+def reset_data(bpy=None):
+    """Empty ``bpy.data`` and give ``bpy.context`` a fresh scene."""
+    bpy = bpy or sys.modules["bpy"]
+    bpy.data = _BlendData()
+    scene = Scene()
+    bpy.context = types.SimpleNamespace(
+        scene=scene,
+        view_layer=types.SimpleNamespace(objects=types.SimpleNamespace(active=None)),
+        selected_objects=[],
+        evaluated_depsgraph_get=lambda: None,
+    )
+    return bpy
+
+
+def make_grid_mesh(name, size=8, uv_names=("UVMap",), material_count=1):
+    """
+    ``size`` x ``size`` quad grid in bpy.data.meshes. Faces are striped
+    across ``material_count`` material indices and shaded smooth.
+    """
+    bpy = sys.modules["bpy"]
+    mesh = bpy.data.meshes.new(name)
+    side = size + 1
+    xs, ys = np.meshgrid(np.arange(side, dtype=np.float32), np.arange(side, dtype=np.float32))
+    co = np.stack([xs.ravel(), ys.ravel(), np.zeros(side * side, dtype=np.float32)], axis=1)
+
+    cells_x, cells_y = np.meshgrid(np.arange(size), np.arange(size))
+    base = (cells_y * side + cells_x).ravel()
+    quads = np.stack([base, base + 1, base + side + 1, base + side], axis=1)
+    face_count = len(quads)
+
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co)
+    mesh.loops.add(face_count * 4)
+    mesh.loops.foreach_set("vertex_index", quads.ravel().astype(np.int32))
+    mesh.polygons.add(face_count)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 4, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(face_count, 4, dtype=np.int32))
+    mesh.polygons.foreach_set("material_index", (np.arange(face_count) % material_count).astype(np.int32))
+    mesh.polygons.foreach_set("use_smooth", np.ones(face_count, dtype=bool))
+    for index, uv_name in enumerate(uv_names):
+        layer = mesh.uv_layers.new(name=uv_name)
+        layer.data.foreach_set("uv", co[quads.ravel(), :2] / size + index)
+    mesh.calc_normals_split()
+    return mesh
+
+
+def make_curve_object(name, point_count=32, spline_type="POLY", origin=(0.0, 0.0, 0.0), length=20.0):
+    """Curve object in bpy.data with one straight-ish spline of ``point_count`` points."""
+    bpy = sys.modules["bpy"]
+    curve = bpy.data.curves.new(name)
+    t = np.linspace(0.0, 1.0, point_count, dtype=np.float32)
+    coords = np.stack([t * length, np.sin(t * math.pi) * 2.0, np.zeros_like(t)], axis=1)
+    curve.splines.append(Spline(spline_type, coords))
+    obj = bpy.data.objects.new(name, curve)
+    obj.matrix_world[:3, 3] = origin
+    return obj
+
+
+def make_scene(material_count=20, object_count=100, node_count=60, curve_count=20, curve_points=32,
+               grid_size=8, multi_material_ratio=0.2, area=500.0, seed=1):
+    """
+    Fill ``bpy.data`` with a synthetic level and link it into the context scene.
+
+    ``material_count`` materials with ~``node_count``-node trees,
+    ``object_count`` grid meshes scattered over ``area``² (a
+    ``multi_material_ratio`` share of them carry two or three materials) and
+    ``curve_count`` curves of ``curve_points`` points. Returns bpy.context.
+    """
+    bpy = reset_data()
+    rng = random.Random(seed)
+    scene = bpy.context.scene
+
+    materials = []
+    for index in range(material_count):
+        mat = make_material(f"Material.{index:03d}", node_count)
+        bpy.data.materials.append(mat)
+        materials.append(mat)
+
+    for index in range(object_count):
+        slot_count = rng.choice((2, 3)) if rng.random() < multi_material_ratio else 1
+        mesh = make_grid_mesh(f"Mesh.{index:04d}", grid_size, ("UVMap", f"Lightmap{index % 4}"), slot_count)
+        obj = bpy.data.objects.new(f"Object.{index:04d}", mesh)
+        obj.material_slots = [MaterialSlot(rng.choice(materials)) for _ in range(slot_count)]
+        angle = rng.uniform(0.0, 2.0 * math.pi)
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        obj.matrix_world = np.array([
+            [cos_a, -sin_a, 0.0, rng.uniform(0.0, area)],
+            [sin_a, cos_a, 0.0, rng.uniform(0.0, area)],
+            [0.0, 0.0, 1.0, rng.uniform(0.0, 10.0)],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+        scene.collection.objects.link(obj)
+
+    for index in range(curve_count):
+        origin = (rng.uniform(0.0, area), rng.uniform(0.0, area), rng.uniform(0.0, 10.0))
+        spline_type = ("POLY", "BEZIER", "NURBS")[index % 3]
+        obj = make_curve_object(f"Curve.{index:03d}", curve_points, spline_type, origin)
+        scene.collection.objects.link(obj)
+
+    return bpy.context
@@ -0,0 +1,191 @@
+"""
+Benchmark suite for BlenRose's hot paths, run against the fake ``bpy``.
+
+Every case is timed at several scales; results are printed as a table and
+can be written as JSON to compare across commits:
+
+    python benchmarks/run_benchmarks.py [--quick] [--only NAME ...]
+                                        [--output results.json]
+                                        [--compare baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_bpy
+
+bpy = fake_bpy.install()
+
+import BlenRose  # noqa: E402
+
+
+# -------------------------------------------------------------------------
+# Cases: setup(scale) returns the zero-argument function to time
+# -------------------------------------------------------------------------
+
+def _setup_detect(scale, cold):
+    mat = fake_bpy.make_material(f"Detect{scale}", scale)
+
+    def run():
+        if cold:
+            BlenRose._evict_detection_cache(mat)
+        return BlenRose._detect_textures_from_node_tree(mat)
+    return run
+
+
+def _setup_trace_uv(scale):
+    mat = fake_bpy.make_material(f"Trace{scale}", scale)
+    nt = mat.node_tree
+    vector_inputs = [n.inputs["Vector"] for n in nt.nodes if n.type == "TEX_IMAGE"]
+
+    def run():
+        link_index = BlenRose._build_link_index(nt)
+        return [BlenRose._trace_uv_map_name_from_socket(nt, s, mat, link_index=link_index)
+                for s in vector_inputs]
+    return run
+
+
+def _setup_uv_items(scale, cold):
+    fake_bpy.make_scene(material_count=1, object_count=scale, node_count=10, curve_count=0, grid_size=1)
+
+    def run():
+        if cold:
+            BlenRose._invalidate_uv_items_cache()
+        return BlenRose.uv_channel_items(None, bpy.context)
+    return run
+
+
+def _setup_splines(scale):
+    context = fake_bpy.make_scene(material_count=1, object_count=0, node_count=10,
+                                  curve_count=100, curve_points=scale)
+    return lambda: BlenRose._extract_splines_from_scene(context)
+
+
+def _setup_grouping(scale):
+    context = fake_bpy.make_scene(material_count=max(5, scale // 10), object_count=scale,
+                                  node_count=10, curve_count=scale // 2)
+    mesh_objects = [obj for obj in context.scene.objects if obj.type == "MESH"]
+    splines = BlenRose._extract_splines_from_scene(context)
+
+    def run():
+        BlenRose._invalidate_world_bounds()
+        temp_collection = BlenRose._create_export_temp_collection(context)
+        try:
+            groups = BlenRose._group_objects_by_material(mesh_objects, None, temp_collection)
+            return BlenRose._assign_splines_to_groups(splines, groups, None)
+        finally:
+            BlenRose._remove_export_temp_collection(temp_collection)
+    return run
+
+
+def _setup_glb_encode(scale):
+    context = fake_bpy.make_scene(material_count=1, object_count=scale, node_count=10,
+                                  curve_count=0, multi_material_ratio=0.0)
+    objects = [obj for obj in context.scene.objects if obj.type == "MESH"]
+
+    def run():
+        return BlenRose._build_glb(BlenRose._snapshot_group_glb(objects, None), "Material.000")
+    return run
+
+
+CASES = {
+    # name: (setup, scales, quick scales)
+    "detect_textures.cold": (lambda n: _setup_detect(n, cold=True), (100, 400, 1600), (100, 400)),
+    "detect_textures.warm": (lambda n: _setup_detect(n, cold=False), (100, 400, 1600), (100, 400)),
+    "trace_uv": (_setup_trace_uv, (100, 400, 1600), (100, 400)),
+    "uv_channel_items.cold": (lambda n: _setup_uv_items(n, cold=True), (100, 1000, 5000), (100, 1000)),
+    "uv_channel_items.warm": (lambda n: _setup_uv_items(n, cold=False), (100, 1000, 5000), (100, 1000)),
+    "extract_splines": (_setup_splines, (10, 100, 1000), (10, 100)),
+    "export_grouping": (_setup_grouping, (50, 200, 800), (50, 200)),
+    "glb_encode": (_setup_glb_encode, (10, 50, 200), (10, 50)),
+}
+
+
+# -------------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------------
+
+def _time(function, repeat):
+    function()  # warm-up (and first-call caches for the warm cases)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names, quick=False, repeat=5):
+    results = []
+    for name in names:
+        setup, scales, quick_scales = CASES[name]
+        for scale in (quick_scales if quick else scales):
+            samples = _time(setup(scale), repeat)
+            results.append({
+                "case": name,
+                "scale": scale,
+                "best_s": min(samples),
+                "median_s": statistics.median(samples),
+                "repeat": repeat,
+            })
+            print(f"{name:<24} {scale:>6}  best {min(samples) * 1e3:10.3f}ms  "
+                  f"median {statistics.median(samples) * 1e3:10.3f}ms")
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    """Print best-time ratios against a previous JSON report (>1 means slower now)."""
+    previous = {(r["case"], r["scale"]): r["best_s"] for r in baseline["results"]}
+    print(f"\nvs {baseline.get('commit') or 'baseline'}:")
+    for result in report["results"]:
+        before = previous.get((result["case"], result["scale"]))
+        if before:
+            print(f"{result['case']:<24} {result['scale']:>6}  {result['best_s'] / before:6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller scales only")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="cases to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="JSON from a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.only or list(CASES), quick=args.quick, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())